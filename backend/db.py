@@ -1,18 +1,117 @@
-"""MongoDB client and initialization helpers."""
+"""MongoDB client, initialization and index migration helpers.
+
+Indexes are declared as numbered migrations. ``init_db`` applies the pending
+ones in order and records each in ``schema_migrations``, so every process can
+run it at startup. A new index is a new migration, never an edit to an
+applied one. ``python backend/db.py report`` lists missing, undeclared and
+unused indexes, and explains the hot queries to show collection scans and
+in-memory sorts.
+"""
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from dotenv import find_dotenv, load_dotenv
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient, MongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
+from pymongo.errors import DuplicateKeyError, OperationFailure
 
 DB_NAME = "instagram_reel_creator"
 DEFAULT_URI = "mongodb://localhost:27017"
 
+MIGRATIONS_COLLECTION = "schema_migrations"
+# Server error code for dropping an index that does not exist.
+_INDEX_NOT_FOUND = 27
+
 _client: Optional[MongoClient] = None
+_async_client: Optional[AsyncMongoClient] = None
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        # MongoDB's default name, so indexes made before migrations match.
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    create: Tuple[IndexSpec, ...] = ()
+    # (collection, index name) pairs.
+    drop: Tuple[Tuple[str, str], ...] = ()
+
+
+def _index(collection: str, *keys: Union[str, Tuple[str, int]], unique: bool = False) -> IndexSpec:
+    return IndexSpec(
+        collection,
+        tuple(key if isinstance(key, tuple) else (key, ASCENDING) for key in keys),
+        unique,
+    )
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        1,
+        "Indexes init_db created before migrations",
+        (
+            _index("videos", "video_id", unique=True),
+            _index("raw_posts_data", "code", unique=True),
+            _index("voice_clone_job", "job_id", unique=True),
+            _index("dead_letter_jobs", "dead_letter_id", unique=True),
+            _index("media_loudness", "asset_key", unique=True),
+            _index("render_stats", "created_at"),
+            _index("media_chunks", "asset_key", unique=True),
+            _index("media_chunks", "path"),
+            _index("brand_assets", "asset_id", unique=True),
+            _index("brand_assets", "name", unique=True),
+        ),
+    ),
+    Migration(
+        2,
+        "Indexes for the hot API, worker and reaper queries",
+        (
+            _index("videos", "status"),
+            _index("video_parts", "video_id", "part_number"),
+            _index("video_parts", "video_parts_id"),
+            # Filtered lists page by _id.
+            _index("raw_posts_data", "quote_created", "_id"),
+            _index("raw_posts_data", "posted", "_id"),
+            _index("person_bio", "code", "_id"),
+            _index("quotes", "code", "_id"),
+            _index("voice_clone_job", ("updated_at", DESCENDING), ("_id", DESCENDING)),
+            _index("voice_clone_job", "status", ("completed_at", DESCENDING)),
+            _index("dead_letter_jobs", ("created_at", DESCENDING)),
+        ),
+    ),
+)
+
+# Queries the API and workers run often; the report explains each of them.
+HOT_QUERIES: Tuple[Tuple[str, Dict[str, Any], Optional[List[Tuple[str, int]]]], ...] = (
+    ("videos", {"video_id": ""}, None),
+    ("videos", {"status": "processing"}, None),
+    ("video_parts", {"video_id": ""}, [("part_number", ASCENDING)]),
+    ("video_parts", {"video_parts_id": 0}, None),
+    ("raw_posts_data", {"quote_created": False}, [("_id", ASCENDING)]),
+    ("raw_posts_data", {"posted": True}, [("_id", ASCENDING)]),
+    ("person_bio", {}, [("code", ASCENDING), ("_id", ASCENDING)]),
+    ("quotes", {"code": ""}, None),
+    ("voice_clone_job", {}, [("updated_at", DESCENDING), ("_id", DESCENDING)]),
+    ("dead_letter_jobs", {}, [("created_at", DESCENDING)]),
+)
 
 
 def get_client() -> MongoClient:
@@ -30,20 +129,146 @@ def get_db() -> Database:
     return get_client()[DB_NAME]
 
 
+def get_async_client() -> AsyncMongoClient:
+    """Return a singleton AsyncMongoClient for the API's event loop."""
+    global _async_client
+    if _async_client is None:
+        load_dotenv(find_dotenv())
+        uri = os.getenv("MONGODB_URI", DEFAULT_URI)
+        _async_client = AsyncMongoClient(uri)
+    return _async_client
+
+
+def get_async_db() -> AsyncDatabase:
+    """Return the instagram_reel_creator database handle for async code."""
+    return get_async_client()[DB_NAME]
+
+
+async def close_async_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def declared_indexes() -> Dict[str, Dict[str, IndexSpec]]:
+    """The indexes the migrations add up to, by collection and name."""
+    indexes: Dict[str, Dict[str, IndexSpec]] = {}
+    for migration in sorted(MIGRATIONS, key=lambda item: item.version):
+        for spec in migration.create:
+            indexes.setdefault(spec.collection, {})[spec.name] = spec
+        for collection, name in migration.drop:
+            indexes.get(collection, {}).pop(name, None)
+    return indexes
+
+
+def apply_migrations(db: Database) -> List[int]:
+    """Apply pending migrations in order; return the versions applied."""
+    db[MIGRATIONS_COLLECTION].create_index("version", unique=True)
+    done = {doc["version"] for doc in db[MIGRATIONS_COLLECTION].find({}, {"version": 1})}
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda item: item.version):
+        if migration.version in done:
+            continue
+        for spec in migration.create:
+            # A no-op when an identical index already exists.
+            db[spec.collection].create_index(list(spec.keys), name=spec.name, unique=spec.unique)
+        for collection, name in migration.drop:
+            try:
+                db[collection].drop_index(name)
+            except OperationFailure as exc:
+                if exc.code != _INDEX_NOT_FOUND:
+                    raise
+        try:
+            db[MIGRATIONS_COLLECTION].insert_one(
+                {
+                    "version": migration.version,
+                    "description": migration.description,
+                    "applied_at": datetime.utcnow(),
+                }
+            )
+        except DuplicateKeyError:
+            # Another process applied it at the same time.
+            pass
+        applied.append(migration.version)
+    return applied
+
+
 def init_db() -> Database:
-    """Ensure the database and collections exist."""
+    """Ensure the collections exist and apply pending index migrations."""
     db = get_db()
     existing = set(db.list_collection_names())
-    for name in ("videos", "video_parts", "raw_posts_data", "voice_clone_job"):
+    for name in (
+        "videos",
+        "video_parts",
+        "raw_posts_data",
+        "voice_clone_job",
+        "dead_letter_jobs",
+        "media_loudness",
+        "render_stats",
+        "media_chunks",
+        "brand_assets",
+    ):
         if name not in existing:
             db.create_collection(name)
 
-    db.videos.create_index("video_id", unique=True)
-    db.raw_posts_data.create_index("code", unique=True)
-    db.voice_clone_job.create_index("job_id", unique=True)
+    apply_migrations(db)
     return db
 
 
+def _plan_stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    stages = [{"stage": plan.get("stage"), "index": plan.get("indexName")}]
+    children = list(plan.get("inputStages") or [])
+    for key in ("inputStage", "queryPlan"):
+        if plan.get(key):
+            children.append(plan[key])
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def index_report(db: Database) -> Dict[str, Any]:
+    """Missing/undeclared/unused indexes and the plans of the hot queries.
+
+    Usage counts come from ``$indexStats`` and reset when mongod restarts.
+    """
+    declared = declared_indexes()
+    collections: Dict[str, Any] = {}
+    names = (set(declared) | set(db.list_collection_names())) - {MIGRATIONS_COLLECTION}
+    for name in sorted(names):
+        existing = {index["name"] for index in db[name].list_indexes()}
+        usage = {
+            stat["name"]: stat["accesses"]["ops"]
+            for stat in db[name].aggregate([{"$indexStats": {}}])
+        }
+        wanted = set(declared.get(name, {}))
+        collections[name] = {
+            "missing": sorted(wanted - existing),
+            "undeclared": sorted(existing - wanted - {"_id_"}),
+            "unused": sorted(index for index, ops in usage.items() if not ops and index != "_id_"),
+        }
+
+    queries = []
+    for collection, query, sort in HOT_QUERIES:
+        command: Dict[str, Any] = {"find": collection, "filter": query}
+        if sort:
+            command["sort"] = dict(sort)
+        explain = db.command("explain", command, verbosity="queryPlanner")
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        kinds = [stage["stage"] for stage in stages]
+        queries.append(
+            {
+                "collection": collection,
+                "filter": query,
+                "sort": sort,
+                "indexes": [stage["index"] for stage in stages if stage["index"]],
+                "collection_scan": "COLLSCAN" in kinds,
+                "in_memory_sort": "SORT" in kinds,
+            }
+        )
+    return {"collections": collections, "queries": queries}
+
+
 def close_client() -> None:
     """Close the cached MongoClient, if any."""
     global _client
@@ -53,4 +278,10 @@ def close_client() -> None:
 
 
 if __name__ == "__main__":
-    init_db()
+    parser = argparse.ArgumentParser(description="Apply index migrations or report index usage.")
+    parser.add_argument("command", nargs="?", choices=("migrate", "report"), default="migrate")
+    args = parser.parse_args()
+    if args.command == "report":
+        print(json.dumps(index_report(get_db()), indent=2, default=str))
+    else:
+        init_db()
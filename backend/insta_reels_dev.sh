@@ -40,6 +40,10 @@ pids+=("$!")
 arq backend.workers.voice_cloner_worker.WorkerSettings &
 pids+=("$!")
 
+# Start ARQ maintenance worker (stuck-job reaper)
+arq backend.workers.maintenance_worker.WorkerSettings &
+pids+=("$!")
+
 # Start frontend (Next.js dev server)
 (
   cd "$REPO_ROOT/frontend"
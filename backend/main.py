@@ -2,29 +2,96 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+import contextlib
+from datetime import datetime, timedelta
 import os
 from pathlib import Path
+import shlex
 import shutil
+import statistics
 import subprocess
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
-from arq import create_pool
+from arq import ArqRedis, create_pool
 from arq.connections import RedisSettings
 from bson import ObjectId
 from bson.errors import InvalidId
 from dotenv import find_dotenv, load_dotenv
-from fastapi import FastAPI, File, HTTPException, Request, Response, UploadFile, status
+from fastapi import (
+    BackgroundTasks,
+    FastAPI,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
+from redis.exceptions import RedisError
 
-from db import get_db, init_db
+from db import close_async_client, get_async_db, get_db, init_db
 from logger import get_logger
+from media_response import build_media_response
+from objects.media_packaging import HLS_CONTENT_TYPES, IMAGE_CONTENT_TYPES
 from objects.prompt_constants import AI_TYPE_PROMPT_MAP, AI_TYPE_REQUIRED_FIELDS, AI_TYPES
+from objects.storage_manager import StorageManager, delete_paths
+from objects.audio_mix import audio_from_payload
+from objects.brand_assets import (
+    NO_BRAND_ASSET,
+    brand_section,
+    rendition_keys,
+    renditions_dir_for,
+)
+from objects.loudness import cached_gain_db
+from objects.media_probe import asset_key, probe_media
+from objects.pagination import CountCache, decode_cursor, encode_cursor, keyset_filter
+from objects.overlays import (
+    OVERLAY_TEMPLATES,
+    get_overlay_template,
+    overlay_from_payload,
+    overlay_layers,
+)
+from objects.render_cost import (
+    RENDER_COST_HISTORY,
+    estimate_plan_cost,
+    throughput_from_history,
+)
+from objects.render_eta import (
+    ETA_HISTORY,
+    VIDEO_WORKER_COUNT,
+    fit_throughput_models,
+    input_seconds,
+    lane_wait_seconds,
+    predict_render_seconds,
+)
+from objects.render_engine import (
+    RENDER_ENGINE,
+    SCRATCH_FOLDER,
+    SEGMENT_CACHE_FOLDER,
+    SEGMENT_CACHE_VERSION,
+    parts_from_payload,
+    plan_render,
+    segment_commands,
+    segment_key,
+)
+from objects.render_payload import (
+    apply_loudness_gains,
+    build_processing_payload,
+    build_slideshow_payload,
+    resolve_voice_path,
+)
+from objects.slideshow import SLIDE_SECONDS, plan_slideshow
+from objects.source_chunks import PRECHUNK_ENABLED, apply_chunk_index, chunk_indexes
+from objects.transitions import TRANSITIONS, get_transition
 from models.person_bio import PERSON_BIO_COLLECTION
 from models.quotes import QUOTES_COLLECTION
 from models.raw_posts_data import (
@@ -35,6 +102,16 @@ from models.raw_posts_data import (
     RawPostsDataUpdate,
     _now_str,
 )
+from models.brand_asset import (
+    BRAND_ASSETS_COLLECTION,
+    BrandAssetCreate,
+    BrandAssetModel,
+    BrandAssetSchema,
+)
+from models.dead_letter import DEAD_LETTER_COLLECTION, DeadLetterSchema
+from models.media_chunks import MEDIA_CHUNKS_COLLECTION
+from models.media_loudness import MEDIA_LOUDNESS_COLLECTION
+from models.render_stats import RENDER_STATS_COLLECTION
 from models.video_model import VideoCreate, VideoSchema, VideoUpdate
 from models.voice_job_status import VOICE_CLONE_JOB_COLLECTION, VoiceCloneJobModel
 from models.video_part_model import (
@@ -44,11 +121,13 @@ from models.video_part_model import (
 )
 from workers.queue_names import (
     AI_QUEUE_NAME,
+    FUNCTION_QUEUE_NAMES,
     POST_QUEUE_NAME,
     VIDEO_QUEUE_NAME,
     VOICE_CLONE_QUEUE_NAME,
     queue_health_key,
 )
+from workers.resource_monitor import summarize_resource_usage
 
 app = FastAPI()
 logger = get_logger(name="instagram_reel_creation_fastapi")
@@ -56,6 +135,19 @@ logger = get_logger(name="instagram_reel_creation_fastapi")
 load_dotenv(find_dotenv())
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 UPLOAD_FILES_LOCATION = os.getenv("UPLOAD_FILES_LOCATION", "./uploads")
+# Worker health keys are re-read in the background this often, and a cached
+# "healthy" is trusted for this long before an enqueue checks Redis itself.
+WORKER_HEALTH_REFRESH_SECONDS = float(os.getenv("WORKER_HEALTH_REFRESH_SECONDS", "5"))
+WORKER_HEALTH_TTL_SECONDS = float(os.getenv("WORKER_HEALTH_TTL_SECONDS", "10"))
+
+# One ARQ pool for the app's lifetime; redis-py reconnects on its own.
+_redis_pool: Optional[ArqRedis] = None
+_redis_lock = asyncio.Lock()
+_health_task: Optional[asyncio.Task] = None
+# queue name -> (healthy, time.monotonic() of the check)
+_worker_health: Dict[str, Tuple[bool, float]] = {}
+# List totals, cached briefly per collection and filter.
+_count_cache = CountCache()
 
 
 app.add_middleware(
@@ -64,7 +156,14 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count"],
+    expose_headers=[
+        "X-Total-Count",
+        "Accept-Ranges",
+        "Content-Length",
+        "Content-Range",
+        "ETag",
+        "X-Next-Cursor",
+    ],
 )
 
 
@@ -74,6 +173,35 @@ def on_startup() -> None:
     logger.info("Database initialized")
 
 
+@app.on_event("startup")
+async def on_startup_redis() -> None:
+    global _health_task
+    try:
+        await _get_redis()
+        logger.info("Redis pool created")
+    except HTTPException:
+        logger.warning("Redis unavailable at startup; connecting on first use")
+    _health_task = asyncio.create_task(_worker_health_loop())
+
+
+@app.on_event("shutdown")
+async def on_shutdown_redis() -> None:
+    global _redis_pool, _health_task
+    if _health_task is not None:
+        _health_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _health_task
+        _health_task = None
+    if _redis_pool is not None:
+        await _redis_pool.close()
+        _redis_pool = None
+
+
+@app.on_event("shutdown")
+async def on_shutdown_mongo() -> None:
+    await close_async_client()
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(
     request: Request, exc: Exception
@@ -116,6 +244,59 @@ def _parse_object_id(raw_id: str) -> ObjectId:
         raise HTTPException(status_code=400, detail="Invalid _id") from exc
 
 
+async def _list_page(
+    response: Response,
+    collection: Any,
+    query: Dict[str, Any],
+    sort: List[Tuple[str, int]],
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    with_total: bool,
+    projection: Optional[Dict[str, Any]] = None,
+    join: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """One page after ``cursor`` if given, else by ``page``; sets the list headers.
+
+    ``join`` is a list of aggregation stages (e.g. a ``$lookup`` and ``$match``)
+    that run after the sort, so the page is filtered server-side in index order.
+    """
+    if page < 1 or page_size < 1:
+        raise HTTPException(
+            status_code=400, detail="page and page_size must be >= 1"
+        )
+    find_filter = query
+    skip = 0
+    if cursor:
+        try:
+            after = keyset_filter(sort, decode_cursor(cursor, sort))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="invalid cursor") from exc
+        find_filter = {"$and": [query, after]} if query else after
+    else:
+        skip = (page - 1) * page_size
+    if with_total:
+        total_count = await _count_cache.count(collection, query, join)
+        response.headers["X-Total-Count"] = str(total_count)
+    if join:
+        pipeline = [{"$match": find_filter}, {"$sort": dict(sort)}, *join]
+        if skip:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": page_size})
+        docs = await (await collection.aggregate(pipeline)).to_list(None)
+    else:
+        docs = (
+            await collection.find(find_filter, projection)
+            .sort(sort)
+            .skip(skip)
+            .limit(page_size)
+            .to_list(None)
+        )
+    if len(docs) == page_size:
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1], sort)
+    return docs
+
+
 class CallApiRequest(BaseModel):
     ai_type: str = Field(..., min_length=1)
     input: Dict[str, Any] = Field(default_factory=dict)
@@ -202,11 +383,121 @@ def _validate_times(start_time: str, end_time: str, duration_seconds: float) ->
         raise HTTPException(status_code=400, detail="end_time must be > start_time")
 
 
+def _validate_overlay(
+    overlay_template: Optional[str], captions: Optional[List[Any]]
+) -> None:
+    if overlay_template is not None:
+        try:
+            get_overlay_template(overlay_template)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    for caption in captions or []:
+        if caption["end"] <= caption["start"]:
+            raise HTTPException(status_code=400, detail="caption end must be > start")
+
+
+def _validate_audio(
+    db: Any, voice_clone_job_id: Optional[str], music_file_location: Optional[str]
+) -> None:
+    if voice_clone_job_id and not db[VOICE_CLONE_JOB_COLLECTION].find_one(
+        {"job_id": voice_clone_job_id}, {"_id": 1}
+    ):
+        raise HTTPException(status_code=400, detail="voice_clone_job_id not found")
+    if music_file_location and not Path(music_file_location).is_file():
+        raise HTTPException(status_code=400, detail="music_file_location not found")
+
+
+def _validate_brand_assets(db: Any, update: Dict[str, Any]) -> None:
+    for kind in ("intro", "outro"):
+        asset_id = update.get(f"{kind}_asset_id")
+        if not asset_id or asset_id == NO_BRAND_ASSET:
+            continue
+        asset = db[BRAND_ASSETS_COLLECTION].find_one({"asset_id": asset_id}, {"_id": 0, "kind": 1})
+        if asset is None:
+            raise HTTPException(status_code=400, detail=f"{kind}_asset_id not found")
+        if asset.get("kind") != kind:
+            raise HTTPException(status_code=400, detail=f"{kind}_asset_id is not an {kind}")
+
+
+def _validate_transition(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    try:
+        return get_transition(name).name
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _validate_slideshow(
+    db: Any, video_type: str, quote_code: Optional[str], slide_transition: Optional[str]
+) -> Optional[str]:
+    transition = _validate_transition(slide_transition)
+    if video_type != "quote_slideshow" and quote_code is None:
+        return transition
+    if not quote_code:
+        raise HTTPException(status_code=400, detail="quote_code is required for quote_slideshow")
+    quote = db[QUOTES_COLLECTION].find_one({"code": quote_code}, {"_id": 0, "quote_image_paths": 1})
+    if quote is None:
+        raise HTTPException(status_code=400, detail="quote_code not found")
+    if not (quote.get("quote_image_paths") or "").strip():
+        raise HTTPException(status_code=400, detail="quotes have no images yet")
+    return transition
+
+
+async def _get_redis() -> ArqRedis:
+    """The app-wide ARQ pool, connecting on first use if startup could not."""
+    global _redis_pool
+    if _redis_pool is None:
+        async with _redis_lock:
+            if _redis_pool is None:
+                try:
+                    _redis_pool = await create_pool(RedisSettings.from_dsn(REDIS_URL))
+                except Exception as exc:
+                    logger.error("Unable to connect to Redis: %s", exc)
+                    raise HTTPException(status_code=503, detail="redis unavailable") from exc
+    return _redis_pool
+
+
+@contextlib.contextmanager
+def _redis_errors() -> Iterator[None]:
+    """Report a Redis outage inside the block as 503, like a failed connect."""
+    try:
+        yield
+    except (RedisError, OSError, asyncio.TimeoutError) as exc:
+        logger.error("Redis call failed: %s", exc)
+        raise HTTPException(status_code=503, detail="redis unavailable") from exc
+
+
+async def _refresh_worker_health(redis: ArqRedis) -> None:
+    queue_names = sorted(set(FUNCTION_QUEUE_NAMES.values()))
+    values = await redis.mget([queue_health_key(name) for name in queue_names])
+    checked_at = time.monotonic()
+    for queue_name, value in zip(queue_names, values):
+        _worker_health[queue_name] = (bool(value), checked_at)
+
+
+async def _worker_health_loop() -> None:
+    while True:
+        try:
+            await _refresh_worker_health(await _get_redis())
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Worker health refresh failed: %s", exc)
+        await asyncio.sleep(WORKER_HEALTH_REFRESH_SECONDS)
+
+
 async def _require_worker_health(
     redis: Any, queue_name: str, worker_label: str
 ) -> None:
+    # Only a recent "healthy" is trusted, so a worker that just came up is
+    # seen on the next request rather than after the next refresh.
+    cached = _worker_health.get(queue_name)
+    if cached and cached[0] and time.monotonic() - cached[1] <= WORKER_HEALTH_TTL_SECONDS:
+        return
     health_key = queue_health_key(queue_name)
     health_data = await redis.get(health_key)
+    _worker_health[queue_name] = (bool(health_data), time.monotonic())
     if health_data:
         return
     logger.error(
@@ -221,8 +512,24 @@ async def _require_worker_health(
     )
 
 
+async def _enqueue_prechunk(path: str, stored_name: str) -> None:
+    # Best effort: renders read the source directly until chunks exist.
+    try:
+        redis = await _get_redis()
+        await redis.enqueue_job(
+            "chunk_source",
+            path,
+            _job_id=f"chunk_source:{stored_name}",
+            _queue_name=FUNCTION_QUEUE_NAMES["chunk_source"],
+        )
+    except Exception as exc:
+        logger.warning("Unable to enqueue chunking for %s: %s", stored_name, exc)
+
+
 @app.post("/uploads")
-def upload_video_file(file: UploadFile = File(...)) -> Dict[str, Any]:
+def upload_video_file(
+    background_tasks: BackgroundTasks, file: UploadFile = File(...)
+) -> Dict[str, Any]:
     if not file.filename:
         raise HTTPException(status_code=400, detail="file is required")
     if file.content_type and not (
@@ -246,6 +553,12 @@ def upload_video_file(file: UploadFile = File(...)) -> Dict[str, Any]:
     finally:
         file.file.close()
 
+    if PRECHUNK_ENABLED and (file.content_type or "").startswith("video/"):
+        # The worker skips sources shorter than VIDEO_PRECHUNK_MIN_SECONDS.
+        background_tasks.add_task(
+            _enqueue_prechunk, str(destination.resolve()), stored_name
+        )
+
     return {
         "file_name": file.filename,
         "stored_name": stored_name,
@@ -258,6 +571,13 @@ def create_video(payload: VideoCreate) -> Dict[str, Any]:
     db = get_db()
     now = datetime.utcnow()
     video_id = uuid4().hex
+    captions = [caption.dict() for caption in payload.captions or []]
+    _validate_overlay(payload.overlay_template, captions)
+    _validate_audio(db, payload.voice_clone_job_id, payload.music_file_location)
+    slide_transition = _validate_slideshow(
+        db, payload.video_type, payload.quote_code, payload.slide_transition
+    )
+    _validate_brand_assets(db, payload.dict())
 
     doc = {
         "video_id": video_id,
@@ -268,10 +588,24 @@ def create_video(payload: VideoCreate) -> Dict[str, Any]:
         "modification_time": now,
         "active": True if payload.active is None else payload.active,
         "video_tags": payload.video_tags or [],
+        "video_type": payload.video_type,
+        "quote_code": payload.quote_code,
+        "slide_seconds": payload.slide_seconds,
+        "slide_transition": slide_transition,
+        "overlay_template": payload.overlay_template,
+        "captions": captions,
+        "voice_clone_job_id": payload.voice_clone_job_id,
+        "music_file_location": payload.music_file_location,
+        "music_volume": payload.music_volume,
+        "duck_music": True if payload.duck_music is None else payload.duck_music,
+        "intro_asset_id": payload.intro_asset_id,
+        "outro_asset_id": payload.outro_asset_id,
         "status": "created",
         "output_file_location": None,
         "job_id": None,
         "error_reason": None,
+        "attempts": 0,
+        "heartbeat_at": None,
     }
 
     try:
@@ -285,10 +619,10 @@ def create_video(payload: VideoCreate) -> Dict[str, Any]:
 
 
 @app.get("/videos", response_model=List[VideoSchema])
-def list_videos() -> List[Dict[str, Any]]:
+async def list_videos() -> List[Dict[str, Any]]:
     try:
-        db = get_db()
-        docs = [_serialize(doc) for doc in db.videos.find({})]
+        db = get_async_db()
+        docs = [_serialize(doc) async for doc in db.videos.find({})]
         logger.info(f"Documents length: {len(docs)}\n{docs}")
         return docs
     except Exception as exc:
@@ -297,9 +631,9 @@ def list_videos() -> List[Dict[str, Any]]:
 
 
 @app.get("/videos/{video_id}", response_model=VideoSchema)
-def get_video(video_id: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db.videos.find_one({"video_id": video_id})
+async def get_video(video_id: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db.videos.find_one({"video_id": video_id})
     if doc is None:
         raise HTTPException(status_code=404, detail="video not found")
     return _serialize(doc)
@@ -309,6 +643,15 @@ def get_video(video_id: str) -> Dict[str, Any]:
 def update_video(video_id: str, payload: VideoUpdate) -> Dict[str, Any]:
     db = get_db()
     update = payload.dict(exclude_unset=True)
+    _validate_overlay(update.get("overlay_template"), update.get("captions"))
+    _validate_audio(db, update.get("voice_clone_job_id"), update.get("music_file_location"))
+    if "quote_code" in update or "slide_transition" in update:
+        transition = _validate_slideshow(
+            db, "clips", update.get("quote_code"), update.get("slide_transition")
+        )
+        if "slide_transition" in update:
+            update["slide_transition"] = transition
+    _validate_brand_assets(db, update)
     update["modification_time"] = datetime.utcnow()
 
     doc = db.videos.find_one_and_update(
@@ -325,7 +668,7 @@ def update_video(video_id: str, payload: VideoUpdate) -> Dict[str, Any]:
 
 
 @app.delete("/videos/{video_id}", response_model=VideoSchema)
-def delete_video(video_id: str) -> Dict[str, Any]:
+def delete_video(video_id: str, background_tasks: BackgroundTasks) -> Dict[str, Any]:
     db = get_db()
     doc = db.videos.find_one_and_delete({"video_id": video_id})
     if doc is None:
@@ -335,38 +678,130 @@ def delete_video(video_id: str) -> Dict[str, Any]:
         db.video_parts.find({"video_id": video_id}, {"file_location": 1})
     )
     db.video_parts.delete_many({"video_id": video_id})
-
-    file_locations = [doc.get("output_file_location")] + [
-        part.get("file_location") for part in parts
+    part_paths = [
+        str(Path(part["file_location"]).resolve())
+        for part in parts
+        if part.get("file_location")
     ]
-    for file_location in file_locations:
-        if not file_location:
-            continue
-        try:
-            path = Path(file_location)
-            if path.exists():
-                path.unlink()
-        except Exception as exc:
-            logger.warning("Failed to delete file %s: %s", file_location, exc)
+    chunk_dirs = [
+        str(Path(index["index_path"]).parent)
+        for index in db[MEDIA_CHUNKS_COLLECTION].find(
+            {"path": {"$in": part_paths}}, {"index_path": 1}
+        )
+        if index.get("index_path")
+    ]
+    db[MEDIA_CHUNKS_COLLECTION].delete_many({"path": {"$in": part_paths}})
+
+    file_locations = [
+        doc.get("output_file_location"),
+        doc.get("cover_file_location"),
+        doc.get("preview_file_location"),
+    ] + [part.get("file_location") for part in parts] + chunk_dirs
+    if doc.get("hls_playlist_location"):
+        file_locations.append(str(Path(doc["hls_playlist_location"]).parent))
+    file_locations.append(os.path.join(SEGMENT_CACHE_FOLDER, video_id))
+    # Unlinking large media can stall on busy disks; do it after the response.
+    background_tasks.add_task(
+        delete_paths,
+        [location for location in file_locations if location],
+        logger,
+    )
 
     logger.info("Deleted video %s", video_id)
     return _serialize(doc)
 
 
+@app.api_route("/videos/{video_id}/download", methods=["GET", "HEAD"])
+def download_video(video_id: str, request: Request, download: bool = False) -> Response:
+    db = get_db()
+    doc = db.videos.find_one(
+        {"video_id": video_id},
+        {"_id": 0, "status": 1, "output_file_location": 1, "video_title": 1},
+    )
+    if doc is None:
+        raise HTTPException(status_code=404, detail="video not found")
+    if doc.get("status") != "completed":
+        raise HTTPException(status_code=409, detail="video is not completed yet")
+
+    output_location = str(doc.get("output_file_location") or "").strip()
+    if not output_location:
+        raise HTTPException(status_code=404, detail="output file not available")
+
+    output_path = Path(output_location)
+    if not output_path.is_file():
+        raise HTTPException(status_code=404, detail="output file not found")
+
+    return build_media_response(
+        request,
+        output_path,
+        media_type="video/mp4",
+        filename=output_path.name,
+        as_attachment=download,
+    )
+
+
+def _video_image_response(video_id: str, field_name: str, request: Request) -> Response:
+    db = get_db()
+    doc = db.videos.find_one({"video_id": video_id}, {"_id": 0, field_name: 1})
+    if doc is None:
+        raise HTTPException(status_code=404, detail="video not found")
+    location = str(doc.get(field_name) or "").strip()
+    if not location:
+        raise HTTPException(status_code=404, detail="image not available")
+
+    image_path = Path(location)
+    if not image_path.is_file():
+        raise HTTPException(status_code=404, detail="image file not found")
+
+    media_type = IMAGE_CONTENT_TYPES.get(
+        image_path.suffix.lower(), "application/octet-stream"
+    )
+    return build_media_response(request, image_path, media_type=media_type)
+
+
+@app.api_route("/videos/{video_id}/cover", methods=["GET", "HEAD"])
+def get_video_cover(video_id: str, request: Request) -> Response:
+    return _video_image_response(video_id, "cover_file_location", request)
+
+
+@app.api_route("/videos/{video_id}/preview", methods=["GET", "HEAD"])
+def get_video_preview(video_id: str, request: Request) -> Response:
+    return _video_image_response(video_id, "preview_file_location", request)
+
+
+@app.api_route("/videos/{video_id}/hls/{file_name}", methods=["GET", "HEAD"])
+def get_video_hls_file(video_id: str, file_name: str, request: Request) -> Response:
+    db = get_db()
+    doc = db.videos.find_one(
+        {"video_id": video_id},
+        {"_id": 0, "hls_playlist_location": 1},
+    )
+    if doc is None:
+        raise HTTPException(status_code=404, detail="video not found")
+    playlist_location = str(doc.get("hls_playlist_location") or "").strip()
+    if not playlist_location:
+        raise HTTPException(status_code=404, detail="HLS preview not available")
+
+    hls_dir = Path(playlist_location).parent.resolve()
+    file_path = (hls_dir / file_name).resolve()
+    media_type = HLS_CONTENT_TYPES.get(file_path.suffix.lower())
+    if file_path.parent != hls_dir or media_type is None:
+        raise HTTPException(status_code=400, detail="Invalid HLS file name")
+    if not file_path.is_file():
+        raise HTTPException(status_code=404, detail="HLS file not found")
+
+    return build_media_response(request, file_path, media_type=media_type)
+
+
 @app.post("/videos/{video_id}/enqueue")
 async def enqueue_video(video_id: str) -> JSONResponse:
-    db = get_db()
-    video = db.videos.find_one({"video_id": video_id})
+    db = get_async_db()
+    video = await db.videos.find_one({"video_id": video_id})
     if video is None:
         raise HTTPException(status_code=404, detail="video not found")
 
-    try:
-        redis = await create_pool(RedisSettings.from_dsn(REDIS_URL))
-    except Exception as exc:
-        logger.error("Unable to connect to Redis: %s", exc)
-        raise HTTPException(status_code=503, detail="redis unavailable") from exc
-
-    try:
+    with _redis_errors():
+        redis = await _get_redis()
         await _require_worker_health(
             redis,
             VIDEO_QUEUE_NAME,
@@ -377,21 +812,32 @@ async def enqueue_video(video_id: str) -> JSONResponse:
             video_id,
             _queue_name=VIDEO_QUEUE_NAME,
         )
-    finally:
-        await redis.close()
 
     if job is None:
         raise HTTPException(status_code=500, detail="enqueue failed")
 
+    now = datetime.utcnow()
+    eta = None
+    try:
+        eta = await _video_eta(db, video, now)
+    except Exception as exc:
+        # An estimate is a courtesy; the job is already queued.
+        logger.warning("Unable to estimate ETA for video %s: %s", video_id, exc)
+
     try:
-        db.videos.update_one(
+        await db.videos.update_one(
             {"video_id": video_id},
             {
                 "$set": {
                     "status": "queued",
                     "job_id": job.job_id,
                     "error_reason": None,
-                    "modification_time": datetime.utcnow(),
+                    "attempts": 0,
+                    "heartbeat_at": None,
+                    "render_started_at": None,
+                    "eta_render_seconds": eta["render_seconds"] if eta else None,
+                    "eta_ready_at": eta["ready_at"] if eta else None,
+                    "modification_time": now,
                 }
             },
         )
@@ -400,6 +846,8 @@ async def enqueue_video(video_id: str) -> JSONResponse:
         raise HTTPException(status_code=500, detail="enqueue status update failed") from exc
 
     logger.info("Enqueued video %s as job %s", video_id, job.job_id)
+    if eta:
+        eta["ready_at"] = eta["ready_at"].isoformat()
     return JSONResponse(
         status_code=status.HTTP_202_ACCEPTED,
         content={
@@ -407,19 +855,219 @@ async def enqueue_video(video_id: str) -> JSONResponse:
             "video_id": video_id,
             "job_id": job.job_id,
             "status": "queued",
+            "eta": eta,
         },
     )
 
 
-@app.post("/enque_posts")
-async def enqueue_posts() -> JSONResponse:
+def _throughput_models(db: Any) -> Dict[str, Dict[str, Any]]:
+    docs = (
+        db[RENDER_STATS_COLLECTION]
+        .find(
+            {"input_seconds": {"$gt": 0}, "wall_seconds": {"$gt": 0}},
+            {"_id": 0, "host": 1, "engine": 1, "mode": 1, "input_seconds": 1, "wall_seconds": 1},
+        )
+        .sort("created_at", -1)
+        .limit(ETA_HISTORY)
+    )
+    return fit_throughput_models(docs)
+
+
+async def _video_lane(
+    db: Any, now: datetime, exclude_video_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Videos waiting in or running on the video lane, and the wait they add up to."""
+    query: Dict[str, Any] = {"status": "queued"}
+    if exclude_video_id:
+        query["video_id"] = {"$ne": exclude_video_id}
+    queued = await db.videos.find(query, {"_id": 0, "eta_render_seconds": 1}).to_list(None)
+    running = [
+        {"eta_render_seconds": doc.get("eta_render_seconds"), "started_at": doc.get("render_started_at")}
+        async for doc in db.videos.find(
+            {"status": "processing"}, {"_id": 0, "eta_render_seconds": 1, "render_started_at": 1}
+        )
+    ]
+    return {
+        "queued_videos": len(queued),
+        "processing_videos": len(running),
+        "workers": VIDEO_WORKER_COUNT,
+        "wait_seconds": round(lane_wait_seconds(queued, running, now), 1),
+    }
+
+
+def _predict_render(db: Any, video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     try:
-        redis = await create_pool(RedisSettings.from_dsn(REDIS_URL))
-    except Exception as exc:
-        logger.error("Unable to connect to Redis: %s", exc)
-        raise HTTPException(status_code=503, detail="redis unavailable") from exc
+        payload = _plan_payload(db, video)
+    except HTTPException:
+        # The worker will fail it with the same reason.
+        return None
+    slideshow = "slideshow" in payload
+    engine = "ffmpeg_slideshow" if slideshow else RENDER_ENGINE
+    seconds = input_seconds(payload, SLIDE_SECONDS)
+    render_seconds, basis = predict_render_seconds(
+        _throughput_models(db), engine, "single_pass" if slideshow else None, seconds
+    )
+    return {"input_seconds": seconds, "render_seconds": render_seconds, "basis": basis}
+
+
+async def _video_eta(db: Any, video: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+    # Building the payload shares sync helpers with the worker.
+    predicted = await run_in_threadpool(_predict_render, get_db(), video)
+    if predicted is None:
+        return None
+    lane = await _video_lane(db, now, exclude_video_id=video["video_id"])
+    return {
+        "input_seconds": round(predicted["input_seconds"], 3),
+        "render_seconds": round(predicted["render_seconds"], 1),
+        "queue_wait_seconds": lane["wait_seconds"],
+        "videos_ahead": lane["queued_videos"] + lane["processing_videos"],
+        "ready_at": now + timedelta(seconds=lane["wait_seconds"] + predicted["render_seconds"]),
+        "basis": predicted["basis"],
+    }
+
+
+def _plan_payload(db: Any, video: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        voice_path = resolve_voice_path(db, VOICE_CLONE_JOB_COLLECTION, video)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+    if video.get("video_type") == "quote_slideshow":
+        quote = db[QUOTES_COLLECTION].find_one({"code": video.get("quote_code")}, {"_id": 0})
+        if quote is None:
+            raise HTTPException(status_code=400, detail="quote_code not found")
+        payload = build_slideshow_payload(quote, "plan.mp4", video, voice_path)
+    else:
+        parts = list(
+            db.video_parts.find({"video_id": video["video_id"]}).sort("part_number", 1)
+        )
+        if not parts:
+            raise HTTPException(status_code=400, detail="video has no parts")
+        payload = build_processing_payload(parts, "plan.mp4", video, voice_path)
+    try:
+        payload["brand"] = brand_section(db, BRAND_ASSETS_COLLECTION, video)
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return payload
+
+
+@app.post("/videos/{video_id}/plan")
+def plan_video(video_id: str) -> Dict[str, Any]:
+    """Dry run: what the render engine would do, and what it should cost."""
+    db = get_db()
+    video = db.videos.find_one({"video_id": video_id})
+    if video is None:
+        raise HTTPException(status_code=404, detail="video not found")
+
+    payload = _plan_payload(db, video)
+    # Apply cached loudness gains as the worker would, so segment keys match.
+    loudness_cache = []
+
+    def cached_gain(kind: str, path: str, index: Optional[int]) -> float:
+        record = None
+        if os.path.isfile(path):
+            key, _, _ = asset_key(path)
+            record = db[MEDIA_LOUDNESS_COLLECTION].find_one({"asset_key": key}, {"_id": 0})
+        loudness_cache.append(
+            {"kind": kind, "path": path, "part": index, "hit": record is not None}
+        )
+        return cached_gain_db(record)
+
+    apply_loudness_gains(payload, cached_gain)
+    # After loudness, which is cached against the whole source.
+    chunked = apply_chunk_index(
+        payload, chunk_indexes(db, MEDIA_CHUNKS_COLLECTION, payload), create=False
+    )
+    try:
+        if "slideshow" in payload:
+            plan = plan_slideshow(payload)
+        else:
+            plan = plan_render(
+                parts_from_payload(payload),
+                overlay=overlay_from_payload(payload),
+                audio=audio_from_payload(payload),
+            )
+    except (KeyError, OSError, RuntimeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"unable to plan render: {exc}") from exc
+
+    overlay_inputs = None
+    overlay_cache = []
+    if plan.overlay is not None and plan.overlay.active:
+        overlay_inputs = overlay_layers(
+            plan.overlay, plan.profile.width, plan.profile.height, draw=False
+        )
+        overlay_cache = [
+            {"path": path, "hit": os.path.exists(path)} for path, _ in overlay_inputs
+        ]
+
+    manifest = video.get("render_manifest") or {}
+    cached_keys = set()
+    if plan.mode == "segmented" and manifest.get("version") == SEGMENT_CACHE_VERSION:
+        cached_keys = {entry["key"] for entry in manifest.get("segments", [])}
+
+    parts = []
+    commands = []
+    for number, segment in enumerate(plan.segments):
+        reused = bool(cached_keys) and segment_key(segment, plan) in cached_keys
+        for part in segment.parts:
+            parts.append(
+                {
+                    "index": part.index,
+                    "path": part.path,
+                    "start": part.start,
+                    "end": part.end,
+                    "segment": number,
+                    "method": segment.method,
+                    "reason": segment.reason,
+                    "reused": reused,
+                }
+            )
+        segment_path = os.path.join(SCRATCH_FOLDER, f"segment_{number:03d}.mp4")
+        for cmd, _ in segment_commands(segment, plan, segment_path, overlay_inputs):
+            commands.append(shlex.join(cmd))
 
+    history_docs = (
+        db[RENDER_STATS_COLLECTION]
+        .find({}, {"_id": 0})
+        .sort("created_at", -1)
+        .limit(RENDER_COST_HISTORY)
+    )
     try:
+        estimate = estimate_plan_cost(plan, throughput_from_history(history_docs), probe_media)
+    except (OSError, RuntimeError) as exc:
+        raise HTTPException(status_code=400, detail=f"unable to estimate cost: {exc}") from exc
+
+    # Kept on the video so the scheduler can order jobs by cost.
+    db.videos.update_one(
+        {"video_id": video_id},
+        {
+            "$set": {
+                "estimated_cpu_seconds": estimate["cpu_seconds"],
+                "estimated_size_bytes": estimate["size_bytes"],
+            }
+        },
+    )
+
+    engine = "ffmpeg_slideshow" if "slideshow" in payload else RENDER_ENGINE
+    return {
+        "video_id": video_id,
+        "engine": engine,
+        "plan": plan.to_dict(),
+        "parts": parts,
+        "cache": {
+            "loudness": loudness_cache,
+            "overlays": overlay_cache,
+            "chunked_parts": chunked,
+        },
+        "commands": commands,
+        "estimate": estimate,
+    }
+
+
+@app.post("/enque_posts")
+async def enqueue_posts() -> JSONResponse:
+    with _redis_errors():
+        redis = await _get_redis()
         await _require_worker_health(
             redis,
             POST_QUEUE_NAME,
@@ -429,8 +1077,6 @@ async def enqueue_posts() -> JSONResponse:
             "process_posts",
             _queue_name=POST_QUEUE_NAME,
         )
-    finally:
-        await redis.close()
 
     if job is None:
         raise HTTPException(status_code=500, detail="enqueue failed")
@@ -448,7 +1094,7 @@ async def enqueue_posts() -> JSONResponse:
 
 @app.post("/voice-clones/enqueue", response_model=VoiceCloneEnqueueResponse)
 async def enqueue_voice_clone(payload: VoiceCloneEnqueueRequest) -> JSONResponse:
-    db = get_db()
+    db = get_async_db()
     now = datetime.utcnow()
     voice_clone_job_id = uuid4().hex
 
@@ -480,15 +1126,16 @@ async def enqueue_voice_clone(payload: VoiceCloneEnqueueRequest) -> JSONResponse
     ).to_bson()
 
     try:
-        db[VOICE_CLONE_JOB_COLLECTION].insert_one(doc)
+        await db[VOICE_CLONE_JOB_COLLECTION].insert_one(doc)
+        _count_cache.invalidate(VOICE_CLONE_JOB_COLLECTION)
     except DuplicateKeyError as exc:
         logger.error("Duplicate job_id on voice clone insert: %s", exc)
         raise HTTPException(status_code=409, detail="job_id already exists") from exc
 
     try:
-        redis = await create_pool(RedisSettings.from_dsn(REDIS_URL))
-    except Exception as exc:
-        db[VOICE_CLONE_JOB_COLLECTION].update_one(
+        redis = await _get_redis()
+    except HTTPException:
+        await db[VOICE_CLONE_JOB_COLLECTION].update_one(
             {"job_id": voice_clone_job_id},
             {
                 "$set": {
@@ -498,34 +1145,34 @@ async def enqueue_voice_clone(payload: VoiceCloneEnqueueRequest) -> JSONResponse
                 }
             },
         )
-        logger.error("Unable to connect to Redis: %s", exc)
-        raise HTTPException(status_code=503, detail="redis unavailable") from exc
+        raise
 
     try:
-        await _require_worker_health(
-            redis,
-            VOICE_CLONE_QUEUE_NAME,
-            "voice clone",
-        )
-        job = await redis.enqueue_job(
-            "process_voice_clone_job",
-            voice_clone_job_id,
-            _queue_name=VOICE_CLONE_QUEUE_NAME,
-        )
-    except HTTPException:
-        db[VOICE_CLONE_JOB_COLLECTION].update_one(
+        with _redis_errors():
+            await _require_worker_health(
+                redis,
+                VOICE_CLONE_QUEUE_NAME,
+                "voice clone",
+            )
+            job = await redis.enqueue_job(
+                "process_voice_clone_job",
+                voice_clone_job_id,
+                _queue_name=VOICE_CLONE_QUEUE_NAME,
+            )
+    except HTTPException as exc:
+        await db[VOICE_CLONE_JOB_COLLECTION].update_one(
             {"job_id": voice_clone_job_id},
             {
                 "$set": {
                     "status": "failed",
-                    "error_reason": "voice clone worker unavailable",
+                    "error_reason": exc.detail,
                     "updated_at": datetime.utcnow(),
                 }
             },
         )
         raise
     except Exception as exc:
-        db[VOICE_CLONE_JOB_COLLECTION].update_one(
+        await db[VOICE_CLONE_JOB_COLLECTION].update_one(
             {"job_id": voice_clone_job_id},
             {
                 "$set": {
@@ -537,11 +1184,9 @@ async def enqueue_voice_clone(payload: VoiceCloneEnqueueRequest) -> JSONResponse
         )
         logger.error("Failed to enqueue voice clone job: %s", exc)
         raise HTTPException(status_code=500, detail="enqueue failed") from exc
-    finally:
-        await redis.close()
 
     if job is None:
-        db[VOICE_CLONE_JOB_COLLECTION].update_one(
+        await db[VOICE_CLONE_JOB_COLLECTION].update_one(
             {"job_id": voice_clone_job_id},
             {
                 "$set": {
@@ -553,6 +1198,10 @@ async def enqueue_voice_clone(payload: VoiceCloneEnqueueRequest) -> JSONResponse
         )
         raise HTTPException(status_code=500, detail="enqueue failed")
 
+    await db[VOICE_CLONE_JOB_COLLECTION].update_one(
+        {"job_id": voice_clone_job_id},
+        {"$set": {"arq_job_id": job.job_id}},
+    )
     logger.info(
         "Enqueued voice clone job %s as arq job %s",
         voice_clone_job_id,
@@ -569,32 +1218,31 @@ async def enqueue_voice_clone(payload: VoiceCloneEnqueueRequest) -> JSONResponse
 
 
 @app.get("/voice-clones")
-def list_voice_clones(
-    response: Response, page: int = 1, page_size: int = 10
+async def list_voice_clones(
+    response: Response,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
 ) -> List[Dict[str, Any]]:
-    if page < 1 or page_size < 1:
-        raise HTTPException(
-            status_code=400, detail="page and page_size must be >= 1"
-        )
-
-    db = get_db()
-    total_count = db[VOICE_CLONE_JOB_COLLECTION].count_documents({})
-    response.headers["X-Total-Count"] = str(total_count)
-    skip = (page - 1) * page_size
-    cursor = (
-        db[VOICE_CLONE_JOB_COLLECTION]
-        .find({}, {"_id": 0})
-        .sort("updated_at", -1)
-        .skip(skip)
-        .limit(page_size)
+    db = get_async_db()
+    docs = await _list_page(
+        response,
+        db[VOICE_CLONE_JOB_COLLECTION],
+        {},
+        [("updated_at", -1), ("_id", -1)],
+        page,
+        page_size,
+        cursor,
+        with_total,
     )
-    return [dict(doc) for doc in cursor]
+    return [{key: value for key, value in doc.items() if key != "_id"} for doc in docs]
 
 
 @app.get("/voice-clones/{voice_clone_job_id}")
-def get_voice_clone(voice_clone_job_id: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db[VOICE_CLONE_JOB_COLLECTION].find_one(
+async def get_voice_clone(voice_clone_job_id: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[VOICE_CLONE_JOB_COLLECTION].find_one(
         {"job_id": voice_clone_job_id},
         {"_id": 0},
     )
@@ -603,8 +1251,10 @@ def get_voice_clone(voice_clone_job_id: str) -> Dict[str, Any]:
     return dict(doc)
 
 
-@app.get("/voice-clones/{voice_clone_job_id}/download")
-def download_voice_clone(voice_clone_job_id: str) -> FileResponse:
+@app.api_route("/voice-clones/{voice_clone_job_id}/download", methods=["GET", "HEAD"])
+def download_voice_clone(
+    voice_clone_job_id: str, request: Request, download: bool = True
+) -> Response:
     db = get_db()
     doc = db[VOICE_CLONE_JOB_COLLECTION].find_one(
         {"job_id": voice_clone_job_id},
@@ -623,11 +1273,271 @@ def download_voice_clone(voice_clone_job_id: str) -> FileResponse:
     if not output_path.exists():
         raise HTTPException(status_code=404, detail="output file not found")
 
-    return FileResponse(
-        path=output_path,
+    return build_media_response(
+        request,
+        output_path,
         media_type="audio/wav",
         filename=f"{voice_clone_job_id}.wav",
+        as_attachment=download,
+    )
+
+
+@app.get("/dead-letters", response_model=List[DeadLetterSchema])
+async def list_dead_letters(
+    response: Response,
+    page: int = 1,
+    page_size: int = 20,
+    status: Optional[str] = None,
+    function_name: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    if page < 1 or page_size < 1:
+        raise HTTPException(
+            status_code=400, detail="page and page_size must be >= 1"
+        )
+
+    db = get_async_db()
+    query: Dict[str, Any] = {}
+    if status is not None:
+        query["status"] = status
+    if function_name is not None:
+        query["function_name"] = function_name
+
+    total_count = await db[DEAD_LETTER_COLLECTION].count_documents(query)
+    response.headers["X-Total-Count"] = str(total_count)
+    skip = (page - 1) * page_size
+    cursor = (
+        db[DEAD_LETTER_COLLECTION]
+        .find(query, {"_id": 0})
+        .sort("created_at", -1)
+        .skip(skip)
+        .limit(page_size)
+    )
+    return [dict(doc) async for doc in cursor]
+
+
+@app.get("/dead-letters/{dead_letter_id}", response_model=DeadLetterSchema)
+async def get_dead_letter(dead_letter_id: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[DEAD_LETTER_COLLECTION].find_one(
+        {"dead_letter_id": dead_letter_id},
+        {"_id": 0},
+    )
+    if doc is None:
+        raise HTTPException(status_code=404, detail="dead letter not found")
+    return dict(doc)
+
+
+# Job documents a replay puts back in the queue:
+# function -> (collection, key field, ARQ job id field, timestamp field).
+_REPLAY_TARGETS = {
+    "process_video": ("videos", "video_id", "job_id", "modification_time"),
+    "process_voice_clone_job": (
+        VOICE_CLONE_JOB_COLLECTION,
+        "job_id",
+        "arq_job_id",
+        "updated_at",
+    ),
+}
+
+
+@app.post("/dead-letters/{dead_letter_id}/replay")
+async def replay_dead_letter(dead_letter_id: str) -> JSONResponse:
+    db = get_async_db()
+    doc = await db[DEAD_LETTER_COLLECTION].find_one({"dead_letter_id": dead_letter_id})
+    if doc is None:
+        raise HTTPException(status_code=404, detail="dead letter not found")
+
+    function_name = doc.get("function_name", "")
+    queue_name = doc.get("queue_name") or FUNCTION_QUEUE_NAMES.get(function_name)
+    if not queue_name:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown job function: {function_name}"
+        )
+
+    with _redis_errors():
+        redis = await _get_redis()
+        await _require_worker_health(
+            redis,
+            queue_name,
+            queue_name.rsplit(":", 1)[-1].replace("_", " "),
+        )
+    args = doc.get("args", [])
+    target = _REPLAY_TARGETS.get(function_name) if args else None
+    if target is not None:
+        # A replay is a fresh start: clear the failure and the crash count
+        # before a worker can pick the job up.
+        collection, key_field, _, timestamp_field = target
+        await db[collection].update_one(
+            {key_field: args[0]},
+            {
+                "$set": {
+                    "status": "queued",
+                    "error_reason": None,
+                    "attempts": 0,
+                    "heartbeat_at": None,
+                    timestamp_field: datetime.utcnow(),
+                }
+            },
+        )
+    with _redis_errors():
+        job = await redis.enqueue_job(
+            function_name,
+            *args,
+            _queue_name=queue_name,
+        )
+
+    if job is None:
+        raise HTTPException(status_code=500, detail="enqueue failed")
+    if target is not None:
+        collection, key_field, arq_id_field, _ = target
+        await db[collection].update_one(
+            {key_field: args[0]}, {"$set": {arq_id_field: job.job_id}}
+        )
+
+    await db[DEAD_LETTER_COLLECTION].update_one(
+        {"dead_letter_id": dead_letter_id},
+        {
+            "$set": {
+                "status": "replayed",
+                "replay_job_id": job.job_id,
+                "replayed_at": datetime.utcnow(),
+            },
+            "$inc": {"replay_count": 1},
+        },
+    )
+
+    logger.info(
+        "Replayed dead letter %s (%s) as job %s",
+        dead_letter_id,
+        function_name,
+        job.job_id,
     )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "message": "dead letter replayed",
+            "dead_letter_id": dead_letter_id,
+            "job_id": job.job_id,
+            "status": "queued",
+        },
+    )
+
+
+@app.get("/storage")
+def get_storage_usage() -> List[Dict[str, Any]]:
+    manager = StorageManager(get_db(), logger=logger)
+    return manager.usage_report()
+
+
+@app.post("/storage/gc")
+def run_storage_gc(dry_run: bool = True) -> Dict[str, Dict[str, int]]:
+    manager = StorageManager(get_db(), logger=logger)
+    summary = manager.collect_garbage(dry_run=dry_run)
+    logger.info("Storage GC requested via API dry_run=%s: %s", dry_run, summary)
+    return summary
+
+
+@app.get("/render-stats/summary")
+async def get_render_stats_summary(limit: int = 200) -> Dict[str, Any]:
+    """Peak RSS, CPU and wall time of recent renders, per engine and stage."""
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be >= 1")
+    db = get_async_db()
+    docs = await (
+        db[RENDER_STATS_COLLECTION]
+        .find({}, {"_id": 0, "engine": 1, "resource_usage": 1})
+        .sort("created_at", -1)
+        .limit(limit)
+        .to_list(None)
+    )
+    # Failed (including OOM-killed) jobs only leave usage on the video.
+    failed = [
+        {"engine": doc.get("video_type") or "clips", "resource_usage": doc["resource_usage"]}
+        async for doc in db.videos.find(
+            {"status": "failed", "resource_usage": {"$ne": None}},
+            {"_id": 0, "video_type": 1, "resource_usage": 1},
+        )
+        .sort("modification_time", -1)
+        .limit(limit)
+    ]
+    return {
+        "renders": len(docs),
+        "engines": summarize_resource_usage(docs),
+        "failed_jobs": len(failed),
+        "failed_by_video_type": summarize_resource_usage(failed),
+    }
+
+
+@app.get("/render-stats/throughput")
+def get_render_throughput() -> Dict[str, Any]:
+    """Fitted per-host render throughput used for ETAs."""
+    models = _throughput_models(get_db())
+    return {
+        "hosts": {
+            host: {key: model.to_dict() for key, model in host_models.items()}
+            for host, host_models in models.items()
+        }
+    }
+
+
+@app.get("/queues/eta")
+async def get_queue_eta() -> Dict[str, Any]:
+    """Jobs waiting per lane and how long a new job would wait."""
+    db = get_async_db()
+    now = datetime.utcnow()
+    lanes = {
+        "video": VIDEO_QUEUE_NAME,
+        "voice_clone": VOICE_CLONE_QUEUE_NAME,
+        "ai": AI_QUEUE_NAME,
+        "post": POST_QUEUE_NAME,
+    }
+    with _redis_errors():
+        redis = await _get_redis()
+        queued = {lane: await redis.zcard(queue_name) for lane, queue_name in lanes.items()}
+
+    # Voice clone jobs have no size to model; use the median of recent ones.
+    durations = [
+        (doc["completed_at"] - doc["started_at"]).total_seconds()
+        async for doc in db[VOICE_CLONE_JOB_COLLECTION]
+        .find(
+            {"status": "completed", "started_at": {"$ne": None}, "completed_at": {"$ne": None}},
+            {"_id": 0, "started_at": 1, "completed_at": 1},
+        )
+        .sort("completed_at", -1)
+        .limit(ETA_HISTORY)
+    ]
+    voice_seconds = statistics.median(durations) if durations else None
+
+    result: Dict[str, Any] = {}
+    for lane, queue_name in lanes.items():
+        result[lane] = {"queue_name": queue_name, "queued_jobs": queued[lane], "wait_seconds": None}
+    result["video"].update(await _video_lane(db, now))
+    result["voice_clone"]["job_seconds"] = round(voice_seconds, 1) if voice_seconds else None
+    if voice_seconds:
+        # One clone at a time per worker.
+        result["voice_clone"]["wait_seconds"] = round(queued["voice_clone"] * voice_seconds, 1)
+    return result
+
+
+@app.get("/overlay-templates")
+def list_overlay_templates() -> List[Dict[str, Any]]:
+    return [
+        {"name": template.name, "text": template.text, "position": template.position}
+        for template in OVERLAY_TEMPLATES.values()
+    ]
+
+
+@app.get("/transitions")
+def list_transitions() -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": spec.name,
+            "default_duration": spec.default_duration,
+            "overlaps": spec.overlaps,
+            "description": spec.description,
+        }
+        for spec in TRANSITIONS.values()
+    ]
 
 
 @app.post("/video-parts", response_model=VideoPartSchema)
@@ -636,6 +1546,7 @@ def create_video_part(payload: VideoPartCreate) -> Dict[str, Any]:
     now = datetime.utcnow()
     duration_seconds = _probe_duration_seconds(payload.file_location)
     _validate_times(payload.start_time, payload.end_time, duration_seconds)
+    transition = _validate_transition(payload.transition)
     file_duration = _format_hms(duration_seconds)
     video_parts_id = payload.video_parts_id or uuid4().hex
 
@@ -651,6 +1562,9 @@ def create_video_part(payload: VideoPartCreate) -> Dict[str, Any]:
         "video_size": file_duration,
         "total_duration": duration_seconds,
         "selected_duration": payload.selected_duration,
+        "transition": transition,
+        "transition_duration": payload.transition_duration,
+        "keep_audio": payload.keep_audio,
         "modification_time": now,
         "active": True if payload.active is None else payload.active,
         "creation_time": now,
@@ -662,16 +1576,16 @@ def create_video_part(payload: VideoPartCreate) -> Dict[str, Any]:
 
 
 @app.get("/video-parts", response_model=List[VideoPartSchema])
-def list_video_parts() -> List[Dict[str, Any]]:
-    db = get_db()
-    docs = [_serialize(doc) for doc in db.video_parts.find({})]
+async def list_video_parts() -> List[Dict[str, Any]]:
+    db = get_async_db()
+    docs = [_serialize(doc) async for doc in db.video_parts.find({})]
     return docs
 
 
 @app.get("/video-parts/{video_parts_id}", response_model=VideoPartSchema)
-def get_video_part(video_parts_id: int) -> Dict[str, Any]:
-    db = get_db()
-    doc = db.video_parts.find_one({"video_parts_id": video_parts_id})
+async def get_video_part(video_parts_id: int) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db.video_parts.find_one({"video_parts_id": video_parts_id})
     if doc is None:
         raise HTTPException(status_code=404, detail="video part not found")
     return _serialize(doc)
@@ -686,6 +1600,8 @@ def update_video_part(
     if existing is None:
         raise HTTPException(status_code=404, detail="video part not found")
     update = payload.dict(exclude_unset=True)
+    if "transition" in update:
+        update["transition"] = _validate_transition(update["transition"])
     merged = {**existing, **update}
     duration_seconds = _probe_duration_seconds(merged.get("file_location", ""))
     _validate_times(merged.get("start_time", ""), merged.get("end_time", ""), duration_seconds)
@@ -705,9 +1621,9 @@ def update_video_part(
 
 
 @app.delete("/video-parts/{video_parts_id}", response_model=VideoPartSchema)
-def delete_video_part(video_parts_id: int) -> Dict[str, Any]:
-    db = get_db()
-    doc = db.video_parts.find_one_and_delete({"video_parts_id": video_parts_id})
+async def delete_video_part(video_parts_id: int) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db.video_parts.find_one_and_delete({"video_parts_id": video_parts_id})
     if doc is None:
         raise HTTPException(status_code=404, detail="video part not found")
 
@@ -715,6 +1631,77 @@ def delete_video_part(video_parts_id: int) -> Dict[str, Any]:
     return _serialize(doc)
 
 
+def _serialize_brand_asset(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc = _serialize(doc)
+    doc["renditions"] = rendition_keys(doc.get("renditions_dir", ""))
+    return doc
+
+
+@app.post("/brand-assets", response_model=BrandAssetSchema)
+def create_brand_asset(payload: BrandAssetCreate) -> Dict[str, Any]:
+    db = get_db()
+    source = Path(payload.file_location)
+    if not source.is_file():
+        raise HTTPException(status_code=400, detail="file_location not found")
+    try:
+        info = probe_media(str(source))
+    except (OSError, RuntimeError) as exc:
+        raise HTTPException(status_code=400, detail=f"unable to probe file: {exc}") from exc
+    if not info.width or info.duration <= 0:
+        raise HTTPException(status_code=400, detail="file_location is not a video")
+    if db[BRAND_ASSETS_COLLECTION].find_one({"name": payload.name}, {"_id": 1}):
+        raise HTTPException(status_code=409, detail="brand asset name already exists")
+
+    asset_id = uuid4().hex
+    asset = BrandAssetModel(
+        asset_id=asset_id,
+        name=payload.name,
+        kind=payload.kind,
+        source_path=str(source.resolve()),
+        duration=round(info.duration, 3),
+        has_audio=info.has_audio,
+        renditions_dir=renditions_dir_for(asset_id),
+        is_default=payload.is_default,
+    )
+    if payload.is_default:
+        db[BRAND_ASSETS_COLLECTION].update_many(
+            {"kind": payload.kind, "is_default": True}, {"$set": {"is_default": False}}
+        )
+    try:
+        db[BRAND_ASSETS_COLLECTION].insert_one(asset.to_bson())
+    except DuplicateKeyError as exc:
+        raise HTTPException(status_code=409, detail="brand asset name already exists") from exc
+
+    logger.info("Created brand %s %s", payload.kind, asset_id)
+    return _serialize_brand_asset(asset.to_bson())
+
+
+@app.get("/brand-assets", response_model=List[BrandAssetSchema])
+async def list_brand_assets() -> List[Dict[str, Any]]:
+    db = get_async_db()
+    docs = await db[BRAND_ASSETS_COLLECTION].find({}).sort("created_at", -1).to_list(None)
+    # Listing each renditions folder is blocking filesystem I/O.
+    return await run_in_threadpool(
+        lambda: [_serialize_brand_asset(doc) for doc in docs]
+    )
+
+
+@app.delete("/brand-assets/{asset_id}", response_model=BrandAssetSchema)
+def delete_brand_asset(asset_id: str, background_tasks: BackgroundTasks) -> Dict[str, Any]:
+    db = get_db()
+    if db.videos.find_one(
+        {"$or": [{"intro_asset_id": asset_id}, {"outro_asset_id": asset_id}]}, {"_id": 1}
+    ):
+        raise HTTPException(status_code=409, detail="brand asset is used by a video")
+    doc = db[BRAND_ASSETS_COLLECTION].find_one_and_delete({"asset_id": asset_id})
+    if doc is None:
+        raise HTTPException(status_code=404, detail="brand asset not found")
+    # The uploaded source stays; only the renditions belong to the library.
+    background_tasks.add_task(delete_paths, [doc.get("renditions_dir")], logger)
+    logger.info("Deleted brand asset %s", asset_id)
+    return _serialize_brand_asset(doc)
+
+
 @app.post("/call_api", response_model=CallApiResponse)
 async def call_api(payload: CallApiRequest) -> JSONResponse:
     ai_type = payload.ai_type
@@ -737,13 +1724,8 @@ async def call_api(payload: CallApiRequest) -> JSONResponse:
             detail=f"Missing required input fields for {ai_type}: {missing_list}",
         )
 
-    try:
-        redis = await create_pool(RedisSettings.from_dsn(REDIS_URL))
-    except Exception as exc:
-        logger.error("Unable to connect to Redis: %s", exc)
-        raise HTTPException(status_code=503, detail="redis unavailable") from exc
-
-    try:
+    with _redis_errors():
+        redis = await _get_redis()
         await _require_worker_health(
             redis,
             AI_QUEUE_NAME,
@@ -755,8 +1737,6 @@ async def call_api(payload: CallApiRequest) -> JSONResponse:
             payload.input,
             _queue_name=AI_QUEUE_NAME,
         )
-    finally:
-        await redis.close()
 
     if job is None:
         raise HTTPException(status_code=500, detail="enqueue failed")
@@ -773,8 +1753,8 @@ async def call_api(payload: CallApiRequest) -> JSONResponse:
 
 
 @app.post("/monthly-figures", response_model=RawPostsDataResponse)
-def create_monthly_figures(payload: RawPostsDataCreate) -> Dict[str, Any]:
-    db = get_db()
+async def create_monthly_figures(payload: RawPostsDataCreate) -> Dict[str, Any]:
+    db = get_async_db()
     model = RawPostsDataModel(
         code=payload.code,
         name=payload.name,
@@ -790,7 +1770,8 @@ def create_monthly_figures(payload: RawPostsDataCreate) -> Dict[str, Any]:
     doc = model.to_bson()
 
     try:
-        result = db[RAW_POSTS_COLLECTION].insert_one(doc)
+        result = await db[RAW_POSTS_COLLECTION].insert_one(doc)
+        _count_cache.invalidate(RAW_POSTS_COLLECTION)
     except DuplicateKeyError as exc:
         logger.error("Duplicate code on raw_posts_data insert: %s", exc)
         raise HTTPException(status_code=409, detail="code already exists") from exc
@@ -800,63 +1781,57 @@ def create_monthly_figures(payload: RawPostsDataCreate) -> Dict[str, Any]:
 
 
 @app.get("/monthly-figures", response_model=List[RawPostsDataResponse])
-def list_monthly_figures(
-    response: Response, page: int = 1, page_size: int = 20
+async def list_monthly_figures(
+    response: Response,
+    page: int = 1,
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
 ) -> List[Dict[str, Any]]:
-    if page < 1 or page_size < 1:
-        raise HTTPException(
-            status_code=400, detail="page and page_size must be >= 1"
-        )
-
-    db = get_db()
-    total_count = db[RAW_POSTS_COLLECTION].count_documents({})
-    response.headers["X-Total-Count"] = str(total_count)
-    skip = (page - 1) * page_size
-    cursor = db[RAW_POSTS_COLLECTION].find({}).skip(skip).limit(page_size)
-    return [_serialize_raw_post(doc) for doc in cursor]
+    db = get_async_db()
+    docs = await _list_page(
+        response, db[RAW_POSTS_COLLECTION], {}, [("_id", 1)], page, page_size, cursor, with_total
+    )
+    return [_serialize_raw_post(doc) for doc in docs]
 
 
 @app.get("/raw_posts", response_model=List[RawPostsDataResponse])
-def list_raw_posts(
+async def list_raw_posts(
     response: Response,
     page: int = 1,
     page_size: int = 20,
     quote_created: Optional[bool] = None,
     posted: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
 ) -> List[Dict[str, Any]]:
-    if page < 1 or page_size < 1:
-        raise HTTPException(
-            status_code=400, detail="page and page_size must be >= 1"
-        )
-
-    db = get_db()
-    skip = (page - 1) * page_size
+    db = get_async_db()
     query: Dict[str, Any] = {}
     if quote_created is not None:
         query["quote_created"] = quote_created
     if posted is not None:
         query["posted"] = posted
 
-    total_count = db[RAW_POSTS_COLLECTION].count_documents(query)
-    response.headers["X-Total-Count"] = str(total_count)
-    cursor = db[RAW_POSTS_COLLECTION].find(query).skip(skip).limit(page_size)
-    return [_serialize_raw_post(doc) for doc in cursor]
+    docs = await _list_page(
+        response, db[RAW_POSTS_COLLECTION], query, [("_id", 1)], page, page_size, cursor, with_total
+    )
+    return [_serialize_raw_post(doc) for doc in docs]
 
 
 @app.get("/monthly-figures/{item_id}", response_model=RawPostsDataResponse)
-def get_monthly_figure(item_id: str) -> Dict[str, Any]:
-    db = get_db()
+async def get_monthly_figure(item_id: str) -> Dict[str, Any]:
+    db = get_async_db()
     oid = _parse_object_id(item_id)
-    doc = db[RAW_POSTS_COLLECTION].find_one({"_id": oid})
+    doc = await db[RAW_POSTS_COLLECTION].find_one({"_id": oid})
     if doc is None:
         raise HTTPException(status_code=404, detail="monthly figure not found")
     return _serialize_raw_post(doc)
 
 
 @app.get("/raw_posts/{code}", response_model=RawPostsDataResponse)
-def get_raw_post(code: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db[RAW_POSTS_COLLECTION].find_one({"code": code})
+async def get_raw_post(code: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[RAW_POSTS_COLLECTION].find_one({"code": code})
     if doc is None:
         try:
             oid = _parse_object_id(code)
@@ -864,27 +1839,31 @@ def get_raw_post(code: str) -> Dict[str, Any]:
             raise HTTPException(
                 status_code=404, detail="raw post not found"
             ) from exc
-        doc = db[RAW_POSTS_COLLECTION].find_one({"_id": oid})
+        doc = await db[RAW_POSTS_COLLECTION].find_one({"_id": oid})
         if doc is None:
             raise HTTPException(status_code=404, detail="raw post not found")
     return _serialize_raw_post(doc)
 
 
 @app.patch("/monthly-figures/{item_id}", response_model=RawPostsDataResponse)
-def update_monthly_figure(
+async def update_monthly_figure(
     item_id: str, payload: RawPostsDataUpdate
 ) -> Dict[str, Any]:
-    db = get_db()
+    db = get_async_db()
     oid = _parse_object_id(item_id)
     update = payload.dict(exclude_unset=True)
     if "updated_on" not in update:
         update["updated_on"] = _now_str()
 
-    doc = db[RAW_POSTS_COLLECTION].find_one_and_update(
+    doc = await db[RAW_POSTS_COLLECTION].find_one_and_update(
         {"_id": oid},
         {"$set": update},
         return_document=ReturnDocument.AFTER,
     )
+    # Flags like posted/quote_created move documents between filtered totals,
+    # including the posted-filtered person bio and quotes lists.
+    for collection in (RAW_POSTS_COLLECTION, PERSON_BIO_COLLECTION, QUOTES_COLLECTION):
+        _count_cache.invalidate(collection)
 
     if doc is None:
         raise HTTPException(status_code=404, detail="monthly figure not found")
@@ -893,114 +1872,114 @@ def update_monthly_figure(
 
 
 @app.delete("/monthly-figures/{item_id}", response_model=RawPostsDataResponse)
-def delete_monthly_figure(item_id: str) -> Dict[str, Any]:
-    db = get_db()
+async def delete_monthly_figure(item_id: str) -> Dict[str, Any]:
+    db = get_async_db()
     oid = _parse_object_id(item_id)
-    doc = db[RAW_POSTS_COLLECTION].find_one_and_delete({"_id": oid})
+    doc = await db[RAW_POSTS_COLLECTION].find_one_and_delete({"_id": oid})
+    _count_cache.invalidate(RAW_POSTS_COLLECTION)
     if doc is None:
         raise HTTPException(status_code=404, detail="monthly figure not found")
     return _serialize_raw_post(doc)
 
 
-def _get_codes_for_posted(db: Any, posted: bool) -> List[str]:
-    cursor = db[RAW_POSTS_COLLECTION].find(
-        {"posted": posted},
-        {"code": 1},
-    )
-    return [doc["code"] for doc in cursor if doc.get("code")]
+def _posted_join(posted: bool) -> List[Dict[str, Any]]:
+    """Keep documents whose raw post has ``posted``; joined on the unique code index."""
+    return [
+        {
+            "$lookup": {
+                "from": RAW_POSTS_COLLECTION,
+                "localField": "code",
+                "foreignField": "code",
+                "pipeline": [{"$match": {"posted": posted}}, {"$project": {"_id": 1}}],
+                "as": "_raw_post",
+            }
+        },
+        {"$match": {"_raw_post": {"$ne": []}}},
+        {"$project": {"_raw_post": 0}},
+    ]
 
 
 @app.get("/person-bio")
-def list_person_bio(
+async def list_person_bio(
+    response: Response,
     page: int = 1,
     page_size: int = 20,
     posted: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
 ) -> List[Dict[str, Any]]:
-    if page < 1 or page_size < 1:
-        raise HTTPException(
-            status_code=400, detail="page and page_size must be >= 1"
-        )
-
-    db = get_db()
-    skip = (page - 1) * page_size
-    query: Dict[str, Any] = {}
-    if posted is not None:
-        codes = _get_codes_for_posted(db, posted)
-        if not codes:
-            return []
-        query = {"code": {"$in": codes}}
-
-    cursor = (
-        db[PERSON_BIO_COLLECTION]
-        .find(query)
-        .sort("code", 1)
-        .skip(skip)
-        .limit(page_size)
+    db = get_async_db()
+    docs = await _list_page(
+        response,
+        db[PERSON_BIO_COLLECTION],
+        {},
+        [("code", 1), ("_id", 1)],
+        page,
+        page_size,
+        cursor,
+        with_total,
+        join=_posted_join(posted) if posted is not None else None,
     )
-    return [_serialize_with_id(doc) for doc in cursor]
+    return [_serialize_with_id(doc) for doc in docs]
 
 
 @app.get("/person-bio/{code}")
-def get_person_bio(code: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db[PERSON_BIO_COLLECTION].find_one({"code": code})
+async def get_person_bio(code: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[PERSON_BIO_COLLECTION].find_one({"code": code})
     if doc is None:
         raise HTTPException(status_code=404, detail="person bio not found")
     return _serialize_with_id(doc)
 
 
 @app.delete("/person-bio/{code}")
-def delete_person_bio(code: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db[PERSON_BIO_COLLECTION].find_one_and_delete({"code": code})
+async def delete_person_bio(code: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[PERSON_BIO_COLLECTION].find_one_and_delete({"code": code})
+    _count_cache.invalidate(PERSON_BIO_COLLECTION)
     if doc is None:
         raise HTTPException(status_code=404, detail="person bio not found")
     return _serialize_with_id(doc)
 
 
 @app.get("/quotes")
-def list_quotes(
+async def list_quotes(
+    response: Response,
     page: int = 1,
     page_size: int = 20,
     posted: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = True,
 ) -> List[Dict[str, Any]]:
-    if page < 1 or page_size < 1:
-        raise HTTPException(
-            status_code=400, detail="page and page_size must be >= 1"
-        )
-
-    db = get_db()
-    skip = (page - 1) * page_size
-    query: Dict[str, Any] = {}
-    if posted is not None:
-        codes = _get_codes_for_posted(db, posted)
-        if not codes:
-            return []
-        query = {"code": {"$in": codes}}
-
-    cursor = (
-        db[QUOTES_COLLECTION]
-        .find(query)
-        .sort("code", 1)
-        .skip(skip)
-        .limit(page_size)
+    db = get_async_db()
+    docs = await _list_page(
+        response,
+        db[QUOTES_COLLECTION],
+        {},
+        [("code", 1), ("_id", 1)],
+        page,
+        page_size,
+        cursor,
+        with_total,
+        join=_posted_join(posted) if posted is not None else None,
     )
-    return [_serialize_with_id(doc) for doc in cursor]
+    return [_serialize_with_id(doc) for doc in docs]
 
 
 @app.get("/quotes/{code}")
-def get_quotes(code: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db[QUOTES_COLLECTION].find_one({"code": code})
+async def get_quotes(code: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[QUOTES_COLLECTION].find_one({"code": code})
     if doc is None:
         raise HTTPException(status_code=404, detail="quotes not found")
     return _serialize_with_id(doc)
 
 
 @app.delete("/quotes/{code}")
-def delete_quotes(code: str) -> Dict[str, Any]:
-    db = get_db()
-    doc = db[QUOTES_COLLECTION].find_one_and_delete({"code": code})
+async def delete_quotes(code: str) -> Dict[str, Any]:
+    db = get_async_db()
+    doc = await db[QUOTES_COLLECTION].find_one_and_delete({"code": code})
+    _count_cache.invalidate(QUOTES_COLLECTION)
     if doc is None:
         raise HTTPException(status_code=404, detail="quotes not found")
     return _serialize_with_id(doc)
@@ -0,0 +1,256 @@
+"""HTTP media serving with Range, ETag and conditional GET support.
+
+Rendered reels and voice clips are served through ``build_media_response``.
+It answers single-range requests with 206 so browser seeks only fetch the
+bytes they need, short-circuits revalidation with 304, and streams the body
+with the ASGI ``http.response.zerocopysend`` extension (sendfile) when the
+server offers it. When ``MEDIA_ACCEL_REDIRECT_PREFIX`` is configured the
+transfer is handed to a fronting nginx via ``X-Accel-Redirect`` instead.
+"""
+
+from __future__ import annotations
+
+import os
+import stat as stat_module
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from dotenv import find_dotenv, load_dotenv
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+load_dotenv(find_dotenv())
+
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "").rstrip("/")
+MEDIA_ACCEL_REDIRECT_ROOT = os.getenv("MEDIA_ACCEL_REDIRECT_ROOT", "")
+MEDIA_CACHE_CONTROL = os.getenv("MEDIA_CACHE_CONTROL", "private, max-age=0, must-revalidate")
+CHUNK_SIZE = 256 * 1024
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _etag(file_stat: os.stat_result) -> str:
+    return f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"'
+
+
+def _content_disposition(filename: Optional[str], as_attachment: bool) -> Optional[str]:
+    if not filename:
+        return None
+    kind = "attachment" if as_attachment else "inline"
+    return f"{kind}; filename*=utf-8''{quote(filename)}"
+
+
+def parse_range_header(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a ``bytes=`` Range header into an inclusive (start, end) pair.
+
+    Returns None when the header should be ignored (unknown unit, a
+    multi-range request, or an invalid spec such as ``bytes=5-2``), which we
+    answer with the full body as RFC 9110 allows. Raises RangeNotSatisfiable
+    for ranges outside the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            start = max(size - suffix, 0)
+            end = size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= int(since)
+    return False
+
+
+def _if_range_matches(request: Request, etag: str, mtime: float) -> bool:
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return if_range == etag
+    try:
+        return int(parsedate_to_datetime(if_range).timestamp()) == int(mtime)
+    except (TypeError, ValueError):
+        return False
+
+
+class MediaFileResponse(Response):
+    """Stream a byte range of a file, using sendfile when the server allows."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        status_code: int,
+        headers: Dict[str, str],
+        media_type: str,
+        offset: int = 0,
+        length: int = 0,
+        send_body: bool = True,
+    ) -> None:
+        self.path = path
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.offset = offset
+        self.length = length
+        self.send_body = send_body
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        with open(self.path, "rb") as handle:
+            if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send(
+                    {
+                        "type": ZEROCOPY_EXTENSION,
+                        "file": handle,
+                        "offset": self.offset,
+                        "count": self.length,
+                        "more_body": False,
+                    }
+                )
+                return
+
+            fd = handle.fileno()
+            position = self.offset
+            remaining = self.length
+            while remaining > 0:
+                size = min(CHUNK_SIZE, remaining)
+                chunk = await anyio.to_thread.run_sync(os.pread, fd, size, position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _accel_redirect_path(path: Path) -> Optional[str]:
+    if not MEDIA_ACCEL_REDIRECT_PREFIX or not MEDIA_ACCEL_REDIRECT_ROOT:
+        return None
+    root = Path(MEDIA_ACCEL_REDIRECT_ROOT).resolve()
+    try:
+        relative = path.resolve().relative_to(root)
+    except ValueError:
+        return None
+    return f"{MEDIA_ACCEL_REDIRECT_PREFIX}/{quote(relative.as_posix())}"
+
+
+def build_media_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    as_attachment: bool = False,
+) -> Response:
+    """Return a Range/conditional-aware response for a media file on disk."""
+    file_stat = path.stat()
+    if not stat_module.S_ISREG(file_stat.st_mode):
+        raise FileNotFoundError(str(path))
+
+    size = file_stat.st_size
+    etag = _etag(file_stat)
+    headers: Dict[str, str] = {
+        "accept-ranges": "bytes",
+        "etag": etag,
+        "last-modified": formatdate(file_stat.st_mtime, usegmt=True),
+        "cache-control": MEDIA_CACHE_CONTROL,
+    }
+    disposition = _content_disposition(filename, as_attachment)
+    if disposition:
+        headers["content-disposition"] = disposition
+
+    if _not_modified(request, etag, file_stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    accel_path = _accel_redirect_path(path)
+    if accel_path is not None:
+        # nginx serves the bytes (including ranges) from its internal location.
+        headers["x-accel-redirect"] = accel_path
+        return Response(status_code=200, headers=headers, media_type=media_type)
+
+    send_body = request.method != "HEAD"
+    range_header = request.headers.get("range")
+    if range_header and _if_range_matches(request, etag, file_stat.st_mtime):
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**headers, "content-range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(length)
+            return MediaFileResponse(
+                path,
+                status_code=206,
+                headers=headers,
+                media_type=media_type,
+                offset=start,
+                length=length,
+                send_body=send_body,
+            )
+
+    headers["content-length"] = str(size)
+    return MediaFileResponse(
+        path,
+        status_code=200,
+        headers=headers,
+        media_type=media_type,
+        offset=0,
+        length=size,
+        send_body=send_body,
+    )
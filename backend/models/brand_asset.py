@@ -0,0 +1,80 @@
+"""MongoDB model helpers for the branded intro/outro library."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, constr
+
+BRAND_ASSETS_COLLECTION = "brand_assets"
+
+BrandAssetKind = Literal["intro", "outro"]
+
+
+def _now_utc() -> datetime:
+    return datetime.utcnow()
+
+
+@dataclass
+class BrandAssetModel:
+    asset_id: str
+    name: str
+    kind: BrandAssetKind
+    source_path: str
+    duration: float
+    has_audio: bool = False
+    # Folder holding one pre-encoded rendition per output profile.
+    renditions_dir: str = ""
+    # Used by every video that does not pick an asset of this kind.
+    is_default: bool = False
+    created_at: datetime = field(default_factory=_now_utc)
+
+    def to_bson(self) -> Dict[str, Any]:
+        return {
+            "asset_id": self.asset_id,
+            "name": self.name,
+            "kind": self.kind,
+            "source_path": self.source_path,
+            "duration": self.duration,
+            "has_audio": self.has_audio,
+            "renditions_dir": self.renditions_dir,
+            "is_default": self.is_default,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_bson(cls, doc: Dict[str, Any]) -> "BrandAssetModel":
+        return cls(
+            asset_id=doc.get("asset_id", ""),
+            name=doc.get("name", ""),
+            kind=doc.get("kind", "intro"),
+            source_path=doc.get("source_path", ""),
+            duration=doc.get("duration", 0.0),
+            has_audio=doc.get("has_audio", False),
+            renditions_dir=doc.get("renditions_dir", ""),
+            is_default=doc.get("is_default", False),
+            created_at=doc.get("created_at", _now_utc()),
+        )
+
+
+class BrandAssetSchema(BaseModel):
+    asset_id: str
+    name: str
+    kind: BrandAssetKind
+    source_path: str
+    duration: float
+    has_audio: bool = False
+    renditions_dir: str = ""
+    is_default: bool = False
+    # Profile keys that already have a pre-encoded rendition.
+    renditions: List[str] = Field(default_factory=list)
+    created_at: Optional[datetime] = None
+
+
+class BrandAssetCreate(BaseModel):
+    name: constr(strip_whitespace=True, min_length=1)
+    kind: BrandAssetKind
+    file_location: constr(strip_whitespace=True, min_length=1)
+    is_default: bool = False
@@ -0,0 +1,89 @@
+"""MongoDB model helpers for dead-lettered ARQ jobs."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+DEAD_LETTER_COLLECTION = "dead_letter_jobs"
+
+DeadLetterStatus = Literal["pending", "replayed"]
+
+
+def _now_utc() -> datetime:
+    return datetime.utcnow()
+
+
+@dataclass
+class DeadLetterModel:
+    dead_letter_id: str
+    function_name: str
+    queue_name: str
+    args: List[Any] = field(default_factory=list)
+    error_class: str = "unknown"
+    error_type: Optional[str] = None
+    error_reason: Optional[str] = None
+    job_try: int = 1
+    arq_job_id: Optional[str] = None
+    status: DeadLetterStatus = "pending"
+    replay_count: int = 0
+    replay_job_id: Optional[str] = None
+    created_at: datetime = field(default_factory=_now_utc)
+    replayed_at: Optional[datetime] = None
+
+    def to_bson(self) -> Dict[str, Any]:
+        return {
+            "dead_letter_id": self.dead_letter_id,
+            "function_name": self.function_name,
+            "queue_name": self.queue_name,
+            "args": list(self.args),
+            "error_class": self.error_class,
+            "error_type": self.error_type,
+            "error_reason": self.error_reason,
+            "job_try": self.job_try,
+            "arq_job_id": self.arq_job_id,
+            "status": self.status,
+            "replay_count": self.replay_count,
+            "replay_job_id": self.replay_job_id,
+            "created_at": self.created_at,
+            "replayed_at": self.replayed_at,
+        }
+
+    @classmethod
+    def from_bson(cls, doc: Dict[str, Any]) -> "DeadLetterModel":
+        return cls(
+            dead_letter_id=doc.get("dead_letter_id", ""),
+            function_name=doc.get("function_name", ""),
+            queue_name=doc.get("queue_name", ""),
+            args=doc.get("args", []) or [],
+            error_class=doc.get("error_class", "unknown"),
+            error_type=doc.get("error_type"),
+            error_reason=doc.get("error_reason"),
+            job_try=doc.get("job_try", 1),
+            arq_job_id=doc.get("arq_job_id"),
+            status=doc.get("status", "pending"),
+            replay_count=doc.get("replay_count", 0),
+            replay_job_id=doc.get("replay_job_id"),
+            created_at=doc.get("created_at", _now_utc()),
+            replayed_at=doc.get("replayed_at"),
+        )
+
+
+class DeadLetterSchema(BaseModel):
+    dead_letter_id: str
+    function_name: str
+    queue_name: str
+    args: List[Any] = Field(default_factory=list)
+    error_class: str = "unknown"
+    error_type: Optional[str] = None
+    error_reason: Optional[str] = None
+    job_try: int = 1
+    arq_job_id: Optional[str] = None
+    status: DeadLetterStatus = "pending"
+    replay_count: int = 0
+    replay_job_id: Optional[str] = None
+    created_at: datetime = Field(default_factory=_now_utc)
+    replayed_at: Optional[datetime] = None
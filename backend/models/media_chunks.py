@@ -0,0 +1,76 @@
+"""MongoDB model helpers for pre-chunked long sources."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+MEDIA_CHUNKS_COLLECTION = "media_chunks"
+
+
+def _now_utc() -> datetime:
+    return datetime.utcnow()
+
+
+@dataclass
+class MediaChunksModel:
+    # Same key as the loudness cache; a new upload at the same path misses.
+    asset_key: str
+    path: str
+    size: int
+    mtime_ns: int
+    duration: float
+    chunk_seconds: float
+    # ffconcat file listing every chunk; the chunks live next to it.
+    index_path: str
+    # One entry per chunk: file (relative to index_path), start and end seconds.
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    created_at: datetime = field(default_factory=_now_utc)
+
+    def to_bson(self) -> Dict[str, Any]:
+        return {
+            "asset_key": self.asset_key,
+            "path": self.path,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "duration": self.duration,
+            "chunk_seconds": self.chunk_seconds,
+            "index_path": self.index_path,
+            "chunks": list(self.chunks),
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_bson(cls, doc: Dict[str, Any]) -> "MediaChunksModel":
+        return cls(
+            asset_key=doc.get("asset_key", ""),
+            path=doc.get("path", ""),
+            size=doc.get("size", 0),
+            mtime_ns=doc.get("mtime_ns", 0),
+            duration=doc.get("duration", 0.0),
+            chunk_seconds=doc.get("chunk_seconds", 0.0),
+            index_path=doc.get("index_path", ""),
+            chunks=doc.get("chunks", []) or [],
+            created_at=doc.get("created_at", _now_utc()),
+        )
+
+
+class MediaChunkSchema(BaseModel):
+    file: str
+    start: float
+    end: float
+
+
+class MediaChunksSchema(BaseModel):
+    asset_key: str
+    path: str
+    size: int
+    mtime_ns: int
+    duration: float
+    chunk_seconds: float
+    index_path: str
+    chunks: List[MediaChunkSchema] = Field(default_factory=list)
+    created_at: Optional[datetime] = None
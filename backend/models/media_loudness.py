@@ -0,0 +1,76 @@
+"""MongoDB model helpers for cached loudness measurements."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+MEDIA_LOUDNESS_COLLECTION = "media_loudness"
+
+
+def _now_utc() -> datetime:
+    return datetime.utcnow()
+
+
+@dataclass
+class MediaLoudnessModel:
+    # sha1 of (absolute path, mtime_ns, size); changes when the file does.
+    asset_key: str
+    path: str
+    size: int
+    mtime_ns: int
+    source_kind: str = "media"
+    has_audio: bool = True
+    integrated_lufs: Optional[float] = None
+    true_peak_dbtp: Optional[float] = None
+    lra: Optional[float] = None
+    threshold_lufs: Optional[float] = None
+    measured_at: datetime = field(default_factory=_now_utc)
+
+    def to_bson(self) -> Dict[str, Any]:
+        return {
+            "asset_key": self.asset_key,
+            "path": self.path,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "source_kind": self.source_kind,
+            "has_audio": self.has_audio,
+            "integrated_lufs": self.integrated_lufs,
+            "true_peak_dbtp": self.true_peak_dbtp,
+            "lra": self.lra,
+            "threshold_lufs": self.threshold_lufs,
+            "measured_at": self.measured_at,
+        }
+
+    @classmethod
+    def from_bson(cls, doc: Dict[str, Any]) -> "MediaLoudnessModel":
+        return cls(
+            asset_key=doc.get("asset_key", ""),
+            path=doc.get("path", ""),
+            size=doc.get("size", 0),
+            mtime_ns=doc.get("mtime_ns", 0),
+            source_kind=doc.get("source_kind", "media"),
+            has_audio=doc.get("has_audio", True),
+            integrated_lufs=doc.get("integrated_lufs"),
+            true_peak_dbtp=doc.get("true_peak_dbtp"),
+            lra=doc.get("lra"),
+            threshold_lufs=doc.get("threshold_lufs"),
+            measured_at=doc.get("measured_at", _now_utc()),
+        )
+
+
+class MediaLoudnessSchema(BaseModel):
+    asset_key: str
+    path: str
+    size: int
+    mtime_ns: int
+    source_kind: str = "media"
+    has_audio: bool = True
+    integrated_lufs: Optional[float] = None
+    true_peak_dbtp: Optional[float] = None
+    lra: Optional[float] = None
+    threshold_lufs: Optional[float] = None
+    measured_at: datetime = Field(default_factory=_now_utc)
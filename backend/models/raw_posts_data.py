@@ -30,6 +30,10 @@ class RawPostsDataModel:
     updated_on: str = field(default_factory=_now_str)
     quote_created_on: Optional[str] = None
     posted_on: Optional[str] = None
+    process_attempts: int = 0
+    processing_heartbeat_at: Optional[datetime] = None
+    process_error: Optional[str] = None
+    process_abandoned: bool = False
 
     def to_bson(self) -> Dict[str, Any]:
         return {
@@ -45,6 +49,10 @@ class RawPostsDataModel:
             "updated_on": self.updated_on,
             "quote_created_on": self.quote_created_on,
             "posted_on": self.posted_on,
+            "process_attempts": self.process_attempts,
+            "processing_heartbeat_at": self.processing_heartbeat_at,
+            "process_error": self.process_error,
+            "process_abandoned": self.process_abandoned,
         }
 
     @classmethod
@@ -62,6 +70,10 @@ class RawPostsDataModel:
             updated_on=doc.get("updated_on", _now_str()),
             quote_created_on=doc.get("quote_created_on"),
             posted_on=doc.get("posted_on"),
+            process_attempts=doc.get("process_attempts", 0) or 0,
+            processing_heartbeat_at=doc.get("processing_heartbeat_at"),
+            process_error=doc.get("process_error"),
+            process_abandoned=doc.get("process_abandoned", False) or False,
         )
 
 
@@ -78,6 +90,10 @@ class RawPostsDataSchema(BaseModel):
     updated_on: str
     quote_created_on: Optional[str] = None
     posted_on: Optional[str] = None
+    process_attempts: int = 0
+    processing_heartbeat_at: Optional[datetime] = None
+    process_error: Optional[str] = None
+    process_abandoned: bool = False
 
 
 class RawPostsDataResponse(BaseModel):
@@ -94,6 +110,10 @@ class RawPostsDataResponse(BaseModel):
     updated_on: str
     quote_created_on: Optional[str] = None
     posted_on: Optional[str] = None
+    process_attempts: int = 0
+    processing_heartbeat_at: Optional[datetime] = None
+    process_error: Optional[str] = None
+    process_abandoned: bool = False
 
     class Config:
         allow_population_by_field_name = True
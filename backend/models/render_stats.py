@@ -0,0 +1,112 @@
+"""MongoDB model helpers for per-render cost statistics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+RENDER_STATS_COLLECTION = "render_stats"
+
+
+def _now_utc() -> datetime:
+    return datetime.utcnow()
+
+
+@dataclass
+class RenderStatsModel:
+    video_id: str
+    engine: str
+    mode: Optional[str] = None
+    video_type: str = "clips"
+    # Worker host, so throughput can be modelled per machine.
+    host: Optional[str] = None
+    # Trimmed source seconds read and number of parts.
+    input_seconds: Optional[float] = None
+    part_count: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    preset: Optional[str] = None
+    # One entry per segment: method, duration (seconds) and cpu_seconds.
+    segments: List[Dict[str, Any]] = field(default_factory=list)
+    cpu_seconds: Optional[float] = None
+    wall_seconds: Optional[float] = None
+    duration_seconds: Optional[float] = None
+    size_bytes: Optional[int] = None
+    # Output seconds per wall second (x realtime).
+    encode_speed: Optional[float] = None
+    # Peak RSS / CPU / wall time of the worker job, overall and per stage.
+    resource_usage: Dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=_now_utc)
+
+    def to_bson(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "engine": self.engine,
+            "mode": self.mode,
+            "video_type": self.video_type,
+            "host": self.host,
+            "input_seconds": self.input_seconds,
+            "part_count": self.part_count,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "preset": self.preset,
+            "segments": list(self.segments),
+            "cpu_seconds": self.cpu_seconds,
+            "wall_seconds": self.wall_seconds,
+            "duration_seconds": self.duration_seconds,
+            "size_bytes": self.size_bytes,
+            "encode_speed": self.encode_speed,
+            "resource_usage": dict(self.resource_usage),
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_bson(cls, doc: Dict[str, Any]) -> "RenderStatsModel":
+        return cls(
+            video_id=doc.get("video_id", ""),
+            engine=doc.get("engine", "ffmpeg"),
+            mode=doc.get("mode"),
+            video_type=doc.get("video_type", "clips"),
+            host=doc.get("host"),
+            input_seconds=doc.get("input_seconds"),
+            part_count=doc.get("part_count"),
+            width=doc.get("width"),
+            height=doc.get("height"),
+            fps=doc.get("fps"),
+            preset=doc.get("preset"),
+            segments=doc.get("segments", []) or [],
+            cpu_seconds=doc.get("cpu_seconds"),
+            wall_seconds=doc.get("wall_seconds"),
+            duration_seconds=doc.get("duration_seconds"),
+            size_bytes=doc.get("size_bytes"),
+            encode_speed=doc.get("encode_speed"),
+            resource_usage=doc.get("resource_usage", {}) or {},
+            created_at=doc.get("created_at", _now_utc()),
+        )
+
+    @classmethod
+    def from_render_info(
+        cls, video_id: str, video_type: str, info: Dict[str, Any]
+    ) -> "RenderStatsModel":
+        duration, wall = info.get("duration_seconds"), info.get("wall_seconds")
+        return cls(
+            video_id=video_id,
+            engine=info.get("engine", "moviepy"),
+            mode=info.get("mode"),
+            video_type=video_type,
+            input_seconds=info.get("input_seconds"),
+            part_count=info.get("part_count"),
+            width=info.get("width"),
+            height=info.get("height"),
+            fps=info.get("fps"),
+            preset=info.get("preset"),
+            segments=info.get("segments") or [],
+            cpu_seconds=info.get("cpu_seconds"),
+            wall_seconds=info.get("wall_seconds"),
+            duration_seconds=info.get("duration_seconds"),
+            size_bytes=info.get("size_bytes"),
+            encode_speed=round(duration / wall, 3) if duration and wall else None,
+        )
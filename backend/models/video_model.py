@@ -4,13 +4,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, constr
 
 VIDEO_COLLECTION = "videos"
 
 
+class CaptionSchema(BaseModel):
+    # Times are on the output timeline, in seconds.
+    text: constr(strip_whitespace=True, min_length=1)
+    start: float = Field(ge=0)
+    end: float = Field(gt=0)
+    position: Literal["top", "center", "bottom"] = "bottom"
+
+
 @dataclass
 class VideoModel:
     video_id: str
@@ -25,11 +33,46 @@ class VideoModel:
     modification_time: datetime = field(default_factory=datetime.utcnow)
     active: bool = True
     video_tags: List[str] = field(default_factory=list)
+    # "clips" renders the video parts; "quote_slideshow" renders the quote
+    # images of ``quote_code``.
+    video_type: str = "clips"
+    quote_code: Optional[str] = None
+    slide_seconds: Optional[float] = None
+    slide_transition: Optional[str] = None
+    overlay_template: Optional[str] = None
+    captions: List[Dict[str, Any]] = field(default_factory=list)
+    voice_clone_job_id: Optional[str] = None
+    music_file_location: Optional[str] = None
+    music_volume: Optional[float] = None
+    duck_music: bool = True
+    # Branded clips from the brand_assets library; None uses the default
+    # asset of that kind and "none" skips it.
+    intro_asset_id: Optional[str] = None
+    outro_asset_id: Optional[str] = None
 
     status: str = "created"
     output_file_location: Optional[str] = None
+    hls_playlist_location: Optional[str] = None
+    cover_file_location: Optional[str] = None
+    preview_file_location: Optional[str] = None
+    output_duration_seconds: Optional[float] = None
+    output_size_bytes: Optional[int] = None
+    output_bit_rate: Optional[int] = None
+    # Set by POST /videos/{video_id}/plan.
+    estimated_cpu_seconds: Optional[float] = None
+    estimated_size_bytes: Optional[int] = None
+    # Set by POST /videos/{video_id}/enqueue; see objects/render_eta.py.
+    eta_render_seconds: Optional[float] = None
+    eta_ready_at: Optional[datetime] = None
+    render_started_at: Optional[datetime] = None
+    # Peak RSS / CPU / wall time of the last render, overall and per stage.
+    resource_usage: Optional[Dict[str, Any]] = None
+    # Segments of the last segmented render; see render_engine.segment_key.
+    render_manifest: Optional[Dict[str, Any]] = None
     job_id: Optional[str] = None
     error_reason: Optional[str] = None
+    attempts: int = 0
+    heartbeat_at: Optional[datetime] = None
 
     def to_bson(self) -> Dict[str, Any]:
         return {
@@ -41,10 +84,37 @@ class VideoModel:
             "modification_time": self.modification_time,
             "active": self.active,
             "video_tags": list(self.video_tags),
+            "video_type": self.video_type,
+            "quote_code": self.quote_code,
+            "slide_seconds": self.slide_seconds,
+            "slide_transition": self.slide_transition,
+            "overlay_template": self.overlay_template,
+            "captions": list(self.captions),
+            "voice_clone_job_id": self.voice_clone_job_id,
+            "music_file_location": self.music_file_location,
+            "music_volume": self.music_volume,
+            "duck_music": self.duck_music,
+            "intro_asset_id": self.intro_asset_id,
+            "outro_asset_id": self.outro_asset_id,
             "status": self.status,
             "output_file_location": self.output_file_location,
+            "hls_playlist_location": self.hls_playlist_location,
+            "cover_file_location": self.cover_file_location,
+            "preview_file_location": self.preview_file_location,
+            "output_duration_seconds": self.output_duration_seconds,
+            "output_size_bytes": self.output_size_bytes,
+            "output_bit_rate": self.output_bit_rate,
+            "estimated_cpu_seconds": self.estimated_cpu_seconds,
+            "estimated_size_bytes": self.estimated_size_bytes,
+            "eta_render_seconds": self.eta_render_seconds,
+            "eta_ready_at": self.eta_ready_at,
+            "render_started_at": self.render_started_at,
+            "resource_usage": self.resource_usage,
+            "render_manifest": self.render_manifest,
             "job_id": self.job_id,
             "error_reason": self.error_reason,
+            "attempts": self.attempts,
+            "heartbeat_at": self.heartbeat_at,
         }
 
     @classmethod
@@ -58,10 +128,37 @@ class VideoModel:
             modification_time=doc.get("modification_time", datetime.utcnow()),
             active=doc.get("active", True),
             video_tags=doc.get("video_tags", []) or [],
+            video_type=doc.get("video_type", "clips") or "clips",
+            quote_code=doc.get("quote_code"),
+            slide_seconds=doc.get("slide_seconds"),
+            slide_transition=doc.get("slide_transition"),
+            overlay_template=doc.get("overlay_template"),
+            captions=doc.get("captions", []) or [],
+            voice_clone_job_id=doc.get("voice_clone_job_id"),
+            music_file_location=doc.get("music_file_location"),
+            music_volume=doc.get("music_volume"),
+            duck_music=doc.get("duck_music", True),
+            intro_asset_id=doc.get("intro_asset_id"),
+            outro_asset_id=doc.get("outro_asset_id"),
             status=doc.get("status", "created"),
             output_file_location=doc.get("output_file_location"),
+            hls_playlist_location=doc.get("hls_playlist_location"),
+            cover_file_location=doc.get("cover_file_location"),
+            preview_file_location=doc.get("preview_file_location"),
+            output_duration_seconds=doc.get("output_duration_seconds"),
+            output_size_bytes=doc.get("output_size_bytes"),
+            output_bit_rate=doc.get("output_bit_rate"),
+            estimated_cpu_seconds=doc.get("estimated_cpu_seconds"),
+            estimated_size_bytes=doc.get("estimated_size_bytes"),
+            eta_render_seconds=doc.get("eta_render_seconds"),
+            eta_ready_at=doc.get("eta_ready_at"),
+            render_started_at=doc.get("render_started_at"),
+            resource_usage=doc.get("resource_usage"),
+            render_manifest=doc.get("render_manifest"),
             job_id=doc.get("job_id"),
             error_reason=doc.get("error_reason"),
+            attempts=doc.get("attempts", 0) or 0,
+            heartbeat_at=doc.get("heartbeat_at"),
         )
 
 
@@ -74,10 +171,36 @@ class VideoSchema(BaseModel):
     modification_time: datetime = Field(default_factory=datetime.utcnow)
     active: bool = True
     video_tags: List[str] = Field(default_factory=list)
+    video_type: str = "clips"
+    quote_code: Optional[str] = None
+    slide_seconds: Optional[float] = None
+    slide_transition: Optional[str] = None
+    overlay_template: Optional[str] = None
+    captions: List[CaptionSchema] = Field(default_factory=list)
+    voice_clone_job_id: Optional[str] = None
+    music_file_location: Optional[str] = None
+    music_volume: Optional[float] = None
+    duck_music: bool = True
+    intro_asset_id: Optional[str] = None
+    outro_asset_id: Optional[str] = None
     status: str = "created"
     output_file_location: Optional[str] = None
+    hls_playlist_location: Optional[str] = None
+    cover_file_location: Optional[str] = None
+    preview_file_location: Optional[str] = None
+    output_duration_seconds: Optional[float] = None
+    output_size_bytes: Optional[int] = None
+    output_bit_rate: Optional[int] = None
+    estimated_cpu_seconds: Optional[float] = None
+    estimated_size_bytes: Optional[int] = None
+    eta_render_seconds: Optional[float] = None
+    eta_ready_at: Optional[datetime] = None
+    render_started_at: Optional[datetime] = None
+    resource_usage: Optional[Dict[str, Any]] = None
     job_id: Optional[str] = None
     error_reason: Optional[str] = None
+    attempts: int = 0
+    heartbeat_at: Optional[datetime] = None
 
 
 class VideoCreate(BaseModel):
@@ -86,6 +209,19 @@ class VideoCreate(BaseModel):
     video_introduction: Optional[str] = None
     active: Optional[bool] = None
     video_tags: Optional[List[str]] = None
+    video_type: Literal["clips", "quote_slideshow"] = "clips"
+    quote_code: Optional[constr(strip_whitespace=True, min_length=1)] = None
+    slide_seconds: Optional[float] = Field(default=None, ge=1, le=30)
+    slide_transition: Optional[str] = None
+    overlay_template: Optional[str] = None
+    captions: Optional[List[CaptionSchema]] = None
+    voice_clone_job_id: Optional[str] = None
+    music_file_location: Optional[str] = None
+    music_volume: Optional[float] = Field(default=None, ge=0, le=4)
+    duck_music: Optional[bool] = None
+    # Brand asset ids; "none" skips the default intro/outro.
+    intro_asset_id: Optional[str] = None
+    outro_asset_id: Optional[str] = None
 
 
 class VideoUpdate(BaseModel):
@@ -95,3 +231,15 @@ class VideoUpdate(BaseModel):
     video_introduction: Optional[str] = None
     active: Optional[bool] = None
     video_tags: Optional[List[str]] = None
+    quote_code: Optional[constr(strip_whitespace=True, min_length=1)] = None
+    slide_seconds: Optional[float] = Field(default=None, ge=1, le=30)
+    slide_transition: Optional[str] = None
+    overlay_template: Optional[str] = None
+    captions: Optional[List[CaptionSchema]] = None
+    voice_clone_job_id: Optional[str] = None
+    music_file_location: Optional[str] = None
+    music_volume: Optional[float] = Field(default=None, ge=0, le=4)
+    duck_music: Optional[bool] = None
+    # Brand asset ids; "none" skips the default intro/outro.
+    intro_asset_id: Optional[str] = None
+    outro_asset_id: Optional[str] = None
@@ -21,6 +21,8 @@ from pydantic import BaseModel, Field, StringConstraints, constr
 # modification_time
 # active (BOOLEAN)
 # creation_time
+# transition / transition_duration (how this part hands over to the next one)
+# keep_audio (keep the clip's own sound instead of muting it)
 
 VIDEO_PARTS_COLLECTION = "video_parts"
 
@@ -38,6 +40,9 @@ class VideoPartModel:
     video_size: Optional[str] = None
     total_duration: Optional[float] = None
     selected_duration: Optional[float] = None
+    transition: Optional[str] = None
+    transition_duration: Optional[float] = None
+    keep_audio: Optional[bool] = None
     modification_time: datetime = field(default_factory=datetime.utcnow)
     active: bool = True
     creation_time: datetime = field(default_factory=datetime.utcnow)
@@ -55,6 +60,9 @@ class VideoPartModel:
             "video_size": self.video_size,
             "total_duration": self.total_duration,
             "selected_duration": self.selected_duration,
+            "transition": self.transition,
+            "transition_duration": self.transition_duration,
+            "keep_audio": self.keep_audio,
             "modification_time": self.modification_time,
             "active": self.active,
             "creation_time": self.creation_time,
@@ -74,6 +82,9 @@ class VideoPartModel:
             video_size=doc.get("video_size"),
             total_duration=doc.get("total_duration"),
             selected_duration=doc.get("selected_duration"),
+            transition=doc.get("transition"),
+            transition_duration=doc.get("transition_duration"),
+            keep_audio=doc.get("keep_audio"),
             modification_time=doc.get("modification_time", datetime.utcnow()),
             active=doc.get("active", True),
             creation_time=doc.get("creation_time", datetime.utcnow()),
@@ -92,6 +103,9 @@ class VideoPartSchema(BaseModel):
     video_size: Optional[str] = None
     total_duration: Optional[float] = None
     selected_duration: Optional[float] = None
+    transition: Optional[str] = None
+    transition_duration: Optional[float] = None
+    keep_audio: Optional[bool] = None
     modification_time: datetime = Field(default_factory=datetime.utcnow)
     active: bool = True
     creation_time: datetime = Field(default_factory=datetime.utcnow)
@@ -114,6 +128,9 @@ class VideoPartCreate(BaseModel):
     video_size: Optional[str] = None
     total_duration: Optional[float] = None
     selected_duration: Optional[float] = None
+    transition: Optional[str] = None
+    transition_duration: Optional[float] = Field(default=None, ge=0)
+    keep_audio: Optional[bool] = None
     active: Optional[bool] = None
 
 
@@ -140,4 +157,7 @@ class VideoPartUpdate(BaseModel):
     video_size: Optional[str] = None
     total_duration: Optional[float] = None
     selected_duration: Optional[float] = None
+    transition: Optional[str] = None
+    transition_duration: Optional[float] = Field(default=None, ge=0)
+    keep_audio: Optional[bool] = None
     active: Optional[bool] = None
@@ -30,6 +30,9 @@ class VoiceCloneJobModel:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     updated_at: datetime = field(default_factory=_now_utc)
+    attempts: int = 0
+    heartbeat_at: Optional[datetime] = None
+    arq_job_id: Optional[str] = None
 
     def to_bson(self) -> Dict[str, Any]:
         return {
@@ -44,6 +47,9 @@ class VoiceCloneJobModel:
             "started_at": self.started_at,
             "completed_at": self.completed_at,
             "updated_at": self.updated_at,
+            "attempts": self.attempts,
+            "heartbeat_at": self.heartbeat_at,
+            "arq_job_id": self.arq_job_id,
         }
 
     @classmethod
@@ -60,6 +66,9 @@ class VoiceCloneJobModel:
             started_at=doc.get("started_at"),
             completed_at=doc.get("completed_at"),
             updated_at=doc.get("updated_at", _now_utc()),
+            attempts=doc.get("attempts", 0) or 0,
+            heartbeat_at=doc.get("heartbeat_at"),
+            arq_job_id=doc.get("arq_job_id"),
         )
 
 
@@ -75,6 +84,9 @@ class VoiceCloneJobSchema(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     updated_at: datetime = Field(default_factory=_now_utc)
+    attempts: int = 0
+    heartbeat_at: Optional[datetime] = None
+    arq_job_id: Optional[str] = None
 
 
 class VoiceCloneJobCreate(BaseModel):
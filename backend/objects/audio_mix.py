@@ -0,0 +1,196 @@
+"""Audio graph for the ffmpeg render engine.
+
+Each part either keeps its own audio or contributes silence of the same
+length, so the audio timeline always lines up with the video timeline. Cuts
+get a short ``afade`` on both sides to avoid clicks. ``fade_out``
+transitions fade the audio along with the picture, and overlapping
+transitions use ``acrossfade``. A voice-clone narration and/or a looped
+music bed can then be mixed on top. When both are present the music is
+ducked under the voice with ``sidechaincompress``. Every source can carry
+a loudness normalization gain, applied as a plain ``volume`` in dB.
+
+Besides ``transitions`` (for the crossfade curves) it only builds filter
+strings, so the API validates audio settings with it too.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+from .transitions import acrossfade_filter
+
+load_dotenv(find_dotenv())
+
+AUDIO_SAMPLE_RATE = int(os.getenv("VIDEO_AUDIO_SAMPLE_RATE", "48000"))
+AUDIO_BITRATE = os.getenv("VIDEO_AUDIO_BITRATE", "192k")
+KEEP_PART_AUDIO = os.getenv("VIDEO_KEEP_PART_AUDIO", "false").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Short fade applied at every hard cut so waveforms do not click.
+CUT_FADE_SECONDS = float(os.getenv("VIDEO_AUDIO_CUT_FADE_SECONDS", "0.03"))
+MUSIC_VOLUME = float(os.getenv("VIDEO_MUSIC_VOLUME", "0.35"))
+VOICE_VOLUME = float(os.getenv("VIDEO_VOICE_VOLUME", "1.0"))
+MUSIC_FADE_OUT_SECONDS = 1.5
+
+_FORMAT = (
+    f"aresample={AUDIO_SAMPLE_RATE},"
+    "aformat=sample_fmts=fltp:channel_layouts=stereo"
+)
+
+
+@dataclass
+class AudioSpec:
+    voice_path: Optional[str] = None
+    music_path: Optional[str] = None
+    music_volume: float = MUSIC_VOLUME
+    voice_volume: float = VOICE_VOLUME
+    duck: bool = True
+    # Loudness normalization gains measured by the worker (see loudness.py).
+    voice_gain_db: float = 0.0
+    music_gain_db: float = 0.0
+
+    @property
+    def mixes(self) -> bool:
+        return bool(self.voice_path or self.music_path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "voice_path": self.voice_path,
+            "music_path": self.music_path,
+            "music_volume": self.music_volume,
+            "voice_volume": self.voice_volume,
+            "duck": self.duck,
+            "voice_gain_db": self.voice_gain_db,
+            "music_gain_db": self.music_gain_db,
+        }
+
+
+def _float_or(value: Any, default: float) -> float:
+    return default if value is None else float(value)
+
+
+def audio_from_payload(payload: Dict[str, Any]) -> AudioSpec:
+    audio = payload.get("audio") or {}
+    return AudioSpec(
+        voice_path=audio.get("voice_path") or None,
+        music_path=audio.get("music_path") or None,
+        music_volume=_float_or(audio.get("music_volume"), MUSIC_VOLUME),
+        voice_volume=_float_or(audio.get("voice_volume"), VOICE_VOLUME),
+        duck=bool(audio.get("duck", True)),
+        voice_gain_db=_float_or(audio.get("voice_gain_db"), 0.0),
+        music_gain_db=_float_or(audio.get("music_gain_db"), 0.0),
+    )
+
+
+def audio_encoder_args() -> List[str]:
+    return ["-c:a", "aac", "-b:a", AUDIO_BITRATE, "-ar", str(AUDIO_SAMPLE_RATE)]
+
+
+def part_audio_filters(
+    duration: float,
+    has_audio: bool,
+    fade_in: float,
+    fade_out: float,
+    gain_db: float = 0.0,
+) -> str:
+    """Unlabelled filter chain that normalises one part's audio (or silence)."""
+    if has_audio:
+        # Pad/trim so a short audio stream cannot drift the later parts.
+        chain = f"{_FORMAT},asetpts=PTS-STARTPTS,apad,atrim=duration={duration:.3f}"
+        if gain_db:
+            chain += f",volume={gain_db:.2f}dB"
+    else:
+        chain = (
+            f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo,"
+            f"atrim=duration={duration:.3f},aformat=sample_fmts=fltp"
+        )
+    if fade_in > 0:
+        chain += f",afade=t=in:d={fade_in:.3f}"
+    if fade_out > 0:
+        chain += f",afade=t=out:st={max(0.0, duration - fade_out):.3f}:d={fade_out:.3f}"
+    return chain
+
+
+def part_audio_chain(
+    input_index: int,
+    duration: float,
+    has_audio: bool,
+    fade_in: float,
+    fade_out: float,
+    gain_db: float = 0.0,
+) -> str:
+    """Normalised audio (or silence) for one part, labelled ``a{input_index}``."""
+    chain = part_audio_filters(duration, has_audio, fade_in, fade_out, gain_db)
+    if has_audio:
+        chain = f"[{input_index}:a]" + chain
+    return chain + f"[a{input_index}]"
+
+
+def join_audio(
+    labels: List[str], overlaps: List[float]
+) -> Tuple[List[str], str]:
+    """Join part labels with ``acrossfade`` (overlap > 0) or ``concat``."""
+    filters: List[str] = []
+    current = labels[0]
+    for position, (label, overlap) in enumerate(zip(labels[1:], overlaps), start=1):
+        out = f"ax{position}"
+        if overlap > 0:
+            filters.append(f"[{current}][{label}]{acrossfade_filter(overlap)}[{out}]")
+        else:
+            filters.append(f"[{current}][{label}]concat=n=2:v=0:a=1[{out}]")
+        current = out
+    return filters, current
+
+
+def _volume(linear: float, gain_db: float) -> str:
+    volume = f"volume={linear:g}"
+    if gain_db:
+        volume += f",volume={gain_db:.2f}dB"
+    return volume
+
+
+def mix_filters(
+    base_label: str,
+    spec: AudioSpec,
+    voice_input: Optional[int],
+    music_input: Optional[int],
+    total_duration: float,
+) -> Tuple[List[str], str]:
+    """Mix narration and music onto ``base_label`` for ``total_duration`` seconds."""
+    filters: List[str] = []
+    inputs = [f"[{base_label}]"]
+    voice_label = None
+    if voice_input is not None:
+        filters.append(
+            f"[{voice_input}:a]{_FORMAT},{_volume(spec.voice_volume, spec.voice_gain_db)},"
+            f"apad,atrim=duration={total_duration:.3f}[voice]"
+        )
+        voice_label = "voice"
+    if music_input is not None:
+        fade_start = max(0.0, total_duration - MUSIC_FADE_OUT_SECONDS)
+        filters.append(
+            f"[{music_input}:a]{_FORMAT},{_volume(spec.music_volume, spec.music_gain_db)},"
+            f"atrim=duration={total_duration:.3f},"
+            f"afade=t=out:st={fade_start:.3f}:d={MUSIC_FADE_OUT_SECONDS:g}[music]"
+        )
+        music_label = "music"
+        if voice_label and spec.duck:
+            filters.append("[voice]asplit=2[voice_mix][voice_key]")
+            filters.append(
+                "[music][voice_key]sidechaincompress="
+                "threshold=0.03:ratio=8:attack=20:release=400[ducked]"
+            )
+            voice_label, music_label = "voice_mix", "ducked"
+        inputs.append(f"[{music_label}]")
+    if voice_label:
+        inputs.append(f"[{voice_label}]")
+    filters.append(
+        f"{''.join(inputs)}amix=inputs={len(inputs)}:duration=first:normalize=0[amix]"
+    )
+    return filters, "amix"
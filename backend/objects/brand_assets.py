@@ -0,0 +1,73 @@
+"""Branded intro/outro library.
+
+Assets are registered once from an uploaded clip. The render engine encodes
+each one per output profile the first time a reel with that profile uses it
+(see ``OutputProfile.rendition_key``); afterwards the rendition is only
+stream-copied by the final concat.
+
+Takes the database handle as an argument and only uses relative imports, so
+both the API and the workers can use it.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+BRAND_ASSETS_FOLDER = os.getenv("BRAND_ASSETS_LOCATION") or os.path.join(
+    os.getenv("OUTPUT_FILES_LOCATION") or "./outputs", "_brand_assets"
+)
+BRAND_ASSET_KINDS = ("intro", "outro")
+# A video's intro/outro field set to this skips the default asset.
+NO_BRAND_ASSET = "none"
+
+
+def renditions_dir_for(asset_id: str) -> str:
+    return os.path.abspath(os.path.join(BRAND_ASSETS_FOLDER, asset_id))
+
+
+def rendition_keys(renditions_dir: str) -> List[str]:
+    """Profile keys that already have a finished rendition."""
+    if not renditions_dir or not os.path.isdir(renditions_dir):
+        return []
+    return sorted(
+        name[: -len(".mp4")]
+        for name in os.listdir(renditions_dir)
+        if name.endswith(".mp4") and not name.endswith(".partial.mp4")
+    )
+
+
+def _resolve_asset(
+    db: Any, collection: str, kind: str, asset_id: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    if asset_id == NO_BRAND_ASSET:
+        return None
+    query = {"asset_id": asset_id} if asset_id else {"kind": kind, "is_default": True}
+    doc = db[collection].find_one(query, {"_id": 0})
+    if doc is None:
+        if asset_id:
+            raise ValueError(f"Brand {kind} not found: {asset_id}")
+        return None
+    if not os.path.isfile(doc.get("source_path") or ""):
+        raise ValueError(f"Brand {kind} source is missing: {doc.get('source_path')}")
+    return doc
+
+
+def brand_section(db: Any, collection: str, video: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload ``brand`` section with the intro/outro ``video`` should get."""
+    section: Dict[str, Any] = {}
+    for kind in BRAND_ASSET_KINDS:
+        doc = _resolve_asset(db, collection, kind, video.get(f"{kind}_asset_id"))
+        if doc is not None:
+            section[kind] = {
+                "asset_id": doc["asset_id"],
+                "source_path": doc["source_path"],
+                "duration": doc["duration"],
+                "has_audio": doc.get("has_audio", False),
+                "renditions_dir": doc["renditions_dir"],
+            }
+    return section
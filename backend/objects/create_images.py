@@ -9,6 +9,7 @@ from typing import List, Tuple
 from PIL import Image, ImageDraw, ImageFont
 
 from .custom_logger import get_logger
+from .overlays import TAGLINE_TEXT
 
 try:
     RESAMPLE = Image.Resampling.LANCZOS
@@ -33,7 +34,6 @@ QUOTE_BACKGROUND_COLOR = "black"
 QUOTE_TEXT_COLOR = "white"
 QUOTE_TEXT_MARGIN = 80
 QUOTE_FONT_MAX = 64
-TAGLINE_TEXT = "@motivation_nitrous"
 TAGLINE_FONT_MAX = 32
 TAGLINE_SECTION_HEIGHT = 140
 
@@ -111,7 +111,7 @@ class BaseImageCreator:
         field_start_y = TEXT_MARGIN
         _draw_text_block(draw, field_lines, field_font, start_y=field_start_y, align="left")
 
-        bottom_block_height = _text_block_height(bottom_font, len(bottom_lines))
+        bottom_block_height = text_block_height(bottom_font, len(bottom_lines))
         bottom_start_y = TARGET_HEIGHT - TEXT_MARGIN - bottom_block_height
         _draw_text_block(draw, bottom_lines, bottom_font, start_y=bottom_start_y, align="center")
 
@@ -180,7 +180,7 @@ def _create_quote_image(code: str, name: str, quote_text: str, output_folder: Pa
         TAGLINE_FONT_MAX,
     )
 
-    name_height_total = _text_block_height(name_font, len(name_lines))
+    name_height_total = text_block_height(name_font, len(name_lines))
     name_start_y = QUOTE_TEXT_MARGIN
     _draw_text_block(
         draw,
@@ -203,7 +203,7 @@ def _create_quote_image(code: str, name: str, quote_text: str, output_folder: Pa
         QUOTE_FONT_MAX,
     )
 
-    quote_block_height = _text_block_height(quote_font, len(quote_lines))
+    quote_block_height = text_block_height(quote_font, len(quote_lines))
     quote_start_y = quote_top + max((quote_area_height - quote_block_height) // 2, 0)
     _draw_text_block(
         draw,
@@ -222,7 +222,7 @@ def _create_quote_image(code: str, name: str, quote_text: str, output_folder: Pa
         TAGLINE_SECTION_HEIGHT,
         TAGLINE_FONT_MAX,
     )
-    tagline_block_height = _text_block_height(tagline_font, len(tagline_lines))
+    tagline_block_height = text_block_height(tagline_font, len(tagline_lines))
     tagline_start_y = TARGET_HEIGHT - QUOTE_TEXT_MARGIN - tagline_block_height
     _draw_text_block(
         draw,
@@ -240,14 +240,14 @@ def _create_quote_image(code: str, name: str, quote_text: str, output_folder: Pa
     return output_path
 
 
-def _load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+def load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     try:
         return ImageFont.truetype(DEFAULT_FONT_PATH, size)
     except OSError:
         return ImageFont.load_default()
 
 
-def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int) -> list[str]:
+def wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: int) -> list[str]:
     paragraphs = text.splitlines() or [text]
     lines: list[str] = []
 
@@ -286,18 +286,18 @@ def _fit_text(
     font_size = initial_size
 
     while font_size >= min_size:
-        font = _load_font(font_size)
-        wrapped = _wrap_text(draw, sanitized_text, font, max_width)
-        block_height = _text_block_height(font, len(wrapped))
+        font = load_font(font_size)
+        wrapped = wrap_text(draw, sanitized_text, font, max_width)
+        block_height = text_block_height(font, len(wrapped))
         if block_height <= max_height:
             return wrapped, font
         font_size -= 2
 
-    fallback_font = _load_font(min_size)
-    return _wrap_text(draw, sanitized_text, fallback_font, max_width), fallback_font
+    fallback_font = load_font(min_size)
+    return wrap_text(draw, sanitized_text, fallback_font, max_width), fallback_font
 
 
-def _text_block_height(font: ImageFont.ImageFont, line_count: int) -> int:
+def text_block_height(font: ImageFont.ImageFont, line_count: int) -> int:
     ascent, descent = font.getmetrics()
     line_height = ascent + descent + 6
     return line_count * line_height
@@ -312,7 +312,7 @@ def _draw_text_block(
     fill_color: str | None = None,
     background: bool = True,
 ) -> None:
-    line_height = _text_block_height(font, 1)
+    line_height = text_block_height(font, 1)
     for line in lines:
         line_width = draw.textlength(line, font=font)
         if align == "left":
@@ -0,0 +1,106 @@
+"""EBU R128 loudness measurement and linear normalization gains.
+
+Measuring needs a full decode of the audio (ffmpeg ``loudnorm`` in analysis
+mode), so results are cached per asset in Mongo by the workers. Renders then
+apply a plain ``volume`` gain computed from the cached integrated loudness
+and true peak. That is single-pass and linear, so normalized loudness costs
+nothing beyond the render itself.
+
+Only the measurement touches ffmpeg; the gain helpers are plain arithmetic
+over cached documents, which is all the API calls.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+from .media_probe import probe_media
+
+load_dotenv(find_dotenv())
+
+LOUDNESS_NORMALIZATION_ENABLED = os.getenv("VIDEO_LOUDNORM", "true").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TARGET_INTEGRATED_LUFS = float(os.getenv("VIDEO_LOUDNESS_TARGET_I", "-16"))
+TARGET_TRUE_PEAK_DBTP = float(os.getenv("VIDEO_LOUDNESS_TARGET_TP", "-1.5"))
+MAX_GAIN_DB = float(os.getenv("VIDEO_LOUDNESS_MAX_GAIN_DB", "20"))
+# Sources quieter than this are treated as silence and left alone.
+SILENCE_FLOOR_LUFS = -60.0
+
+_JSON_BLOCK = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.S)
+
+
+@dataclass(frozen=True)
+class LoudnessStats:
+    integrated_lufs: float
+    true_peak_dbtp: float
+    lra: float
+    threshold_lufs: float
+
+
+def measure_loudness(path: str, timeout: Optional[float] = None) -> Optional[LoudnessStats]:
+    """Run the loudnorm analysis pass; None when ``path`` has no audio."""
+    if not probe_media(path).has_audio:
+        return None
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", path,
+        "-map", "0:a:0", "-vn", "-sn", "-dn",
+        "-af", "loudnorm=print_format=json",
+        "-f", "null", "-",
+    ]
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, check=False, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Loudness analysis failed: {result.stderr[-500:]}")
+    match = _JSON_BLOCK.search(result.stderr)
+    if match is None:
+        return None
+    data = json.loads(match.group(0))
+    try:
+        return LoudnessStats(
+            integrated_lufs=float(data["input_i"]),
+            true_peak_dbtp=float(data["input_tp"]),
+            lra=float(data["input_lra"]),
+            threshold_lufs=float(data["input_thresh"]),
+        )
+    except (KeyError, ValueError):
+        # loudnorm reports "-inf" for digital silence.
+        return None
+
+
+def normalization_gain_db(
+    integrated_lufs: Optional[float],
+    true_peak_dbtp: Optional[float],
+    target_i: float = TARGET_INTEGRATED_LUFS,
+    target_tp: float = TARGET_TRUE_PEAK_DBTP,
+    max_gain: float = MAX_GAIN_DB,
+) -> float:
+    """Linear gain that moves a source to ``target_i`` without clipping."""
+    if integrated_lufs is None or integrated_lufs <= SILENCE_FLOOR_LUFS:
+        return 0.0
+    gain = target_i - integrated_lufs
+    if true_peak_dbtp is not None:
+        # Never push the true peak over the ceiling; a quieter result beats
+        # the pumping a limiter would add.
+        gain = min(gain, target_tp - true_peak_dbtp)
+    return max(-max_gain, min(max_gain, gain))
+
+
+def cached_gain_db(record: Optional[Dict[str, Any]]) -> float:
+    """Gain for a ``media_loudness`` document; 0 when disabled or silent."""
+    if not LOUDNESS_NORMALIZATION_ENABLED or not record or not record.get("has_audio"):
+        return 0.0
+    return round(
+        normalization_gain_db(record.get("integrated_lufs"), record.get("true_peak_dbtp")), 2
+    )
@@ -0,0 +1,141 @@
+"""Output packaging helpers for rendered reels.
+
+Every final MP4 is written with ``+faststart`` so the moov atom sits in front
+of the media data and browsers can start playback before the download ends.
+The same ffmpeg invocation also writes a cover image and a short animated
+preview as extra outputs, so no second decode of the reel is needed.
+Previews can additionally be repackaged as HLS with fMP4 segments; that step
+only remuxes (``-c copy``), so its cost does not grow with encode settings.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+FASTSTART_ARGS: List[str] = ["-movflags", "+faststart"]
+
+HLS_PREVIEW_ENABLED = os.getenv("VIDEO_HLS_PREVIEW", "false").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+HLS_SEGMENT_SECONDS = float(os.getenv("VIDEO_HLS_SEGMENT_SECONDS", "4"))
+
+COVER_FORMAT = os.getenv("VIDEO_COVER_FORMAT", "jpg").strip().lower()
+COVER_WIDTH = int(os.getenv("VIDEO_COVER_WIDTH", "480"))
+PREVIEW_FORMAT = os.getenv("VIDEO_PREVIEW_FORMAT", "webp").strip().lower()
+PREVIEW_WIDTH = int(os.getenv("VIDEO_PREVIEW_WIDTH", "320"))
+PREVIEW_SECONDS = float(os.getenv("VIDEO_PREVIEW_SECONDS", "3"))
+PREVIEW_FPS = int(os.getenv("VIDEO_PREVIEW_FPS", "8"))
+
+IMAGE_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".png": "image/png",
+    ".gif": "image/gif",
+}
+
+HLS_PLAYLIST_NAME = "index.m3u8"
+HLS_INIT_NAME = "init.mp4"
+
+HLS_CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".m4s": "video/iso.segment",
+    ".mp4": "video/mp4",
+}
+
+
+def cover_paths_for(output_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the (cover, preview) paths written next to ``output_path``."""
+    stem = os.path.splitext(output_path)[0]
+    cover = (
+        f"{stem}.cover.{COVER_FORMAT}"
+        if COVER_FORMAT not in ("", "none")
+        else None
+    )
+    preview = (
+        f"{stem}.preview.{PREVIEW_FORMAT}"
+        if PREVIEW_FORMAT not in ("", "none")
+        else None
+    )
+    return cover, preview
+
+
+def cover_output_args(
+    cover_path: Optional[str], preview_path: Optional[str], skip_seconds: float = 0.0
+) -> List[str]:
+    """Extra ffmpeg outputs for the cover frame and animated preview.
+
+    Append these after the main output so they share its demux/decode.
+    ``skip_seconds`` starts both after a branded intro.
+    """
+    args: List[str] = []
+    skip = ["-ss", f"{skip_seconds:.3f}"] if skip_seconds > 0 else []
+    if cover_path:
+        # thumbnail picks the most representative of the first 48 frames,
+        # which avoids black or mid-fade first frames.
+        args += [
+            *skip,
+            "-map", "0:v:0",
+            "-vf", f"thumbnail=48,scale={COVER_WIDTH}:-2",
+            "-frames:v", "1",
+            "-an",
+            cover_path,
+        ]
+    if preview_path:
+        args += [
+            *skip,
+            "-map", "0:v:0",
+            "-t", f"{PREVIEW_SECONDS:g}",
+            "-vf", f"fps={PREVIEW_FPS},scale={PREVIEW_WIDTH}:-2",
+            "-an",
+        ]
+        if preview_path.endswith(".webp"):
+            args += ["-c:v", "libwebp", "-quality", "60", "-loop", "0"]
+        elif preview_path.endswith(".gif"):
+            args += ["-loop", "0"]
+        args.append(preview_path)
+    return args
+
+
+def package_hls(
+    input_path: str,
+    output_dir: str,
+    segment_seconds: float = HLS_SEGMENT_SECONDS,
+    threads: int = 1,
+) -> str:
+    """Remux ``input_path`` into an HLS/fMP4 VOD playlist and return its path."""
+    target = Path(output_dir)
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True, exist_ok=True)
+    playlist_path = target / HLS_PLAYLIST_NAME
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i", input_path,
+        "-map", "0",
+        "-c", "copy",
+        "-threads", str(threads),
+        "-f", "hls",
+        "-hls_time", f"{segment_seconds:g}",
+        "-hls_playlist_type", "vod",
+        "-hls_segment_type", "fmp4",
+        "-hls_fmp4_init_filename", HLS_INIT_NAME,
+        "-hls_segment_filename", str(target / "segment_%05d.m4s"),
+        str(playlist_path),
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0 or not playlist_path.exists():
+        raise RuntimeError(f"HLS packaging failed: {result.stderr[-500:]}")
+    return str(playlist_path.resolve())
@@ -0,0 +1,175 @@
+"""ffprobe wrappers used by the render engine.
+
+Results are cached per (path, mtime, size), so a source reused across parts
+or re-renders is only probed once per process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    path: str
+    duration: float
+    width: int
+    height: int
+    fps: float
+    video_codec: Optional[str] = None
+    pix_fmt: Optional[str] = None
+    has_audio: bool = False
+    audio_codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    bit_rate: Optional[int] = None
+    # Codec parameters that must match for segments to concat with -c copy.
+    video_profile: Optional[str] = None
+    video_level: Optional[int] = None
+    time_base: Optional[str] = None
+    extradata_hash: Optional[str] = None
+
+    @property
+    def stream_signature(self) -> Tuple[Any, ...]:
+        return (
+            self.video_codec,
+            self.video_profile,
+            self.video_level,
+            self.time_base,
+            self.extradata_hash,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "duration": self.duration,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "video_codec": self.video_codec,
+            "pix_fmt": self.pix_fmt,
+            "has_audio": self.has_audio,
+            "audio_codec": self.audio_codec,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "bit_rate": self.bit_rate,
+            "video_profile": self.video_profile,
+            "video_level": self.video_level,
+            "time_base": self.time_base,
+            "extradata_hash": self.extradata_hash,
+        }
+
+
+def _file_key(path: str) -> Tuple[str, int, int]:
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def asset_key(path: str) -> Tuple[str, int, int]:
+    """Return (key, size, mtime_ns) identifying the current file contents."""
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(raw.encode()).hexdigest(), stat.st_size, stat.st_mtime_ns
+
+
+def _parse_rate(value: Optional[str]) -> float:
+    if not value or value in ("0/0", "0"):
+        return 0.0
+    try:
+        return float(Fraction(value))
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _run_ffprobe(args: list) -> str:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr.strip()[-300:]}")
+    return result.stdout
+
+
+@lru_cache(maxsize=256)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> MediaInfo:
+    data = json.loads(
+        _run_ffprobe(
+            [
+                "-show_data_hash", "sha256",
+                "-show_entries",
+                "format=duration,bit_rate:"
+                "stream=codec_type,codec_name,width,height,avg_frame_rate,"
+                "r_frame_rate,pix_fmt,sample_rate,channels,"
+                "profile,level,time_base,extradata_hash",
+                "-of", "json",
+                path,
+            ]
+        )
+        or "{}"
+    )
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    fmt = data.get("format", {})
+    fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+    return MediaInfo(
+        path=path,
+        duration=float(fmt.get("duration") or 0.0),
+        width=int(video.get("width") or 0),
+        height=int(video.get("height") or 0),
+        fps=fps,
+        video_codec=video.get("codec_name"),
+        pix_fmt=video.get("pix_fmt"),
+        has_audio=audio is not None,
+        audio_codec=audio.get("codec_name") if audio else None,
+        sample_rate=int(audio["sample_rate"]) if audio and audio.get("sample_rate") else None,
+        channels=int(audio["channels"]) if audio and audio.get("channels") else None,
+        bit_rate=int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+        video_profile=video.get("profile"),
+        video_level=video.get("level"),
+        time_base=video.get("time_base"),
+        extradata_hash=video.get("extradata_hash"),
+    )
+
+
+def probe_media(path: str) -> MediaInfo:
+    """Return stream information for ``path``."""
+    return _probe_cached(*_file_key(path))
+
+
+@lru_cache(maxsize=64)
+def _keyframes_cached(path: str, mtime_ns: int, size: int) -> Tuple[float, ...]:
+    output = _run_ffprobe(
+        [
+            "-select_streams", "v:0",
+            "-skip_frame", "nokey",
+            "-show_entries", "frame=pts_time",
+            "-of", "csv=p=0",
+            path,
+        ]
+    )
+    times = []
+    for line in output.splitlines():
+        line = line.strip().rstrip(",")
+        if not line:
+            continue
+        try:
+            times.append(float(line))
+        except ValueError:
+            continue
+    return tuple(sorted(times))
+
+
+def keyframe_times(path: str) -> Tuple[float, ...]:
+    """Return the presentation times of the video keyframes in ``path``."""
+    return _keyframes_cached(*_file_key(path))
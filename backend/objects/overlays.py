@@ -0,0 +1,268 @@
+"""Burned-in overlays for the ffmpeg render engine.
+
+Two kinds of layers are composited in the render graph:
+
+* a static layer per template (the ``@motivation_nitrous`` tagline), drawn
+  once per output size and cached as a transparent PNG;
+* timed captions, each drawn to its own cached PNG and enabled with
+  ``between(t, start, end)``.
+
+Text is drawn with Pillow using the same font as the quote images, so the
+ffmpeg build does not need ``drawtext``/libfreetype and the look matches the
+posts. This module is imported by the API, so Pillow and ``create_images``
+are only imported when a layer is actually drawn.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+# Shared with the quote images in ``create_images``.
+TAGLINE_TEXT = "@motivation_nitrous"
+
+OVERLAY_CACHE_DIR = os.getenv("VIDEO_OVERLAY_CACHE_DIR") or os.path.join(
+    os.getenv("OUTPUT_FILES_LOCATION") or "./outputs", "_overlay_cache"
+)
+# Bump when the drawing code changes so stale PNGs are not reused.
+OVERLAY_RENDER_VERSION = 1
+CAPTION_POSITIONS = ("top", "center", "bottom")
+
+
+@dataclass(frozen=True)
+class OverlayTemplate:
+    name: str
+    text: str
+    position: str = "bottom"
+    # Font size and margin at a 1024 px wide frame; scaled to the output.
+    font_size: int = 40
+    margin: int = 60
+    color: Tuple[int, int, int, int] = (255, 255, 255, 230)
+    shadow: Tuple[int, int, int, int] = (0, 0, 0, 160)
+
+
+OVERLAY_TEMPLATES: Dict[str, OverlayTemplate] = {
+    template.name: template
+    for template in (
+        OverlayTemplate("watermark", TAGLINE_TEXT, position="bottom"),
+        OverlayTemplate("watermark_top", TAGLINE_TEXT, position="top"),
+    )
+}
+
+DEFAULT_OVERLAY_TEMPLATE = (
+    os.getenv("VIDEO_OVERLAY_TEMPLATE", "none").strip().lower() or "none"
+)
+
+
+@dataclass
+class Caption:
+    text: str
+    start: float
+    end: float
+    position: str = "bottom"
+
+
+@dataclass
+class OverlaySpec:
+    template: Optional[OverlayTemplate] = None
+    captions: List[Caption] = field(default_factory=list)
+
+    @property
+    def active(self) -> bool:
+        return self.template is not None or bool(self.captions)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "template": self.template.name if self.template else None,
+            "captions": [asdict(caption) for caption in self.captions],
+        }
+
+
+def get_overlay_template(name: Optional[str]) -> Optional[OverlayTemplate]:
+    """Return the template for ``name``; empty uses the default, ``none`` disables."""
+    key = (name or "").strip().lower() or DEFAULT_OVERLAY_TEMPLATE
+    if key == "none":
+        return None
+    try:
+        return OVERLAY_TEMPLATES[key]
+    except KeyError:
+        raise ValueError(
+            f"Unknown overlay template '{name}'. Expected one of: "
+            f"none, {', '.join(OVERLAY_TEMPLATES)}"
+        ) from None
+
+
+def overlay_from_payload(payload: Dict[str, Any]) -> OverlaySpec:
+    overlay = payload.get("overlay") or {}
+    captions = [
+        Caption(
+            text=str(item["text"]),
+            start=float(item["start"]),
+            end=float(item["end"]),
+            position=item.get("position") or "bottom",
+        )
+        for item in overlay.get("captions") or []
+        if str(item.get("text") or "").strip()
+    ]
+    return OverlaySpec(
+        template=get_overlay_template(overlay.get("template")),
+        captions=captions,
+    )
+
+
+def _cache_path(kind: str, key: Dict[str, Any], cache_dir: str) -> str:
+    digest = hashlib.sha1(
+        json.dumps({**key, "v": OVERLAY_RENDER_VERSION}, sort_keys=True).encode()
+    ).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{kind}_{digest}.png")
+
+
+def _draw_text_layer(
+    path: str,
+    text: str,
+    width: int,
+    height: int,
+    position: str,
+    font_size: int,
+    margin: int,
+    color: Tuple[int, int, int, int],
+    shadow: Optional[Tuple[int, int, int, int]] = None,
+    box: Optional[Tuple[int, int, int, int]] = None,
+) -> None:
+    from PIL import Image, ImageDraw
+
+    from .create_images import load_font, text_block_height, wrap_text
+
+    scale = width / 1024.0
+    font = load_font(max(12, int(font_size * scale)))
+    margin = int(margin * scale)
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    lines = wrap_text(draw, text, font, width - margin * 2)
+    line_height = text_block_height(font, 1)
+    block_height = line_height * len(lines)
+
+    if position == "top":
+        y = margin
+    elif position == "center":
+        y = (height - block_height) // 2
+    else:
+        y = height - margin - block_height
+
+    if box is not None:
+        widest = max(draw.textlength(line, font=font) for line in lines)
+        pad = int(16 * scale)
+        left = (width - widest) // 2 - pad
+        draw.rectangle(
+            (left, y - pad, width - left, y + block_height + pad), fill=box
+        )
+
+    offset = max(1, int(2 * scale))
+    for line in lines:
+        x = (width - draw.textlength(line, font=font)) // 2
+        if shadow is not None:
+            draw.text((x + offset, y + offset), line, font=font, fill=shadow)
+        draw.text((x, y), line, font=font, fill=color)
+        y += line_height
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    image.save(tmp_path, format="PNG", optimize=True)
+    os.replace(tmp_path, path)
+
+
+def static_overlay_path(
+    template: OverlayTemplate, width: int, height: int, cache_dir: str = OVERLAY_CACHE_DIR
+) -> str:
+    return _cache_path(
+        "template", {**asdict(template), "width": width, "height": height}, cache_dir
+    )
+
+
+def caption_path(
+    caption: Caption, width: int, height: int, cache_dir: str = OVERLAY_CACHE_DIR
+) -> str:
+    key = {"text": caption.text, "position": caption.position, "width": width, "height": height}
+    return _cache_path("caption", key, cache_dir)
+
+
+def static_overlay_png(
+    template: OverlayTemplate, width: int, height: int, cache_dir: str = OVERLAY_CACHE_DIR
+) -> str:
+    """Return the cached PNG for ``template`` at ``width`` x ``height``."""
+    path = static_overlay_path(template, width, height, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        _draw_text_layer(
+            path,
+            template.text,
+            width,
+            height,
+            template.position,
+            template.font_size,
+            template.margin,
+            template.color,
+            shadow=template.shadow,
+        )
+    return path
+
+
+def caption_png(
+    caption: Caption, width: int, height: int, cache_dir: str = OVERLAY_CACHE_DIR
+) -> str:
+    """Return the cached PNG for a caption's text and position."""
+    path = caption_path(caption, width, height, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        _draw_text_layer(
+            path,
+            caption.text,
+            width,
+            height,
+            caption.position,
+            font_size=52,
+            # Keep bottom captions clear of the tagline.
+            margin=200 if caption.position == "bottom" else 90,
+            color=(255, 255, 255, 255),
+            box=(0, 0, 0, 140),
+        )
+    return path
+
+
+def overlay_layers(
+    spec: OverlaySpec, width: int, height: int, draw: bool = True
+) -> List[Tuple[str, Optional[Tuple[float, float]]]]:
+    """Draw (or reuse) every layer and return (png, enable window) pairs.
+
+    With ``draw=False`` only the cache paths are returned, for dry runs.
+    """
+    template_png = static_overlay_png if draw else static_overlay_path
+    caption_layer = caption_png if draw else caption_path
+    layers: List[Tuple[str, Optional[Tuple[float, float]]]] = []
+    if spec.template is not None:
+        layers.append((template_png(spec.template, width, height), None))
+    for caption in spec.captions:
+        layers.append((caption_layer(caption, width, height), (caption.start, caption.end)))
+    return layers
+
+
+def overlay_filters(
+    base_label: str, first_input: int, windows: List[Optional[Tuple[float, float]]]
+) -> Tuple[List[str], str]:
+    """Chain ``overlay`` filters for image inputs starting at ``first_input``."""
+    filters: List[str] = []
+    current = base_label
+    for offset, window in enumerate(windows):
+        label = f"o{offset}"
+        enable = ""
+        if window is not None:
+            enable = f":enable='between(t,{window[0]:.3f},{window[1]:.3f})'"
+        filters.append(f"[{current}][{first_input + offset}:v]overlay=0:0{enable}[{label}]")
+        current = label
+    return filters, current
@@ -0,0 +1,90 @@
+"""Keyset (cursor) pagination and cached totals for the list endpoints.
+
+``skip`` makes Mongo walk every document before the page, so deep pages get
+slower as a collection grows. A cursor instead carries the sort-key values
+of the last document served. The next page asks for documents after them,
+which an index on the sort keys answers directly. Every sort ends with
+``_id`` so the order, and therefore the cursor, is unambiguous.
+
+Totals are cached per collection and filter for a few seconds. An unfiltered
+total comes from the collection metadata instead of a count. The cache
+expects PyMongo's async collections, which only the API uses.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import json_util
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+COUNT_CACHE_SECONDS = float(os.getenv("LIST_COUNT_CACHE_SECONDS", "30"))
+
+SortSpec = Sequence[Tuple[str, int]]
+
+
+def encode_cursor(doc: Dict[str, Any], sort: SortSpec) -> str:
+    """Opaque token for the page after ``doc``."""
+    raw = json_util.dumps([doc.get(field) for field, _ in sort])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: SortSpec) -> List[Any]:
+    """Sort-key values from a token; ValueError if it does not fit ``sort``."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("invalid cursor")
+    return values
+
+
+def keyset_filter(sort: SortSpec, values: Sequence[Any]) -> Dict[str, Any]:
+    """Documents strictly after ``values`` in ``sort`` order."""
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {sort[i][0]: values[i] for i in range(position)}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[position]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+class CountCache:
+    """Short-lived totals per (collection, filter)."""
+
+    def __init__(self, ttl_seconds: float = COUNT_CACHE_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, str], Tuple[int, float]] = {}
+
+    async def count(
+        self,
+        collection: Any,
+        query: Dict[str, Any],
+        join: Optional[List[Dict[str, Any]]] = None,
+    ) -> int:
+        key = (collection.name, json_util.dumps([query, join], sort_keys=True))
+        cached = self._entries.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self.ttl_seconds:
+            return cached[0]
+        if join:
+            pipeline = [{"$match": query}, *join, {"$count": "total"}]
+            result = await (await collection.aggregate(pipeline)).to_list(1)
+            total = result[0]["total"] if result else 0
+        elif query:
+            total = await collection.count_documents(query)
+        else:
+            total = await collection.estimated_document_count()
+        self._entries[key] = (total, now)
+        return total
+
+    def invalidate(self, collection_name: str) -> None:
+        for key in [key for key in self._entries if key[0] == collection_name]:
+            del self._entries[key]
@@ -0,0 +1,116 @@
+"""CPU and size estimates for a render plan.
+
+Cost is expressed per output megapixel-frame (width x height x fps x
+seconds / 1e6), so measurements from one profile carry over to another.
+Rates come from recent ``render_stats`` documents, per segment method and
+x264 preset, and fall back to conservative defaults until enough renders
+have been recorded.
+
+The estimate only reads a ``RenderPlan`` and probed ``MediaInfo``; it never
+runs ffmpeg itself, so the plan endpoint can call it inline.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+from .media_probe import MediaInfo
+from .render_engine import RenderPlan
+
+load_dotenv(find_dotenv())
+
+RENDER_COST_HISTORY = int(os.getenv("VIDEO_RENDER_COST_HISTORY", "50"))
+
+# CPU seconds per megapixel-frame; roughly single-threaded x264 "medium".
+DEFAULT_CPU_RATES = {"copy": 0.0005, "smart_cut": 0.005, "reencode": 0.03}
+# Output bits per megapixel-frame at the default CRF.
+DEFAULT_BITS_PER_MPF = 50000.0
+# Fewer samples than this and the defaults win.
+MIN_SAMPLE_MPF = 50.0
+
+
+def megapixel_frames(duration: float, width: int, height: int, fps: float) -> float:
+    return max(0.0, duration) * width * height * fps / 1e6
+
+
+def throughput_from_history(docs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate ``render_stats`` documents into per-method CPU rates."""
+    cpu: Dict[str, float] = {}
+    work: Dict[str, float] = {}
+    bits = total_mpf = 0.0
+    renders = 0
+    for doc in docs:
+        width, height, fps = doc.get("width"), doc.get("height"), doc.get("fps")
+        if not (width and height and fps):
+            continue
+        renders += 1
+        for segment in doc.get("segments") or []:
+            # Segments reused from the segment cache cost nothing.
+            if segment.get("cpu_seconds") is None or segment.get("reused"):
+                continue
+            mpf = megapixel_frames(segment.get("duration") or 0.0, width, height, fps)
+            for key in (segment["method"], f"{segment['method']}:{doc.get('preset')}"):
+                cpu[key] = cpu.get(key, 0.0) + segment["cpu_seconds"]
+                work[key] = work.get(key, 0.0) + mpf
+        mpf = megapixel_frames(doc.get("duration_seconds") or 0.0, width, height, fps)
+        if doc.get("size_bytes") and mpf:
+            bits += doc["size_bytes"] * 8
+            total_mpf += mpf
+    rates = {key: cpu[key] / work[key] for key in cpu if work[key] >= MIN_SAMPLE_MPF}
+    return {
+        "renders": renders,
+        "cpu_rates": rates,
+        "bits_per_mpf": bits / total_mpf if total_mpf >= MIN_SAMPLE_MPF else None,
+    }
+
+
+def _cpu_rate(history: Dict[str, Any], method: str, preset: str) -> Tuple[float, str]:
+    rates = history.get("cpu_rates") or {}
+    for key in (f"{method}:{preset}", method):
+        if key in rates:
+            return rates[key], "history"
+    return DEFAULT_CPU_RATES.get(method, DEFAULT_CPU_RATES["reencode"]), "default"
+
+
+def estimate_plan_cost(
+    plan: RenderPlan,
+    history: Optional[Dict[str, Any]] = None,
+    probe: Optional[Callable[[str], MediaInfo]] = None,
+) -> Dict[str, Any]:
+    """Estimated CPU-seconds and output bytes for every segment of ``plan``."""
+    history = history or {}
+    profile = plan.profile
+    bits_per_mpf = history.get("bits_per_mpf") or DEFAULT_BITS_PER_MPF
+    segments = []
+    total_cpu = total_bytes = 0.0
+    for segment in plan.segments:
+        mpf = megapixel_frames(segment.duration, profile.width, profile.height, profile.fps)
+        rate, basis = _cpu_rate(history, segment.method, profile.preset)
+        size = mpf * bits_per_mpf / 8
+        if segment.method == "copy" and probe is not None:
+            # Copied video keeps the source bitrate.
+            info = probe(segment.parts[0].path)
+            if info.bit_rate:
+                size = info.bit_rate * segment.duration / 8
+        cpu = mpf * rate
+        total_cpu += cpu
+        total_bytes += size
+        segments.append(
+            {
+                "parts": [part.index for part in segment.parts],
+                "method": segment.method,
+                "megapixel_frames": round(mpf, 1),
+                "cpu_seconds": round(cpu, 2),
+                "size_bytes": int(size),
+                "basis": basis,
+            }
+        )
+    return {
+        "cpu_seconds": round(total_cpu, 2),
+        "size_bytes": int(total_bytes),
+        "history_renders": history.get("renders", 0),
+        "segments": segments,
+    }
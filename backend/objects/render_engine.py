@@ -0,0 +1,1094 @@
+"""ffmpeg-native render engine for reels.
+
+The engine reads the same JSON payload as ``VideoAutomation`` and produces
+the same output, but does all trimming, scaling and transitions inside ffmpeg
+filter graphs instead of compositing frames in Python.
+
+Rendering starts with a plan. Parts joined by an overlapping transition
+(``xfade``) form one group and are always re-encoded together. A part that
+stands alone can be stream-copied when its source already matches the output
+profile and its start sits on a keyframe. With ``VIDEO_SMART_CUT`` enabled,
+only the stretch up to the next keyframe is re-encoded and the rest is copied.
+A part with a ``fade_out`` needs its pixels changed and is re-encoded too.
+Groups are rendered to scratch segments and joined with the concat demuxer,
+or, in ``single_pass`` mode, the whole reel is one filter graph. Burned-in
+overlays and voice/music mixes span the whole timeline, so they always force
+a single pass. When any audio is kept, every segment carries an AAC track so
+the concat demuxer sees the same streams everywhere; copied parts copy only
+their video and re-encode the (cheap) audio with its loudness gain.
+
+Segmented renders can keep their segments between runs. A segment's file is
+named after a hash of everything that goes into it (sources, trims,
+transitions, gains, output profile), and the payload's ``segment_cache``
+carries the manifest of the previous render. A segment whose key is already
+in the manifest is reused as is, so editing one part re-encodes only its
+segment, and reordering or deleting parts only re-runs the final concat.
+
+Branded intro and outro clips (the payload's ``brand`` section) are encoded
+once per output profile into their asset's renditions folder, with the same
+codec parameters as the reel, and then stream-copied by the final concat.
+
+New segments are encoded into a scratch folder in RAM
+(``VIDEO_SCRATCH_RAM_DIR``) when their estimated size fits the node's budget,
+otherwise into ``SCRATCH_FOLDER`` on disk; see ``scratch``. Segments reused
+from the cache do not count against the budget. After the concat, segments
+worth caching are moved into the segment cache.
+
+This module is imported by both the API (for planning) and the workers, so it
+only uses relative imports.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+from .audio_mix import (
+    AUDIO_SAMPLE_RATE,
+    CUT_FADE_SECONDS,
+    KEEP_PART_AUDIO,
+    AudioSpec,
+    audio_encoder_args,
+    audio_from_payload,
+    join_audio,
+    mix_filters,
+    part_audio_chain,
+    part_audio_filters,
+)
+from .media_packaging import FASTSTART_ARGS, cover_output_args, cover_paths_for
+from .media_probe import MediaInfo, keyframe_times, probe_media
+from .overlays import OverlaySpec, overlay_filters, overlay_from_payload, overlay_layers
+from .scratch import allocate_scratch, release_scratch
+from .transitions import (
+    TransitionSpec,
+    fade_out_filter,
+    get_transition,
+    resolve_duration,
+    xfade_filter,
+)
+
+load_dotenv(find_dotenv())
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
+
+
+RENDER_ENGINE = os.getenv("VIDEO_RENDER_ENGINE", "ffmpeg").strip().lower()
+RENDER_MODE = os.getenv("VIDEO_RENDER_MODE", "segmented").strip().lower()
+STREAM_COPY_ENABLED = _env_flag("VIDEO_STREAM_COPY", "true")
+SMART_CUT_ENABLED = _env_flag("VIDEO_SMART_CUT", "false")
+TARGET_WIDTH = int(os.getenv("VIDEO_TARGET_WIDTH", "1440"))
+X264_PRESET = os.getenv("VIDEO_X264_PRESET", "medium")
+X264_CRF = int(os.getenv("VIDEO_X264_CRF", "23"))
+FFMPEG_THREADS = int(os.getenv("VIDEO_FFMPEG_THREADS", "1"))
+
+INPUT_FOLDER = os.getenv("INPUT_FILES_LOCATION", "")
+OUTPUT_FOLDER = os.getenv("OUTPUT_FILES_LOCATION") or "./outputs"
+SCRATCH_FOLDER = os.path.join(OUTPUT_FOLDER, "_tmp_segments")
+SEGMENT_CACHE_ENABLED = _env_flag("VIDEO_SEGMENT_CACHE", "true")
+SEGMENT_CACHE_FOLDER = os.path.join(OUTPUT_FOLDER, "_segment_cache")
+# Bump when segment commands change so stale segments are not reused.
+SEGMENT_CACHE_VERSION = 1
+
+RENDER_MODES = ("segmented", "single_pass")
+SEGMENT_METHODS = ("copy", "smart_cut", "reencode")
+
+# Starts within this many seconds of a keyframe count as keyframe-aligned.
+KEYFRAME_TOLERANCE = 0.02
+_COPY_CODECS = {"libx264": "h264"}
+
+
+def _child_cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _even(value: float) -> int:
+    return max(2, int(round(value / 2.0)) * 2)
+
+
+@dataclass
+class RenderPart:
+    index: int
+    path: str
+    start: float
+    end: float
+    transition: Optional[str] = None
+    transition_duration: Optional[float] = None
+    keep_audio: bool = KEEP_PART_AUDIO
+    gain_db: float = 0.0
+    # A still image looped for ``duration`` seconds instead of a clip.
+    still: bool = False
+    # Resolved during planning.
+    fade_out: float = 0.0
+    has_audio: bool = False
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+@dataclass
+class Link:
+    """How part ``index`` hands over to part ``index + 1``."""
+
+    index: int
+    spec: TransitionSpec
+    duration: float
+
+    @property
+    def overlap(self) -> float:
+        return self.duration if self.spec.overlaps else 0.0
+
+
+@dataclass
+class OutputProfile:
+    width: int
+    height: int
+    fps: float
+    video_codec: str = "libx264"
+    pix_fmt: str = "yuv420p"
+    preset: str = X264_PRESET
+    crf: int = X264_CRF
+    tune: Optional[str] = None
+
+    def encoder_args(self) -> List[str]:
+        args = [
+            "-c:v", self.video_codec,
+            "-preset", self.preset,
+            "-crf", str(self.crf),
+            "-pix_fmt", self.pix_fmt,
+            "-r", f"{self.fps:g}",
+        ]
+        if self.tune:
+            args += ["-tune", self.tune]
+        return args
+
+    def matches(self, info: MediaInfo) -> bool:
+        """True when ``info`` can be stream-copied into this profile."""
+        return (
+            info.video_codec == _COPY_CODECS.get(self.video_codec)
+            and info.width == self.width
+            and info.height == self.height
+            and info.pix_fmt == self.pix_fmt
+            and abs(info.fps - self.fps) < 0.01
+        )
+
+    def rendition_key(self, with_audio: bool) -> str:
+        """File-name-safe key for clips encoded to concat-copy with this profile."""
+        tune = f"_{self.tune}" if self.tune else ""
+        audio = f"aac{AUDIO_SAMPLE_RATE}" if with_audio else "noaudio"
+        return (
+            f"{self.width}x{self.height}_{self.fps:g}fps_{self.video_codec}_{self.pix_fmt}"
+            f"_{self.preset}_crf{self.crf}{tune}_{audio}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "video_codec": self.video_codec,
+            "pix_fmt": self.pix_fmt,
+            "preset": self.preset,
+            "crf": self.crf,
+            "tune": self.tune,
+        }
+
+
+@dataclass
+class Segment:
+    parts: List[RenderPart]
+    links: List[Link]
+    method: str
+    reason: str
+    split_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return sum(p.duration for p in self.parts) - sum(l.overlap for l in self.links)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "parts": [p.index for p in self.parts],
+            "method": self.method,
+            "reason": self.reason,
+            "duration": round(self.duration, 3),
+            "split_at": self.split_at,
+            "transitions": [
+                {"after_part": l.index, "name": l.spec.name, "duration": round(l.duration, 3)}
+                for l in self.links
+            ],
+        }
+
+
+@dataclass
+class RenderPlan:
+    profile: OutputProfile
+    mode: str
+    segments: List[Segment] = field(default_factory=list)
+    overlay: Optional[OverlaySpec] = None
+    audio: Optional[AudioSpec] = None
+    has_audio: bool = False
+
+    @property
+    def duration(self) -> float:
+        return sum(segment.duration for segment in self.segments)
+
+    @property
+    def parts(self) -> List[RenderPart]:
+        return [part for segment in self.segments for part in segment.parts]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "profile": self.profile.to_dict(),
+            "duration": round(self.duration, 3),
+            "segments": [segment.to_dict() for segment in self.segments],
+            "overlay": self.overlay.to_dict() if self.overlay else None,
+            "audio": self.audio.to_dict() if self.audio else None,
+            "has_audio": self.has_audio,
+        }
+
+
+def parts_from_payload(payload: Dict[str, Any]) -> List[RenderPart]:
+    """Build render parts from the worker payload used by ``VideoAutomation``."""
+    inputs = payload.get("inputs", [])
+    durations = payload.get("durations", {})
+    transitions = payload.get("transitions", {}) or {}
+    audio = payload.get("audio") or {}
+    keep_audio = audio.get("keep", {}) or {}
+    gains = audio.get("gains", {}) or {}
+    parts: List[RenderPart] = []
+    for index, file_name in enumerate(inputs):
+        duration_info = durations.get(str(index))
+        if not duration_info:
+            continue
+        transition = transitions.get(str(index)) or {}
+        parts.append(
+            RenderPart(
+                index=index,
+                path=os.path.join(INPUT_FOLDER, file_name),
+                start=float(duration_info["start"]),
+                end=float(duration_info["end"]),
+                transition=transition.get("name"),
+                transition_duration=transition.get("duration"),
+                keep_audio=bool(keep_audio.get(str(index), KEEP_PART_AUDIO)),
+                gain_db=float(gains.get(str(index)) or 0.0),
+            )
+        )
+    return parts
+
+
+def profile_for(info: MediaInfo, width: int = TARGET_WIDTH) -> OutputProfile:
+    """Output profile derived from the first part, as the MoviePy path does."""
+    height = _even(width * info.height / info.width) if info.width else _even(width * 16 / 9)
+    return OutputProfile(width=width, height=height, fps=info.fps or 30.0)
+
+
+def resolve_links(parts: List[RenderPart]) -> List[Link]:
+    links: List[Link] = []
+    for position, part in enumerate(parts):
+        spec = get_transition(part.transition)
+        incoming = parts[position + 1] if position + 1 < len(parts) else None
+        duration = resolve_duration(
+            spec,
+            part.transition_duration,
+            part.duration,
+            incoming.duration if incoming else None,
+        )
+        part.fade_out = duration if spec.fade_out else 0.0
+        if incoming is not None:
+            if spec.overlaps and duration <= 0:
+                spec = get_transition("cut")
+            links.append(Link(index=part.index, spec=spec, duration=duration))
+    return links
+
+
+_ENCODER_SIGNATURES: Dict[str, Optional[Tuple[Any, ...]]] = {}
+
+
+def encoder_signature(profile: OutputProfile) -> Optional[Tuple[Any, ...]]:
+    """Profile, level, timebase and extradata of what ``profile`` encodes to.
+
+    Found by encoding a two-frame reference clip once per process. Copied
+    video only joins re-encoded segments under ``-c copy`` when its
+    ``MediaInfo.stream_signature`` is identical; otherwise the concat demuxer
+    can write an MP4 with mixed SPS/PPS that players fail on without any
+    ffmpeg error. None (ffmpeg unavailable) disables copying.
+    """
+    key = profile.rendition_key(False)
+    if key not in _ENCODER_SIGNATURES:
+        signature = None
+        with tempfile.TemporaryDirectory(prefix="encoder_ref_") as tmp_dir:
+            reference = os.path.join(tmp_dir, "reference.mp4")
+            cmd = [
+                "ffmpeg", "-y", "-v", "error",
+                "-f", "lavfi",
+                "-i", f"color=c=black:s={profile.width}x{profile.height}:r={profile.fps:g}",
+                "-frames:v", "2",
+                "-an",
+                *profile.encoder_args(),
+                reference,
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+                if result.returncode == 0:
+                    signature = probe_media(reference).stream_signature
+            except (OSError, RuntimeError):
+                signature = None
+        _ENCODER_SIGNATURES[key] = signature
+    return _ENCODER_SIGNATURES[key]
+
+
+def _copy_method(
+    part: RenderPart,
+    profile: OutputProfile,
+    info: MediaInfo,
+    keyframes: Callable[[str], Tuple[float, ...]],
+    with_audio: bool = False,
+) -> Tuple[str, str, Optional[float]]:
+    if part.fade_out > 0:
+        return "reencode", "fade_out changes pixels", None
+    if not STREAM_COPY_ENABLED:
+        return "reencode", "stream copy disabled", None
+    if not profile.matches(info):
+        return "reencode", "source differs from output profile", None
+    signature = encoder_signature(profile)
+    if signature is None or info.stream_signature != signature:
+        return "reencode", "H.264 profile/level/timebase/extradata differ from the encoder", None
+
+    times = keyframes(part.path)
+    position = bisect.bisect_left(times, part.start - KEYFRAME_TOLERANCE)
+    if position < len(times) and abs(times[position] - part.start) <= KEYFRAME_TOLERANCE:
+        return "copy", "starts on a keyframe", None
+    # AAC frames do not line up with video keyframes, so smart cuts would
+    # drift the audio; they are only used for silent renders.
+    if SMART_CUT_ENABLED and not with_audio and position < len(times):
+        split_at = times[position]
+        if part.start < split_at < part.end - 1.0 / profile.fps:
+            return "smart_cut", "re-encode up to the next keyframe", split_at
+    return "reencode", "start is not on a keyframe", None
+
+
+def plan_render(
+    parts: List[RenderPart],
+    mode: Optional[str] = None,
+    profile: Optional[OutputProfile] = None,
+    probe: Callable[[str], MediaInfo] = probe_media,
+    keyframes: Callable[[str], Tuple[float, ...]] = keyframe_times,
+    overlay: Optional[OverlaySpec] = None,
+    audio: Optional[AudioSpec] = None,
+) -> RenderPlan:
+    """Decide how every part is produced without running ffmpeg."""
+    if not parts:
+        raise ValueError("No parts to render")
+    mode = mode or RENDER_MODE
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode '{mode}'")
+    single_pass_reason = "single pass"
+    if overlay is not None and overlay.active:
+        mode, single_pass_reason = "single_pass", "single pass (overlays)"
+    if audio is not None and audio.mixes:
+        mode, single_pass_reason = "single_pass", "single pass (voice/music mix)"
+
+    infos = {part.path: probe(part.path) for part in parts}
+    profile = profile or profile_for(infos[parts[0].path])
+    links = resolve_links(parts)
+    for part in parts:
+        part.has_audio = part.keep_audio and infos[part.path].has_audio
+    with_audio = any(part.has_audio for part in parts) or bool(audio and audio.mixes)
+
+    def _plan(segments: List[Segment]) -> RenderPlan:
+        return RenderPlan(
+            profile=profile,
+            mode=mode,
+            segments=segments,
+            overlay=overlay,
+            audio=audio,
+            has_audio=with_audio,
+        )
+
+    if mode == "single_pass":
+        return _plan([Segment(list(parts), links, "reencode", single_pass_reason)])
+
+    # Overlapping transitions glue neighbouring parts into one group.
+    groups: List[Tuple[List[RenderPart], List[Link]]] = [([parts[0]], [])]
+    for link, part in zip(links, parts[1:]):
+        if link.spec.overlaps:
+            groups[-1][0].append(part)
+            groups[-1][1].append(link)
+        else:
+            groups.append(([part], []))
+
+    segments: List[Segment] = []
+    for group_parts, group_links in groups:
+        if group_links:
+            names = ", ".join(sorted({l.spec.name for l in group_links}))
+            segments.append(
+                Segment(group_parts, group_links, "reencode", f"joined by {names}")
+            )
+            continue
+        part = group_parts[0]
+        method, reason, split_at = _copy_method(
+            part, profile, infos[part.path], keyframes, with_audio
+        )
+        segments.append(Segment(group_parts, [], method, reason, split_at))
+    return _plan(segments)
+
+
+def _video_chain(input_index: int, part: RenderPart, profile: OutputProfile) -> str:
+    w, h = profile.width, profile.height
+    chain = (
+        f"[{input_index}:v]scale={w}:{h}:force_original_aspect_ratio=decrease,"
+        f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={profile.fps:g},"
+        f"format={profile.pix_fmt},setpts=PTS-STARTPTS"
+    )
+    if part.fade_out > 0:
+        chain += "," + fade_out_filter(part.duration, part.fade_out)
+    return chain + f"[v{input_index}]"
+
+
+def build_video_graph(
+    parts: List[RenderPart], links: List[Link], profile: OutputProfile
+) -> Tuple[List[str], str]:
+    """Return filter_complex chains for ``parts`` and the output label.
+
+    Input ``i`` of the command must be ``parts[i]`` trimmed with ``-ss``/``-t``.
+    """
+    filters = [_video_chain(i, part, profile) for i, part in enumerate(parts)]
+    current = "v0"
+    elapsed = parts[0].duration
+    for i, (link, part) in enumerate(zip(links, parts[1:]), start=1):
+        label = f"x{i}"
+        if link.spec.overlaps:
+            offset = max(0.0, elapsed - link.duration)
+            filters.append(
+                f"[{current}][v{i}]{xfade_filter(link.spec, link.duration, offset)}[{label}]"
+            )
+            elapsed += part.duration - link.duration
+        else:
+            filters.append(f"[{current}][v{i}]concat=n=2:v=1:a=0[{label}]")
+            elapsed += part.duration
+        current = label
+    return filters, current
+
+
+def build_audio_graph(
+    parts: List[RenderPart], links: List[Link]
+) -> Tuple[List[str], str]:
+    """Audio counterpart of ``build_video_graph``, labelled ``a{i}``."""
+    filters = []
+    for i, part in enumerate(parts):
+        incoming = links[i - 1].overlap if i > 0 else 0.0
+        outgoing = links[i].overlap if i < len(links) else 0.0
+        fade_in = 0.0 if incoming > 0 else CUT_FADE_SECONDS
+        fade_out = 0.0 if outgoing > 0 else max(part.fade_out, CUT_FADE_SECONDS)
+        filters.append(
+            part_audio_chain(i, part.duration, part.has_audio, fade_in, fade_out, part.gain_db)
+        )
+    joins, out_label = join_audio(
+        [f"a{i}" for i in range(len(parts))], [link.overlap for link in links]
+    )
+    return filters + joins, out_label
+
+
+def _input_args(part: RenderPart, fps: Optional[float] = None) -> List[str]:
+    if part.still:
+        # Every looped frame decodes the image again, so only produce the
+        # frames the output actually needs.
+        rate = ["-framerate", f"{fps:g}"] if fps else []
+        return ["-loop", "1", *rate, "-t", f"{part.duration:.3f}", "-i", part.path]
+    return ["-ss", f"{part.start:.3f}", "-t", f"{part.duration:.3f}", "-i", part.path]
+
+
+def _thread_args() -> List[str]:
+    return [
+        "-threads", str(FFMPEG_THREADS),
+        "-filter_threads", str(FFMPEG_THREADS),
+        "-filter_complex_threads", str(FFMPEG_THREADS),
+    ]
+
+
+def segment_commands(
+    segment: Segment,
+    plan: RenderPlan,
+    output_path: str,
+    overlay_inputs: Optional[List[Tuple[str, Optional[Tuple[float, float]]]]] = None,
+) -> List[Tuple[List[str], str]]:
+    """Return the ffmpeg commands that produce ``segment`` as (cmd, file) pairs.
+
+    ``overlay_inputs`` are (png, enable window) layers composited on top of
+    the segment; only single-pass segments carry them, as do voice/music
+    inputs.
+    """
+    profile = plan.profile
+    if segment.method == "copy":
+        part = segment.parts[0]
+        audio_args = ["-an"]
+        if plan.has_audio:
+            # Only the picture is copied. The audio is tiny to encode and
+            # gets the cut fades and loudness gain like any other part.
+            fade_out = max(part.fade_out, CUT_FADE_SECONDS)
+            chain = part_audio_filters(
+                part.duration, part.has_audio, CUT_FADE_SECONDS, fade_out, part.gain_db
+            )
+            source = "[0:a]" if part.has_audio else ""
+            audio_args = [
+                "-filter_complex", f"{source}{chain}[aout]",
+                "-map", "[aout]", *audio_encoder_args(),
+            ]
+        cmd = [
+            "ffmpeg", "-y",
+            *_input_args(part),
+            "-map", "0:v:0", "-c:v", "copy",
+            *audio_args,
+            "-avoid_negative_ts", "make_zero",
+            output_path,
+        ]
+        return [(cmd, output_path)]
+
+    if segment.method == "smart_cut":
+        part = segment.parts[0]
+        head = RenderPart(part.index, part.path, part.start, segment.split_at)
+        tail = RenderPart(part.index, part.path, segment.split_at, part.end)
+        stem = os.path.splitext(output_path)[0]
+        head_path, tail_path = f"{stem}_head.mp4", f"{stem}_tail.mp4"
+        head_cmd = [
+            "ffmpeg", "-y",
+            *_input_args(head),
+            "-map", "0:v:0", "-an",
+            *profile.encoder_args(),
+            *_thread_args(),
+            head_path,
+        ]
+        tail_cmd = [
+            "ffmpeg", "-y",
+            *_input_args(tail),
+            "-map", "0:v:0", "-c", "copy", "-an",
+            "-avoid_negative_ts", "make_zero",
+            tail_path,
+        ]
+        return [(head_cmd, head_path), (tail_cmd, tail_path)]
+
+    filters, out_label = build_video_graph(segment.parts, segment.links, profile)
+    inputs: List[str] = []
+    for part in segment.parts:
+        inputs += _input_args(part, profile.fps)
+    if overlay_inputs:
+        for png_path, _ in overlay_inputs:
+            inputs += ["-i", png_path]
+        overlay_chain, out_label = overlay_filters(
+            out_label, len(segment.parts), [window for _, window in overlay_inputs]
+        )
+        filters += overlay_chain
+
+    audio_args = ["-an"]
+    if plan.has_audio:
+        audio_chain, audio_label = build_audio_graph(segment.parts, segment.links)
+        filters += audio_chain
+        if plan.audio is not None and plan.audio.mixes:
+            next_input = len(segment.parts) + len(overlay_inputs or [])
+            voice_input = music_input = None
+            if plan.audio.voice_path:
+                inputs += ["-i", plan.audio.voice_path]
+                voice_input, next_input = next_input, next_input + 1
+            if plan.audio.music_path:
+                # Loop the bed so short tracks still cover the whole reel.
+                inputs += ["-stream_loop", "-1", "-i", plan.audio.music_path]
+                music_input = next_input
+            mix_chain, audio_label = mix_filters(
+                audio_label, plan.audio, voice_input, music_input, segment.duration
+            )
+            filters += mix_chain
+        audio_args = ["-map", f"[{audio_label}]", *audio_encoder_args()]
+
+    cmd = [
+        "ffmpeg", "-y",
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", f"[{out_label}]",
+        *audio_args,
+        *profile.encoder_args(),
+        *_thread_args(),
+        output_path,
+    ]
+    return [(cmd, output_path)]
+
+
+def rendition_command(
+    source_path: str,
+    duration: float,
+    has_audio: bool,
+    profile: OutputProfile,
+    with_audio: bool,
+    output_path: str,
+) -> List[str]:
+    """ffmpeg command encoding a brand clip so it concat-copies into a reel."""
+    part = RenderPart(index=0, path=source_path, start=0.0, end=duration, keep_audio=has_audio)
+    filters = [_video_chain(0, part, profile)]
+    audio_args = ["-an"]
+    if with_audio:
+        filters.append(part_audio_chain(0, duration, has_audio, 0.0, CUT_FADE_SECONDS))
+        audio_args = ["-map", "[a0]", *audio_encoder_args()]
+    return [
+        "ffmpeg", "-y",
+        "-i", source_path,
+        "-filter_complex", ";".join(filters),
+        "-map", "[v0]",
+        *audio_args,
+        *profile.encoder_args(),
+        *_thread_args(),
+        output_path,
+    ]
+
+
+def segment_key(segment: Segment, plan: RenderPlan) -> str:
+    """Hash of everything that determines the file ``segment`` renders to."""
+    parts = []
+    for part in segment.parts:
+        try:
+            stat = os.stat(part.path)
+            version = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            version = None
+        parts.append(
+            [
+                os.path.abspath(part.path), version, part.start, part.end,
+                part.fade_out, part.has_audio, part.gain_db, part.still,
+            ]
+        )
+    raw = json.dumps(
+        {
+            "version": SEGMENT_CACHE_VERSION,
+            "method": segment.method,
+            "split_at": segment.split_at,
+            "parts": parts,
+            "links": [[l.spec.name, l.duration] for l in segment.links],
+            "profile": plan.profile.to_dict(),
+            "audio": audio_encoder_args() if plan.has_audio else None,
+            "cut_fade": CUT_FADE_SECONDS,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class FFmpegRenderEngine:
+    """Drop-in replacement for ``VideoAutomation`` built on ffmpeg filters."""
+
+    engine_name = "ffmpeg"
+
+    def __init__(
+        self,
+        input_json_file: str,
+        mode: Optional[str] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.input_json_file = input_json_file
+        self.mode = mode
+        self.processing_data: Dict[str, Any] = {}
+        self.last_error: Optional[BaseException] = None
+        self.render_info: Dict[str, Any] = {}
+        self.plan: Optional[RenderPlan] = None
+        # CPU seconds spent by ffmpeg per segment, in plan order.
+        self.segment_cpu: List[float] = []
+        # Whether each segment came from the segment cache, in plan order.
+        self.segment_reused: List[bool] = []
+        # Segment manifest of this render, for the next one to diff against.
+        self.render_manifest: Optional[Dict[str, Any]] = None
+        # Segments encoded in scratch, moved to the segment cache after concat.
+        self._pending_segments: List[str] = []
+        self.logger = logger or logging.getLogger(__name__)
+
+    def read_video_config(self) -> bool:
+        file_path = self.input_json_file
+        if not os.path.isabs(file_path) and not os.path.exists(file_path):
+            file_path = os.path.join(INPUT_FOLDER, file_path)
+        try:
+            with open(file_path, "r") as handle:
+                self.processing_data = json.load(handle)
+            return True
+        except Exception as exc:
+            self.logger.exception("Exception while reading video config: %s", exc)
+            return False
+
+    def _run(self, cmd: List[str], what: str) -> subprocess.CompletedProcess:
+        self.logger.debug("ffmpeg %s: %s", what, " ".join(cmd))
+        return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    def _produce_segment(
+        self,
+        segment: Segment,
+        plan: RenderPlan,
+        segment_path: str,
+        overlay_inputs: Optional[List[Tuple[str, Optional[Tuple[float, float]]]]] = None,
+    ) -> List[str]:
+        files = []
+        for cmd, path in segment_commands(segment, plan, segment_path, overlay_inputs):
+            result = self._run(cmd, segment.method)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg {segment.method} failed: {result.stderr[-500:]}")
+            files.append(path)
+        return files
+
+    def _segment_cache(self, plan: RenderPlan) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Cache folder and previous segments by key; no cache for single pass."""
+        cache = self.processing_data.get("segment_cache") or {}
+        if not SEGMENT_CACHE_ENABLED or plan.mode != "segmented" or not cache.get("dir"):
+            return None, {}
+        manifest = cache.get("manifest") or {}
+        if manifest.get("version") != SEGMENT_CACHE_VERSION:
+            return cache["dir"], {}
+        return cache["dir"], {entry["key"]: entry for entry in manifest.get("segments", [])}
+
+    def _reusable_segments(self, plan: RenderPlan) -> Dict[int, List[str]]:
+        """Cached files of the segments this render can reuse, by segment number."""
+        cache_dir, previous = self._segment_cache(plan)
+        reusable: Dict[int, List[str]] = {}
+        if not cache_dir:
+            return reusable
+        for number, segment in enumerate(plan.segments):
+            entry = previous.get(segment_key(segment, plan))
+            cached = [os.path.join(cache_dir, name) for name in (entry or {}).get("files", [])]
+            if cached and all(os.path.isfile(path) for path in cached):
+                reusable[number] = cached
+        return reusable
+
+    def _render_segments(
+        self, plan: RenderPlan, scratch_dir: str, reusable: Dict[int, List[str]]
+    ) -> List[str]:
+        """Encode the segments not in ``reusable`` into ``scratch_dir``.
+
+        New segments stay in scratch for the concat; ``_store_segments`` moves
+        them into the segment cache afterwards.
+        """
+        overlay_inputs = None
+        if plan.overlay is not None and plan.overlay.active:
+            overlay_inputs = overlay_layers(
+                plan.overlay, plan.profile.width, plan.profile.height
+            )
+        cache_dir, _ = self._segment_cache(plan)
+        part_ids = self.processing_data.get("part_ids") or []
+        entries: List[Dict[str, Any]] = []
+        files: List[str] = []
+        for number, segment in enumerate(plan.segments):
+            key = segment_key(segment, plan) if cache_dir else None
+            if number in reusable:
+                files += reusable[number]
+                self.segment_cpu.append(0.0)
+                self.segment_reused.append(True)
+                entries.append(self._manifest_entry(key, segment, reusable[number], part_ids))
+                continue
+            name = f"{key}.mp4" if key else f"segment_{number:03d}.mp4"
+            segment_path = os.path.join(scratch_dir, name)
+            cpu_start = _child_cpu_seconds()
+            try:
+                produced = self._produce_segment(
+                    segment, plan, segment_path, overlay_inputs
+                )
+            except RuntimeError as exc:
+                if segment.method == "reencode":
+                    raise
+                # Copy paths are an optimisation; fall back to encoding.
+                self.logger.warning("Segment %s %s, re-encoding", number, exc)
+                segment.method, segment.reason = "reencode", f"{segment.method} failed"
+                produced = self._produce_segment(segment, plan, segment_path)
+            files += produced
+            self.segment_cpu.append(_child_cpu_seconds() - cpu_start)
+            self.segment_reused.append(False)
+            if cache_dir:
+                entries.append(self._manifest_entry(key, segment, produced, part_ids))
+                self._pending_segments += produced
+        if cache_dir:
+            self.render_manifest = {"version": SEGMENT_CACHE_VERSION, "segments": entries}
+            self.logger.info(
+                "Segment cache: reused %s of %s segments",
+                sum(self.segment_reused),
+                len(plan.segments),
+            )
+        return files
+
+    def _store_segments(self) -> None:
+        """Move segments encoded in scratch into the segment cache."""
+        cache_dir = (self.processing_data.get("segment_cache") or {}).get("dir")
+        if not cache_dir or not self._pending_segments:
+            return
+        os.makedirs(cache_dir, exist_ok=True)
+        failed = set()
+        for path in self._pending_segments:
+            name = os.path.basename(path)
+            try:
+                shutil.move(path, os.path.join(cache_dir, name))
+            except OSError as exc:
+                # Only costs a re-encode next time.
+                self.logger.warning("Unable to cache segment %s: %s", name, exc)
+                failed.add(name)
+        self._pending_segments = []
+        if failed and self.render_manifest is not None:
+            self.render_manifest["segments"] = [
+                entry
+                for entry in self.render_manifest["segments"]
+                if not failed.intersection(entry["files"])
+            ]
+
+    @staticmethod
+    def _manifest_entry(
+        key: str, segment: Segment, files: List[str], part_ids: List[Any]
+    ) -> Dict[str, Any]:
+        return {
+            "key": key,
+            "files": [os.path.basename(path) for path in files],
+            "parts": [
+                part_ids[part.index] if part.index < len(part_ids) else part.index
+                for part in segment.parts
+            ],
+            "method": segment.method,
+            "duration": round(segment.duration, 3),
+        }
+
+    def _prune_segment_cache(self) -> None:
+        """Drop cached segments the current manifest no longer uses."""
+        cache_dir = (self.processing_data.get("segment_cache") or {}).get("dir")
+        if not cache_dir or self.render_manifest is None:
+            return
+        keep = {name for entry in self.render_manifest["segments"] for name in entry["files"]}
+        for name in os.listdir(cache_dir):
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+
+    def _scratch_estimate(self, plan: RenderPlan, reusable: Dict[int, List[str]]) -> int:
+        """Bytes of the segments this render encodes into its scratch folder."""
+        # render_cost imports this module, so import it lazily.
+        from .render_cost import estimate_plan_cost
+
+        try:
+            estimate = estimate_plan_cost(plan, probe=probe_media)
+        except (OSError, RuntimeError):
+            # Unknown size: too big for RAM as far as admission is concerned.
+            return 1 << 62
+        # Reused segments are read from the cache and need no scratch space.
+        return sum(
+            segment["size_bytes"]
+            for number, segment in enumerate(estimate["segments"])
+            if number not in reusable
+        )
+
+    def _encode_rendition(self, kind: str, asset: Dict[str, Any], plan: RenderPlan, path: str) -> None:
+        os.makedirs(asset["renditions_dir"], exist_ok=True)
+        # A private partial per encode: workers racing on the same rendition
+        # each replace ``path`` with a complete file.
+        fd, partial = tempfile.mkstemp(
+            prefix=os.path.basename(path)[: -len(".mp4")] + ".",
+            suffix=".partial.mp4",
+            dir=asset["renditions_dir"],
+        )
+        os.close(fd)
+        try:
+            cmd = rendition_command(
+                asset["source_path"],
+                float(asset["duration"]),
+                bool(asset.get("has_audio")),
+                plan.profile,
+                plan.has_audio,
+                partial,
+            )
+            result = self._run(cmd, f"{kind} rendition")
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg {kind} rendition failed: {result.stderr[-500:]}")
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        self.logger.info("Encoded %s rendition %s", kind, path)
+
+    def _brand_clips(
+        self, plan: RenderPlan
+    ) -> Tuple[Optional[Tuple[str, float]], Optional[Tuple[str, float]], bool]:
+        """(path, duration) of the intro and outro renditions for ``plan``.
+
+        The last item is False when a rendition's stream signature differs
+        from the encoder's, so the final concat must re-encode.
+        """
+        brand = self.processing_data.get("brand") or {}
+        signature = encoder_signature(plan.profile)
+        copy_safe = True
+        clips = []
+        for kind in ("intro", "outro"):
+            asset = brand.get(kind)
+            if not asset:
+                clips.append(None)
+                continue
+            key = plan.profile.rendition_key(plan.has_audio)
+            path = os.path.join(asset["renditions_dir"], f"{key}.mp4")
+            if not os.path.isfile(path):
+                # First reel with this profile: encode once, keep for the rest.
+                self._encode_rendition(kind, asset, plan, path)
+            elif signature is not None and probe_media(path).stream_signature != signature:
+                # Encoded by an older ffmpeg/x264 build.
+                self.logger.info("Re-encoding stale %s rendition %s", kind, path)
+                self._encode_rendition(kind, asset, plan, path)
+            if signature is None or probe_media(path).stream_signature != signature:
+                copy_safe = False
+            clips.append((path, float(asset["duration"])))
+        return clips[0], clips[1], copy_safe
+
+    def _finalize(
+        self,
+        files: List[str],
+        plan: RenderPlan,
+        scratch_dir: str,
+        output_path: str,
+        cover_skip: float = 0.0,
+        copy: bool = True,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        concat_list_path = os.path.join(scratch_dir, "concat_list.txt")
+        with open(concat_list_path, "w") as concat_file:
+            for path in files:
+                safe_path = os.path.abspath(path).replace("'", "\\'")
+                concat_file.write(f"file '{safe_path}'\n")
+
+        # Cover frame and animated preview come out of the same concat pass
+        cover_path, preview_path = cover_paths_for(output_path)
+        extra_outputs = cover_output_args(cover_path, preview_path, cover_skip)
+        concat_input = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list_path]
+        copy_cmd = concat_input + ["-c", "copy", *FASTSTART_ARGS, output_path]
+        result = None
+        if copy:
+            result = self._run(copy_cmd + extra_outputs, "concat")
+            if result.returncode != 0 and extra_outputs:
+                self.logger.warning("ffmpeg concat with cover outputs failed. Retrying without them.")
+                cover_path = preview_path = None
+                result = self._run(copy_cmd, "concat")
+        if result is None or result.returncode != 0:
+            cover_path = preview_path = None
+            if result is not None:
+                self.logger.warning("ffmpeg concat failed. Falling back to re-encode.")
+            reencode_cmd = concat_input + [
+                *(audio_encoder_args() if plan.has_audio else ["-an"]),
+                *plan.profile.encoder_args(),
+                *_thread_args(),
+                *FASTSTART_ARGS,
+                output_path,
+            ]
+            result = self._run(reencode_cmd, "concat re-encode")
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg re-encode failed: {result.stderr[-500:]}")
+        return cover_path, preview_path
+
+    def _plan(self) -> RenderPlan:
+        return plan_render(
+            parts_from_payload(self.processing_data),
+            mode=self.mode,
+            overlay=overlay_from_payload(self.processing_data),
+            audio=audio_from_payload(self.processing_data),
+        )
+
+    def process_and_create_output(self) -> bool:
+        if not self.processing_data:
+            self.logger.error("Invalid processing data in JSON file. Can't continue.")
+            return False
+
+        scratch_dir = None
+        started = time.monotonic()
+        cpu_start = _child_cpu_seconds()
+        try:
+            try:
+                os.nice(10)
+            except Exception:
+                pass
+
+            output_path = os.path.join(OUTPUT_FOLDER, self.processing_data["output_file_name"])
+            plan = self._plan()
+            self.plan = plan
+            self.logger.info(
+                "Render plan mode=%s segments=%s",
+                plan.mode,
+                [(s.method, [p.index for p in s.parts]) for s in plan.segments],
+            )
+
+            reusable = self._reusable_segments(plan)
+            scratch_dir, scratch_kind = allocate_scratch(
+                self._scratch_estimate(plan, reusable), SCRATCH_FOLDER
+            )
+            self.logger.info("Scratch folder (%s): %s", scratch_kind, scratch_dir)
+            files = self._render_segments(plan, scratch_dir, reusable)
+            intro, outro, copy_safe = self._brand_clips(plan)
+            if not copy_safe:
+                self.logger.warning("Brand rendition does not match the encoder; concat will re-encode.")
+            intro_seconds = intro[1] if intro else 0.0
+            files = ([intro[0]] if intro else []) + files + ([outro[0]] if outro else [])
+            cover_path, preview_path = self._finalize(
+                files, plan, scratch_dir, output_path, intro_seconds, copy=copy_safe
+            )
+            self._store_segments()
+            self._prune_segment_cache()
+
+            size_bytes = os.path.getsize(output_path)
+            brand_seconds = intro_seconds + (outro[1] if outro else 0.0)
+            duration = plan.duration + brand_seconds
+            self.render_info = {
+                "engine": self.engine_name,
+                "mode": plan.mode,
+                "duration_seconds": duration,
+                "size_bytes": size_bytes,
+                "bit_rate": int(size_bytes * 8 / duration) if duration else None,
+                "width": plan.profile.width,
+                "height": plan.profile.height,
+                "fps": plan.profile.fps,
+                "preset": plan.profile.preset,
+                "segment_methods": [segment.method for segment in plan.segments],
+                "segments": [
+                    {
+                        "method": segment.method,
+                        "duration": round(segment.duration, 3),
+                        "cpu_seconds": round(cpu, 3),
+                        "reused": reused,
+                    }
+                    for segment, cpu, reused in zip(
+                        plan.segments, self.segment_cpu, self.segment_reused
+                    )
+                ],
+                "segments_reused": sum(self.segment_reused),
+                "brand_seconds": round(brand_seconds, 3),
+                # Only what was encoded: reused segments take no render time.
+                "input_seconds": round(
+                    sum(
+                        part.duration
+                        for segment, reused in zip(plan.segments, self.segment_reused)
+                        if not reused
+                        for part in segment.parts
+                    ),
+                    3,
+                ),
+                "part_count": len(plan.parts),
+                "scratch": scratch_kind,
+                "cpu_seconds": round(_child_cpu_seconds() - cpu_start, 3),
+                "wall_seconds": round(time.monotonic() - started, 3),
+                "has_audio": plan.has_audio,
+                "cover_path": cover_path if cover_path and os.path.exists(cover_path) else None,
+                "preview_path": preview_path if preview_path and os.path.exists(preview_path) else None,
+            }
+            return True
+        except Exception as exc:
+            self.last_error = exc
+            self.logger.exception("Exception in process_and_create_output: %s", exc)
+            return False
+        finally:
+            release_scratch(scratch_dir)
@@ -0,0 +1,149 @@
+"""Render time predictions from ``render_stats`` history.
+
+Each worker host gets its own line per engine and mode, fitted with least
+squares: ``wall seconds = overhead + rate * input seconds``, where input
+seconds are the trimmed source time the render encodes. Segments reused from
+the segment cache are left out, and a fully reused render records none. The
+API does not know which host will take a job, so predictions use the
+sample-weighted average of the hosts that have history for that engine/mode,
+then the engine over all modes, then conservative defaults.
+
+Queue waits add up the predicted time of the videos ahead in the lane and the
+remaining time of the ones being rendered, spread over the lane's workers.
+Callers pass in the documents; nothing here queries Mongo or Redis.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+ETA_HISTORY = int(os.getenv("VIDEO_ETA_HISTORY", "200"))
+# Video worker processes consuming the video lane across all hosts.
+VIDEO_WORKER_COUNT = max(1, int(os.getenv("VIDEO_WORKER_COUNT", "1")))
+
+# Wall seconds per input second until a host has history.
+DEFAULT_RATES = {"ffmpeg": 1.0, "ffmpeg_slideshow": 0.3, "moviepy": 3.0}
+DEFAULT_OVERHEAD_SECONDS = 5.0
+# Fewer renders than this and a host's line is not trusted.
+MIN_SAMPLES = 3
+
+
+@dataclass(frozen=True)
+class ThroughputModel:
+    overhead_seconds: float
+    seconds_per_input_second: float
+    samples: int
+
+    def predict(self, input_seconds: float) -> float:
+        return self.overhead_seconds + self.seconds_per_input_second * max(0.0, input_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "overhead_seconds": round(self.overhead_seconds, 2),
+            "seconds_per_input_second": round(self.seconds_per_input_second, 4),
+            "samples": self.samples,
+        }
+
+
+def fit_line(points: List[Tuple[float, float]]) -> ThroughputModel:
+    """Least-squares ``y = a + b * x``; through the origin if x barely varies."""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x > 1e-6 and n >= 2:
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+        intercept = mean_y - slope * mean_x
+        if slope > 0 and intercept >= 0:
+            return ThroughputModel(intercept, slope, n)
+    # Degenerate or nonsensical fit: a plain ratio is more robust.
+    total_x = sum(x for x, _ in points)
+    ratio = sum(y for _, y in points) / total_x if total_x > 0 else 0.0
+    return ThroughputModel(0.0, ratio, n)
+
+
+def fit_throughput_models(
+    docs: Iterable[Dict[str, Any]],
+) -> Dict[str, Dict[str, ThroughputModel]]:
+    """Per host, a model per ``engine:mode`` and per ``engine``."""
+    points: Dict[str, Dict[str, List[Tuple[float, float]]]] = {}
+    for doc in docs:
+        input_seconds, wall = doc.get("input_seconds"), doc.get("wall_seconds")
+        if not input_seconds or not wall:
+            continue
+        host = points.setdefault(doc.get("host") or "unknown", {})
+        engine = doc.get("engine") or "ffmpeg"
+        for key in (f"{engine}:{doc.get('mode')}", engine):
+            host.setdefault(key, []).append((float(input_seconds), float(wall)))
+    return {
+        host: {key: fit_line(values) for key, values in keys.items() if len(values) >= MIN_SAMPLES}
+        for host, keys in points.items()
+    }
+
+
+def _fleet_model(
+    models: Dict[str, Dict[str, ThroughputModel]], key: str
+) -> Optional[ThroughputModel]:
+    fitted = [host_models[key] for host_models in models.values() if key in host_models]
+    samples = sum(model.samples for model in fitted)
+    if not samples:
+        return None
+    return ThroughputModel(
+        sum(m.overhead_seconds * m.samples for m in fitted) / samples,
+        sum(m.seconds_per_input_second * m.samples for m in fitted) / samples,
+        samples,
+    )
+
+
+def predict_render_seconds(
+    models: Dict[str, Dict[str, ThroughputModel]],
+    engine: str,
+    mode: Optional[str],
+    input_seconds: float,
+) -> Tuple[float, str]:
+    """Predicted wall seconds and what the prediction is based on."""
+    for key in (f"{engine}:{mode}", engine):
+        model = _fleet_model(models, key)
+        if model is not None:
+            return model.predict(input_seconds), f"history:{key}"
+    rate = DEFAULT_RATES.get(engine, DEFAULT_RATES["ffmpeg"])
+    return DEFAULT_OVERHEAD_SECONDS + rate * input_seconds, "default"
+
+
+def input_seconds(payload: Dict[str, Any], default_slide_seconds: float) -> float:
+    """Trimmed source seconds a render payload reads."""
+    slideshow = payload.get("slideshow")
+    if slideshow:
+        seconds = float(slideshow.get("slide_seconds") or default_slide_seconds)
+        return seconds * len(slideshow.get("slides") or [])
+    return sum(
+        max(0.0, float(trim["end"]) - float(trim["start"]))
+        for trim in (payload.get("durations") or {}).values()
+    )
+
+
+def lane_wait_seconds(
+    queued: Iterable[Dict[str, Any]],
+    running: Iterable[Dict[str, Any]],
+    now: datetime,
+    workers: int = VIDEO_WORKER_COUNT,
+    fallback_seconds: float = DEFAULT_OVERHEAD_SECONDS,
+) -> float:
+    """Seconds until a worker frees up for a job queued behind ``queued``.
+
+    Documents carry ``eta_render_seconds``; running ones also ``started_at``.
+    """
+    work = sum(doc.get("eta_render_seconds") or fallback_seconds for doc in queued)
+    for doc in running:
+        predicted = doc.get("eta_render_seconds") or fallback_seconds
+        started = doc.get("started_at")
+        elapsed = (now - started).total_seconds() if started else 0.0
+        work += max(0.0, predicted - elapsed)
+    return work / max(1, workers)
@@ -0,0 +1,162 @@
+"""Worker payloads for the render engines.
+
+The video worker writes these to a JSON file for the renderer; the API
+builds the same payload to plan a render without running it. Collections are
+passed in by name, as in ``brand_assets``, so this module stays free of the
+``models`` package and loads under either import root.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .audio_mix import KEEP_PART_AUDIO
+from .render_engine import INPUT_FOLDER
+from .slideshow import slides_for_quotes
+
+
+def parse_hms(value: str) -> float:
+    parts = value.split(":")
+    if len(parts) != 3:
+        raise ValueError("Invalid time format")
+    hours, minutes, seconds = parts
+    h = int(hours)
+    m = int(minutes)
+    s = int(seconds)
+    if h < 0 or m < 0 or s < 0 or m > 59 or s > 59:
+        raise ValueError("Invalid time format")
+    return float(h * 3600 + m * 60 + s)
+
+
+def resolve_voice_path(
+    db: Any, collection: str, video: Dict[str, Any]
+) -> Optional[str]:
+    """Narration file of the video's voice clone job, or None without one.
+
+    ValueError if the job is missing or has not finished.
+    """
+    job_id = video.get("voice_clone_job_id")
+    if not job_id:
+        return None
+    job = db[collection].find_one(
+        {"job_id": job_id}, {"_id": 0, "status": 1, "result_path": 1}
+    )
+    if job is None:
+        raise ValueError(f"Voice clone job not found: {job_id}")
+    if job.get("status") != "completed" or not job.get("result_path"):
+        raise ValueError(f"Voice clone job {job_id} has no completed narration")
+    return job["result_path"]
+
+
+def _audio_section(
+    video: Dict[str, Any], voice_path: Optional[str], keep_audio: Dict[str, bool]
+) -> Dict[str, Any]:
+    return {
+        "keep": keep_audio,
+        "voice_path": voice_path,
+        "music_path": video.get("music_file_location"),
+        "music_volume": video.get("music_volume"),
+        "duck": video.get("duck_music", True),
+    }
+
+
+def build_processing_payload(
+    parts: List[Dict[str, Any]],
+    output_name: str,
+    video: Dict[str, Any],
+    voice_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    inputs: List[str] = []
+    part_ids: List[Any] = []
+    durations: Dict[str, Dict[str, float]] = {}
+    transitions: Dict[str, Dict[str, Any]] = {}
+    keep_audio: Dict[str, bool] = {}
+    for index, part in enumerate(parts):
+        inputs.append(part["file_location"])
+        part_ids.append(part.get("video_parts_id"))
+        durations[str(index)] = {
+            "start": parse_hms(part["start_time"]),
+            "end": parse_hms(part["end_time"]),
+        }
+        if part.get("transition") or part.get("transition_duration") is not None:
+            transitions[str(index)] = {
+                "name": part.get("transition"),
+                "duration": part.get("transition_duration"),
+            }
+        if part.get("keep_audio") is not None:
+            keep_audio[str(index)] = bool(part["keep_audio"])
+    return {
+        "inputs": inputs,
+        "part_ids": part_ids,
+        "durations": durations,
+        "transitions": transitions,
+        "overlay": {
+            "template": video.get("overlay_template"),
+            "captions": video.get("captions") or [],
+        },
+        "audio": _audio_section(video, voice_path, keep_audio),
+        "output_file_name": output_name,
+    }
+
+
+def build_slideshow_payload(
+    quote: Dict[str, Any],
+    output_name: str,
+    video: Dict[str, Any],
+    voice_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    slides = slides_for_quotes(quote)
+    if not slides:
+        raise ValueError(f"No quote images for {quote.get('code')}")
+    return {
+        "inputs": [],
+        "slideshow": {
+            "slides": slides,
+            "slide_seconds": video.get("slide_seconds"),
+            "transition": video.get("slide_transition"),
+        },
+        "overlay": {
+            # Quote images already carry the tagline.
+            "template": video.get("overlay_template") or "none",
+            "captions": video.get("captions") or [],
+        },
+        "audio": _audio_section(video, voice_path, {}),
+        "output_file_name": output_name,
+    }
+
+
+def audible_sources(payload: Dict[str, Any]) -> List[Tuple[str, str, Optional[int]]]:
+    """Return (kind, path, part index) for every source whose audio is heard."""
+    audio = payload.get("audio") or {}
+    keep = audio.get("keep") or {}
+    sources: List[Tuple[str, str, Optional[int]]] = []
+    for index, file_name in enumerate(payload.get("inputs") or []):
+        if keep.get(str(index), KEEP_PART_AUDIO):
+            sources.append(("part", os.path.join(INPUT_FOLDER, file_name), index))
+    if audio.get("voice_path"):
+        sources.append(("voice_clone", audio["voice_path"], None))
+    if audio.get("music_path"):
+        sources.append(("music", audio["music_path"], None))
+    return sources
+
+
+def apply_loudness_gains(
+    payload: Dict[str, Any], gain_for: Callable[[str, str, Optional[int]], float]
+) -> None:
+    """Store the normalization gain of every audible source in ``payload``.
+
+    ``gain_for(kind, path, part_index)`` supplies each gain: the worker
+    measures on a cache miss, the plan endpoint only reads the cache.
+    """
+    audio = payload["audio"]
+    gains: Dict[str, float] = {}
+    for kind, path, index in audible_sources(payload):
+        gain = gain_for(kind, path, index)
+        if kind == "voice_clone":
+            audio["voice_gain_db"] = gain
+        elif kind == "music":
+            audio["music_gain_db"] = gain
+        elif gain:
+            gains[str(index)] = gain
+    audio["gains"] = gains
@@ -0,0 +1,132 @@
+"""Scratch folders for render intermediates, in RAM when they fit.
+
+Segments and concat lists are written once and read back once, so keeping
+them off the disk that holds uploads and outputs removes most of a render's
+I/O contention. With ``VIDEO_SCRATCH_RAM_DIR`` set (e.g. ``/dev/shm/reels``)
+a render gets its scratch folder there when its estimated intermediate size,
+plus what other renders on the node have reserved, fits in the RAM budget.
+Otherwise it falls back to the on-disk scratch folder.
+
+Reservations live in a small ledger next to the RAM folders, guarded by an
+``flock``, so several worker processes on one node share the budget. Entries
+of processes that no longer exist are dropped along with their folders.
+Only relative imports, like the render engine that uses it.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+_MB = 1024 * 1024
+
+SCRATCH_RAM_DIR = os.getenv("VIDEO_SCRATCH_RAM_DIR", "").strip()
+# Upper bound on what renders may keep in RAM; 0 means only free space counts.
+SCRATCH_RAM_BUDGET_BYTES = int(float(os.getenv("VIDEO_SCRATCH_RAM_BUDGET_MB", "0")) * _MB)
+# Always leave this much of the tmpfs free for the rest of the system.
+SCRATCH_RAM_HEADROOM_BYTES = int(float(os.getenv("VIDEO_SCRATCH_RAM_HEADROOM_MB", "512")) * _MB)
+# Estimates are rough; reserve this multiple of them.
+SCRATCH_ESTIMATE_FACTOR = float(os.getenv("VIDEO_SCRATCH_ESTIMATE_FACTOR", "1.5"))
+
+_LEDGER_NAME = ".reservations.json"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _ledger(ram_dir: str) -> Iterator[Dict[str, Dict[str, int]]]:
+    """Locked read-modify-write of the reservation ledger."""
+    os.makedirs(ram_dir, exist_ok=True)
+    path = os.path.join(ram_dir, _LEDGER_NAME)
+    with open(path, "a+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            handle.seek(0)
+            try:
+                entries = json.loads(handle.read() or "{}")
+            except ValueError:
+                entries = {}
+            for name, entry in list(entries.items()):
+                if not _pid_alive(int(entry.get("pid", 0))):
+                    # Left behind by a crashed render.
+                    shutil.rmtree(os.path.join(ram_dir, name), ignore_errors=True)
+                    del entries[name]
+            yield entries
+            handle.seek(0)
+            handle.truncate()
+            handle.write(json.dumps(entries))
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _ram_budget(ram_dir: str, reserved: int) -> int:
+    free = shutil.disk_usage(ram_dir).free - SCRATCH_RAM_HEADROOM_BYTES
+    if SCRATCH_RAM_BUDGET_BYTES:
+        free = min(free, SCRATCH_RAM_BUDGET_BYTES - reserved)
+    return free
+
+
+def allocate_scratch(
+    estimated_bytes: int, disk_root: str, ram_dir: str = SCRATCH_RAM_DIR
+) -> Tuple[str, str]:
+    """Create a scratch folder; return (path, "ram" or "disk")."""
+    if ram_dir:
+        needed = int(estimated_bytes * SCRATCH_ESTIMATE_FACTOR)
+        try:
+            with _ledger(ram_dir) as entries:
+                # Free space already counts what reserved renders have written.
+                outstanding = 0
+                for name, entry in entries.items():
+                    written = _folder_bytes(os.path.join(ram_dir, name))
+                    outstanding += max(0, entry["bytes"] - written)
+                reserved = sum(entry["bytes"] for entry in entries.values())
+                if needed <= _ram_budget(ram_dir, reserved) - outstanding:
+                    path = tempfile.mkdtemp(prefix="render_", dir=ram_dir)
+                    entries[os.path.basename(path)] = {"bytes": needed, "pid": os.getpid()}
+                    return path, "ram"
+        except OSError:
+            # No usable tmpfs; the disk always works.
+            pass
+    os.makedirs(disk_root, exist_ok=True)
+    return tempfile.mkdtemp(prefix="render_", dir=disk_root), "disk"
+
+
+def release_scratch(path: Optional[str], ram_dir: str = SCRATCH_RAM_DIR) -> None:
+    """Delete a scratch folder and drop its reservation."""
+    if not path:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+    if ram_dir and os.path.dirname(os.path.abspath(path)) == os.path.abspath(ram_dir):
+        try:
+            with _ledger(ram_dir) as entries:
+                entries.pop(os.path.basename(path), None)
+        except OSError:
+            pass
+
+
+def _folder_bytes(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+    return total
@@ -0,0 +1,116 @@
+"""Still-image slideshow reels built from quote images.
+
+``BaseImageCreator`` leaves a ``{code}_base.png`` portrait in the sketch
+folder and one JPEG per quote in the output folder. This module turns them
+into a reel with the ffmpeg render engine, tuned for pictures that do not
+move:
+
+* every slide is a looped image input read at the output frame rate, so the
+  decoder produces only the frames that are encoded;
+* the output frame rate is low (``VIDEO_SLIDESHOW_FPS``) and x264 runs with
+  ``-tune stillimage`` and a fast preset;
+* transitions come from the same catalog as clip reels. At this frame rate
+  an ``xfade`` only touches a handful of frames.
+
+The whole reel is a single filter graph, including any overlay and voice or
+music mix. Like ``render_engine`` this module only uses relative imports.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+from .audio_mix import audio_from_payload
+from .media_probe import probe_media
+from .overlays import overlay_from_payload
+from .render_engine import (
+    TARGET_WIDTH,
+    FFmpegRenderEngine,
+    RenderPart,
+    RenderPlan,
+    Segment,
+    profile_for,
+    resolve_links,
+)
+
+load_dotenv(find_dotenv())
+
+SLIDESHOW_FPS = float(os.getenv("VIDEO_SLIDESHOW_FPS", "12"))
+SLIDE_SECONDS = float(os.getenv("VIDEO_SLIDE_SECONDS", "4"))
+SLIDESHOW_TRANSITION = os.getenv("VIDEO_SLIDESHOW_TRANSITION", "crossfade")
+SLIDESHOW_X264_PRESET = os.getenv("VIDEO_SLIDESHOW_X264_PRESET", "veryfast")
+SKETCH_IMAGES_FOLDER = os.getenv("SKETCH_IMAGES_FOLDER", "")
+
+VIDEO_TYPES = ("clips", "quote_slideshow")
+
+
+def slides_for_quotes(
+    quote_doc: Dict[str, Any], sketch_folder: Optional[str] = None
+) -> List[str]:
+    """Return the ``_base.png`` portrait (when present) and the quote images."""
+    slides: List[str] = []
+    folder = SKETCH_IMAGES_FOLDER if sketch_folder is None else sketch_folder
+    code = quote_doc.get("code")
+    if folder and code:
+        base_path = os.path.join(folder, f"{code}_base.png")
+        if os.path.isfile(base_path):
+            slides.append(base_path)
+    for path in (quote_doc.get("quote_image_paths") or "").split("|"):
+        path = path.strip()
+        if path:
+            slides.append(path)
+    return slides
+
+
+def plan_slideshow(
+    payload: Dict[str, Any], width: int = TARGET_WIDTH
+) -> RenderPlan:
+    """Single-pass render plan for the ``slideshow`` section of ``payload``."""
+    slideshow = payload.get("slideshow") or {}
+    slides = [path for path in slideshow.get("slides", []) if os.path.isfile(path)]
+    if not slides:
+        raise ValueError("No slide images to render")
+    seconds = float(slideshow.get("slide_seconds") or SLIDE_SECONDS)
+    transition = slideshow.get("transition") or SLIDESHOW_TRANSITION
+    parts = [
+        RenderPart(
+            index=index,
+            path=path,
+            start=0.0,
+            end=seconds,
+            transition=transition,
+            transition_duration=slideshow.get("transition_duration"),
+            keep_audio=False,
+            still=True,
+        )
+        for index, path in enumerate(slides)
+    ]
+    profile = replace(
+        profile_for(probe_media(slides[0]), width),
+        fps=SLIDESHOW_FPS,
+        preset=SLIDESHOW_X264_PRESET,
+        tune="stillimage",
+    )
+    links = resolve_links(parts)
+    audio = audio_from_payload(payload)
+    return RenderPlan(
+        profile=profile,
+        mode="single_pass",
+        segments=[Segment(parts, links, "reencode", "still-image slideshow")],
+        overlay=overlay_from_payload(payload),
+        audio=audio,
+        has_audio=audio.mixes,
+    )
+
+
+class SlideshowRenderEngine(FFmpegRenderEngine):
+    """Render engine for ``quote_slideshow`` videos."""
+
+    engine_name = "ffmpeg_slideshow"
+
+    def _plan(self) -> RenderPlan:
+        return plan_slideshow(self.processing_data)
@@ -0,0 +1,180 @@
+"""Keyframe-aligned chunks of very long sources.
+
+Trimming a few seconds out of an hour-long recording makes ffmpeg (and
+MoviePy, which decodes from the nearest keyframe) seek through a large
+container on every part. With ``VIDEO_PRECHUNK`` enabled, long uploads are
+split once with stream copy into fixed-length chunks. The segment muxer only
+cuts on keyframes, so every chunk starts with one and nothing is re-encoded.
+
+The index is stored in ``media_chunks`` keyed like the loudness cache.
+Before rendering, each part whose source has an index is pointed at the one
+chunk its trim falls in, or at a small ``.ffconcat`` list of the chunks it
+spans, with the trim shifted to match. The render engines open those like
+any other input.
+
+Takes the database handle as an argument and only uses relative imports, so
+both the API and the workers can use it.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+from .media_probe import asset_key
+from .render_engine import INPUT_FOLDER
+
+load_dotenv(find_dotenv())
+
+PRECHUNK_ENABLED = os.getenv("VIDEO_PRECHUNK", "false").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PRECHUNK_MIN_SECONDS = float(os.getenv("VIDEO_PRECHUNK_MIN_SECONDS", "600"))
+PRECHUNK_SECONDS = float(os.getenv("VIDEO_PRECHUNK_SECONDS", "60"))
+CHUNKS_FOLDER = os.getenv("VIDEO_CHUNKS_LOCATION") or os.path.join(
+    os.getenv("UPLOAD_FILES_LOCATION", "./uploads"), "_chunks"
+)
+
+INDEX_FILE_NAME = "index.ffconcat"
+_CHUNK_EXTENSIONS = (".mp4", ".mov", ".m4v", ".mkv")
+
+
+def _write_ffconcat(path: Path, files: List[str]) -> None:
+    # Relative names keep the list valid under the demuxer's safe mode.
+    lines = ["ffconcat version 1.0"] + [f"file '{name}'" for name in files]
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+def split_source(
+    path: str, out_dir: str, chunk_seconds: float = PRECHUNK_SECONDS
+) -> List[Dict[str, Any]]:
+    """Split ``path`` into stream-copied chunks; return file/start/end entries."""
+    target = Path(out_dir)
+    building = target.with_name(target.name + ".partial")
+    shutil.rmtree(building, ignore_errors=True)
+    building.mkdir(parents=True)
+    suffix = Path(path).suffix.lower()
+    extension = suffix if suffix in _CHUNK_EXTENSIONS else ".mkv"
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", path,
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-c", "copy",
+        "-f", "segment",
+        "-segment_time", f"{chunk_seconds:g}",
+        "-reset_timestamps", "1",
+        "-segment_list", str(building / "chunks.csv"),
+        "-segment_list_type", "csv",
+        str(building / f"chunk_%05d{extension}"),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        shutil.rmtree(building, ignore_errors=True)
+        raise RuntimeError(f"ffmpeg chunking failed: {result.stderr.strip()[-300:]}")
+
+    chunks: List[Dict[str, Any]] = []
+    with (building / "chunks.csv").open(newline="") as handle:
+        for row in csv.reader(handle):
+            if len(row) < 3:
+                continue
+            chunks.append(
+                {"file": row[0], "start": round(float(row[1]), 3), "end": round(float(row[2]), 3)}
+            )
+    if not chunks:
+        shutil.rmtree(building, ignore_errors=True)
+        raise RuntimeError(f"ffmpeg produced no chunks for {path}")
+    _write_ffconcat(building / INDEX_FILE_NAME, [chunk["file"] for chunk in chunks])
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(building, target)
+    return chunks
+
+
+def chunks_for_range(
+    chunks: List[Dict[str, Any]], start: float, end: float
+) -> List[int]:
+    """Positions of the chunks that overlap ``[start, end)``."""
+    return [
+        position
+        for position, chunk in enumerate(chunks)
+        if chunk["end"] > start and chunk["start"] < end
+    ]
+
+
+def chunked_input(
+    index: Dict[str, Any], start: float, end: float, create: bool = True
+) -> Optional[Dict[str, Any]]:
+    """Return the path and shifted trim to read ``[start, end)`` from chunks.
+
+    With ``create=False`` no list is written, and a span whose list does not
+    exist yet returns None.
+    """
+    chunks = index.get("chunks") or []
+    positions = chunks_for_range(chunks, start, end)
+    if not positions:
+        return None
+    chunk_dir = Path(index["index_path"]).parent
+    first, last = positions[0], positions[-1]
+    if first == last:
+        path = chunk_dir / chunks[first]["file"]
+    else:
+        # Deterministic name, so concurrent renders share one list.
+        path = chunk_dir / f"range_{first:05d}_{last:05d}.ffconcat"
+        if create and not path.exists():
+            _write_ffconcat(path, [chunk["file"] for chunk in chunks[first : last + 1]])
+    if not path.exists():
+        return None
+    offset = chunks[first]["start"]
+    return {
+        "path": str(path),
+        "start": round(max(0.0, start - offset), 3),
+        "end": round(end - offset, 3),
+    }
+
+
+def chunk_indexes(db: Any, collection: str, payload: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    """Stored chunk indexes for the payload's inputs, by part index."""
+    indexes: Dict[int, Dict[str, Any]] = {}
+    for position, file_name in enumerate(payload.get("inputs") or []):
+        path = os.path.join(INPUT_FOLDER, file_name)
+        if not os.path.isfile(path):
+            continue
+        key, _, _ = asset_key(path)
+        doc = db[collection].find_one({"asset_key": key}, {"_id": 0})
+        if doc is not None and os.path.isfile(doc.get("index_path") or ""):
+            indexes[position] = doc
+    return indexes
+
+
+def apply_chunk_index(
+    payload: Dict[str, Any], indexes: Dict[int, Dict[str, Any]], create: bool = True
+) -> List[int]:
+    """Point chunked parts of ``payload`` at their chunks; return their indexes.
+
+    Dry runs pass ``create=False``: parts spanning chunks without a range list
+    stay on the original source instead of writing one.
+    """
+    inputs = payload.get("inputs") or []
+    durations = payload.get("durations") or {}
+    swapped: List[int] = []
+    for position, index in sorted(indexes.items()):
+        trim = durations.get(str(position))
+        if not trim or position >= len(inputs):
+            continue
+        chunked = chunked_input(index, float(trim["start"]), float(trim["end"]), create)
+        if chunked is None:
+            continue
+        inputs[position] = chunked["path"]
+        durations[str(position)] = {"start": chunked["start"], "end": chunked["end"]}
+        swapped.append(position)
+    return swapped
@@ -0,0 +1,332 @@
+"""Disk-space management for uploads, outputs, scratch, segment cache and voice clones.
+
+Each storage area has an optional quota. Files referenced from Mongo are never
+touched; unreferenced files are deleted once they are older than the area's
+orphan grace period, and evicted least-recently-used first whenever an area is
+over quota.
+
+This module is imported by both the API and the workers, so it takes the
+database handle as an argument instead of importing ``backend.db``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+_MB = 1024 * 1024
+_HOUR = 3600.0
+
+# (collection, field, separator) triples pointing at files on disk.
+REFERENCE_FIELDS: List[Tuple[str, str, Optional[str]]] = [
+    ("videos", "output_file_location", None),
+    ("videos", "hls_playlist_location", None),
+    ("videos", "cover_file_location", None),
+    ("videos", "preview_file_location", None),
+    ("videos", "music_file_location", None),
+    ("video_parts", "file_location", None),
+    ("voice_clone_job", "result_path", None),
+    ("voice_clone_job", "ref_audio_path", None),
+    ("quotes", "quote_image_paths", "|"),
+    ("media_chunks", "index_path", None),
+    ("brand_assets", "source_path", None),
+    ("brand_assets", "renditions_dir", None),
+]
+
+
+def _env_quota(name: str) -> Optional[int]:
+    value = os.getenv(name, "").strip()
+    if not value:
+        return None
+    return int(float(value) * _MB)
+
+
+def _env_hours(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default))) * _HOUR
+
+
+def _normalize(path: Any) -> str:
+    return str(Path(os.path.expanduser(str(path))).resolve())
+
+
+@dataclass
+class StorageArea:
+    name: str
+    path: Path
+    quota_bytes: Optional[int] = None
+    orphan_grace_seconds: float = 168 * _HOUR
+    min_evict_age_seconds: float = _HOUR
+
+
+@dataclass
+class StoredFile:
+    path: Path
+    size: int
+    last_access: float
+    modified: float
+
+
+def default_storage_areas() -> List[StorageArea]:
+    output_root = os.getenv("OUTPUT_FILES_LOCATION") or "./outputs"
+    orphan_grace = _env_hours("STORAGE_ORPHAN_GRACE_HOURS", 168)
+    min_age = float(os.getenv("STORAGE_MIN_EVICT_AGE_SECONDS", "3600"))
+    return [
+        StorageArea(
+            name="uploads",
+            path=Path(os.getenv("UPLOAD_FILES_LOCATION", "./uploads")),
+            quota_bytes=_env_quota("UPLOAD_QUOTA_MB"),
+            orphan_grace_seconds=orphan_grace,
+            min_evict_age_seconds=min_age,
+        ),
+        StorageArea(
+            name="outputs",
+            path=Path(output_root),
+            quota_bytes=_env_quota("OUTPUT_QUOTA_MB"),
+            orphan_grace_seconds=orphan_grace,
+            min_evict_age_seconds=min_age,
+        ),
+        StorageArea(
+            name="scratch",
+            path=Path(output_root) / "_tmp_segments",
+            quota_bytes=_env_quota("SCRATCH_QUOTA_MB"),
+            orphan_grace_seconds=_env_hours("SCRATCH_ORPHAN_GRACE_HOURS", 6),
+            min_evict_age_seconds=min_age,
+        ),
+        StorageArea(
+            name="segment_cache",
+            path=Path(output_root) / "_segment_cache",
+            quota_bytes=_env_quota("SEGMENT_CACHE_QUOTA_MB"),
+            orphan_grace_seconds=_env_hours("SEGMENT_CACHE_GRACE_HOURS", 72),
+            min_evict_age_seconds=min_age,
+        ),
+        StorageArea(
+            name="voice_clone",
+            path=Path(
+                os.getenv("VOICE_CLONE_OUTPUT_DIR", "./output_files/voice_clone")
+            ),
+            quota_bytes=_env_quota("VOICE_CLONE_QUOTA_MB"),
+            orphan_grace_seconds=orphan_grace,
+            min_evict_age_seconds=min_age,
+        ),
+    ]
+
+
+def _expand_reference(path: str) -> Set[str]:
+    # A referenced folder covers everything in it.
+    if Path(path).is_dir():
+        return {str(child) for child in Path(path).rglob("*") if child.is_file()}
+    # An HLS playlist references every init/segment file next to it, and a
+    # chunk index every chunk (and range list) next to it.
+    if path.endswith((".m3u8", ".ffconcat")):
+        parent = Path(path).parent
+        if parent.is_dir():
+            return {path} | {str(child) for child in parent.iterdir() if child.is_file()}
+    return {path}
+
+
+def delete_paths(
+    paths: Iterable[Any], logger: Optional[logging.Logger] = None
+) -> int:
+    """Delete the given files or directories, ignoring missing ones.
+
+    Returns the number of bytes freed.
+    """
+    freed = 0
+    for raw_path in paths:
+        if not raw_path:
+            continue
+        path = Path(str(raw_path))
+        try:
+            if path.is_dir():
+                size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+                shutil.rmtree(path)
+                freed += size
+            elif path.is_file():
+                size = path.stat().st_size
+                path.unlink()
+                freed += size
+        except Exception as exc:
+            if logger is not None:
+                logger.warning("Failed to delete file %s: %s", raw_path, exc)
+    return freed
+
+
+class StorageManager:
+    def __init__(
+        self,
+        db: Any,
+        areas: Optional[List[StorageArea]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.db = db
+        self.areas = areas if areas is not None else default_storage_areas()
+        self.logger = logger or logging.getLogger(__name__)
+
+    def referenced_paths(self) -> Set[str]:
+        """Return every file path referenced from Mongo, normalized."""
+        referenced: Set[str] = set()
+        for collection, field_name, separator in REFERENCE_FIELDS:
+            cursor = self.db[collection].find(
+                {field_name: {"$nin": [None, ""]}},
+                {field_name: 1, "_id": 0},
+            )
+            for doc in cursor:
+                value = doc.get(field_name)
+                values = value if isinstance(value, list) else [value]
+                for item in values:
+                    if not item:
+                        continue
+                    parts = str(item).split(separator) if separator else [item]
+                    for part in parts:
+                        part = str(part).strip()
+                        if part:
+                            referenced.update(_expand_reference(_normalize(part)))
+        return referenced
+
+    def _nested_roots(self, area: StorageArea) -> Set[str]:
+        root = _normalize(area.path)
+        nested = set()
+        for other in self.areas:
+            other_root = _normalize(other.path)
+            if other_root != root and other_root.startswith(root + os.sep):
+                nested.add(other_root)
+        return nested
+
+    def scan(self, area: StorageArea) -> List[StoredFile]:
+        root = Path(_normalize(area.path))
+        if not root.is_dir():
+            return []
+        skip = self._nested_roots(area)
+        files: List[StoredFile] = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                name for name in dirnames if str(Path(dirpath) / name) not in skip
+            ]
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files.append(
+                    StoredFile(
+                        path=path,
+                        size=stat.st_size,
+                        last_access=max(stat.st_atime, stat.st_mtime),
+                        modified=stat.st_mtime,
+                    )
+                )
+        return files
+
+    def find_orphans(
+        self, area: StorageArea, referenced: Optional[Set[str]] = None
+    ) -> List[StoredFile]:
+        referenced = referenced if referenced is not None else self.referenced_paths()
+        return [
+            stored
+            for stored in self.scan(area)
+            if str(stored.path) not in referenced
+        ]
+
+    def usage_report(self) -> List[Dict[str, Any]]:
+        referenced = self.referenced_paths()
+        report = []
+        for area in self.areas:
+            files = self.scan(area)
+            used = sum(stored.size for stored in files)
+            orphans = [f for f in files if str(f.path) not in referenced]
+            report.append(
+                {
+                    "area": area.name,
+                    "path": _normalize(area.path),
+                    "quota_bytes": area.quota_bytes,
+                    "used_bytes": used,
+                    "file_count": len(files),
+                    "orphan_count": len(orphans),
+                    "orphan_bytes": sum(f.size for f in orphans),
+                    "over_quota": bool(area.quota_bytes and used > area.quota_bytes),
+                }
+            )
+        return report
+
+    def collect_garbage(self, dry_run: bool = False) -> Dict[str, Dict[str, int]]:
+        """Delete expired orphans, then evict LRU orphans from areas over quota."""
+        referenced = self.referenced_paths()
+        now = time.time()
+        summary: Dict[str, Dict[str, int]] = {}
+
+        for area in self.areas:
+            files = self.scan(area)
+            used = sum(stored.size for stored in files)
+            orphans = sorted(
+                (f for f in files if str(f.path) not in referenced),
+                key=lambda stored: stored.last_access,
+            )
+
+            doomed: List[StoredFile] = [
+                f for f in orphans if now - f.modified >= area.orphan_grace_seconds
+            ]
+            remaining = used - sum(f.size for f in doomed)
+
+            if area.quota_bytes is not None and remaining > area.quota_bytes:
+                doomed_paths = {f.path for f in doomed}
+                for stored in orphans:
+                    if remaining <= area.quota_bytes:
+                        break
+                    if stored.path in doomed_paths:
+                        continue
+                    if now - stored.modified < area.min_evict_age_seconds:
+                        continue
+                    doomed.append(stored)
+                    remaining -= stored.size
+
+            freed = sum(f.size for f in doomed)
+            if not dry_run:
+                freed = delete_paths((f.path for f in doomed), self.logger)
+                self._prune_empty_dirs(area)
+
+            summary[area.name] = {
+                "used_bytes": used,
+                "deleted_files": len(doomed),
+                "freed_bytes": freed,
+            }
+            if remaining > (area.quota_bytes or remaining):
+                self.logger.warning(
+                    "Storage area %s still over quota: used=%s quota=%s",
+                    area.name,
+                    remaining,
+                    area.quota_bytes,
+                )
+            if doomed:
+                self.logger.info(
+                    "Storage GC %s: deleted=%s freed=%s dry_run=%s",
+                    area.name,
+                    len(doomed),
+                    freed,
+                    dry_run,
+                )
+        return summary
+
+    def _prune_empty_dirs(self, area: StorageArea) -> None:
+        root = Path(_normalize(area.path))
+        if not root.is_dir():
+            return
+        skip = self._nested_roots(area)
+        for dirpath, _, _ in sorted(os.walk(root), key=lambda e: len(e[0]), reverse=True):
+            path = Path(dirpath)
+            if path == root or str(path) in skip:
+                continue
+            try:
+                if not any(path.iterdir()):
+                    path.rmdir()
+            except OSError:
+                pass
@@ -0,0 +1,127 @@
+"""Transition catalog for the ffmpeg render engine.
+
+A transition is attached to a video part and describes how that part hands
+over to the next one. Overlapping transitions compile to ffmpeg ``xfade`` /
+``acrossfade`` filters; ``fade_out`` reproduces the legacy MoviePy
+``FadeOut(1)`` look with a plain ``fade`` filter and no overlap.
+
+This module is imported by both the API (for validation) and the workers, so
+it has no project imports.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+
+@dataclass(frozen=True)
+class TransitionSpec:
+    name: str
+    # xfade transition name; None for transitions without overlap.
+    xfade: Optional[str] = None
+    default_duration: float = 0.0
+    # Fade the outgoing part to black without overlapping the next one.
+    fade_out: bool = False
+    description: str = ""
+
+    @property
+    def overlaps(self) -> bool:
+        return self.xfade is not None
+
+
+TRANSITIONS: Dict[str, TransitionSpec] = {
+    spec.name: spec
+    for spec in (
+        TransitionSpec("cut", description="Hard cut, no filtering."),
+        TransitionSpec(
+            "fade_out",
+            default_duration=1.0,
+            fade_out=True,
+            description="Fade the part to black, then cut (legacy look).",
+        ),
+        TransitionSpec(
+            "crossfade",
+            xfade="fade",
+            default_duration=0.5,
+            description="Blend the two parts.",
+        ),
+        TransitionSpec(
+            "dip_to_black",
+            xfade="fadeblack",
+            default_duration=0.8,
+            description="Fade through black.",
+        ),
+        TransitionSpec(
+            "dip_to_white",
+            xfade="fadewhite",
+            default_duration=0.8,
+            description="Fade through white.",
+        ),
+        TransitionSpec("wipe_left", xfade="wipeleft", default_duration=0.5),
+        TransitionSpec("wipe_right", xfade="wiperight", default_duration=0.5),
+        TransitionSpec("wipe_up", xfade="wipeup", default_duration=0.5),
+        TransitionSpec("wipe_down", xfade="wipedown", default_duration=0.5),
+        TransitionSpec("slide_left", xfade="slideleft", default_duration=0.5),
+        TransitionSpec("slide_right", xfade="slideright", default_duration=0.5),
+    )
+}
+
+DEFAULT_TRANSITION = os.getenv("VIDEO_DEFAULT_TRANSITION", "fade_out").strip() or "fade_out"
+if DEFAULT_TRANSITION not in TRANSITIONS:
+    DEFAULT_TRANSITION = "fade_out"
+
+# Never let a transition eat more than this share of the shorter part.
+MAX_TRANSITION_SHARE = 0.5
+
+
+def transition_names() -> List[str]:
+    return list(TRANSITIONS)
+
+
+def get_transition(name: Optional[str]) -> TransitionSpec:
+    """Return the spec for ``name``; empty names use the configured default."""
+    key = (name or "").strip().lower() or DEFAULT_TRANSITION
+    try:
+        return TRANSITIONS[key]
+    except KeyError:
+        raise ValueError(
+            f"Unknown transition '{name}'. Expected one of: {', '.join(TRANSITIONS)}"
+        ) from None
+
+
+def resolve_duration(
+    spec: TransitionSpec,
+    requested: Optional[float],
+    outgoing_duration: float,
+    incoming_duration: Optional[float] = None,
+) -> float:
+    """Clamp the transition length to what the adjacent parts can carry."""
+    if spec.name == "cut":
+        return 0.0
+    duration = spec.default_duration if requested is None else float(requested)
+    limit = outgoing_duration
+    if spec.overlaps and incoming_duration is not None:
+        limit = min(limit, incoming_duration)
+    if spec.overlaps:
+        limit *= MAX_TRANSITION_SHARE
+    return max(0.0, min(duration, limit))
+
+
+def xfade_filter(spec: TransitionSpec, duration: float, offset: float) -> str:
+    return f"xfade=transition={spec.xfade}:duration={duration:.3f}:offset={offset:.3f}"
+
+
+def acrossfade_filter(duration: float) -> str:
+    # Equal-power curves keep perceived loudness flat across the overlap.
+    return f"acrossfade=d={duration:.3f}:c1=qsin:c2=qsin"
+
+
+def fade_out_filter(part_duration: float, duration: float) -> str:
+    start = max(0.0, part_duration - duration)
+    return f"fade=t=out:st={start:.3f}:d={duration:.3f}"
@@ -10,9 +10,14 @@
 
 from moviepy import *
 #import numpy as np
-import json,sys,os,subprocess
+import json,os,subprocess
 from config import *
 from backend.logger import get_logger
+from backend.objects.media_packaging import (
+    FASTSTART_ARGS,
+    cover_output_args,
+    cover_paths_for,
+)
 
 
 class VideoAutomation:
@@ -20,6 +25,8 @@ class VideoAutomation:
     def __init__(self, input_json_file):
         self.input_json_file = input_json_file
         self.processing_data = {}
+        self.last_error = None
+        self.render_info = {}
         self.logger = get_logger(name="instagram_reel_creation_video_automation")
 
     #this method creates the output video
@@ -60,6 +67,7 @@ class VideoAutomation:
             os.makedirs(temp_dir, exist_ok=True)
             temp_files = []
             concat_list_path = None
+            total_duration = 0.0
 
             # Process each input video according to durations
             # Process each input video according to durations
@@ -95,6 +103,7 @@ class VideoAutomation:
                     threads=ffmpeg_threads,
                     ffmpeg_params=ffmpeg_params,
                 )
+                total_duration += clip.duration or 0.0
                 clip.close()
                 temp_files.append(temp_file)
 
@@ -110,6 +119,9 @@ class VideoAutomation:
                     safe_path = os.path.abspath(temp_file).replace("'", "\\'")
                     concat_file.write(f"file '{safe_path}'\n")
 
+            # Cover frame and animated preview come out of the same concat pass
+            cover_path, preview_path = cover_paths_for(output_path)
+            extra_outputs = cover_output_args(cover_path, preview_path)
             ffmpeg_cmd = [
                 "ffmpeg",
                 "-y",
@@ -118,10 +130,16 @@ class VideoAutomation:
                 "-i", concat_list_path,
                 "-c", "copy",
                 "-threads", str(ffmpeg_threads),
+                *FASTSTART_ARGS,
                 output_path,
             ]
-            result = subprocess.run(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            result = subprocess.run(ffmpeg_cmd + extra_outputs, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0 and extra_outputs:
+                self.logger.warning("ffmpeg concat with cover outputs failed. Retrying without them.")
+                cover_path = preview_path = None
+                result = subprocess.run(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
             if result.returncode != 0:
+                cover_path = preview_path = None
                 self.logger.warning("ffmpeg concat failed. Falling back to re-encode.")
                 ffmpeg_cmd = [
                     "ffmpeg",
@@ -133,15 +151,33 @@ class VideoAutomation:
                     "-r", str(target_fps or 30),
                     "-an",
                     "-threads", str(ffmpeg_threads),
+                    *FASTSTART_ARGS,
                     output_path,
                 ]
                 result = subprocess.run(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
                 if result.returncode != 0:
                     self.logger.error("ffmpeg re-encode failed: %s", result.stderr)
+                    self.last_error = RuntimeError(
+                        f"ffmpeg re-encode failed: {result.stderr[-500:]}"
+                    )
                     return False
+
+            # Everything below is already known, so the worker can skip ffprobe
+            size_bytes = os.path.getsize(output_path)
+            self.render_info = {
+                "duration_seconds": total_duration,
+                "size_bytes": size_bytes,
+                "bit_rate": int(size_bytes * 8 / total_duration) if total_duration else None,
+                "width": target_size[0] if target_size else None,
+                "height": target_size[1] if target_size else None,
+                "fps": target_fps,
+                "cover_path": cover_path if cover_path and os.path.exists(cover_path) else None,
+                "preview_path": preview_path if preview_path and os.path.exists(preview_path) else None,
+            }
             return True
 
         except Exception as e:
+            self.last_error = e
             self.logger.exception("Exception in process_and_create_output: %s", str(e))
             return False
         finally:
@@ -181,22 +217,3 @@ class VideoAutomation:
         except Exception as e:
             self.logger.exception("Exception while reading video config: %s", str(e))
             return False
-
-"""if __name__ == "__main__":
-    
-    inputs = [ "d.json" ]
-
-    for input_json_file in inputs:
-        print(f"\n\nProcessing: {input_json_file}\n--------------------\n")
-        va = VideoAutomation(input_json_file)
-        read = va.read_video_config()
-
-        if not read:
-            print(f"Issue read or parsing config file: {input_json_file}")
-            sys.exit(1)
-        
-        created = va.process_and_create_output()
-
-        if not created:
-            print(f"Issue creating output file.")
-            sys.exit(1)"""
@@ -0,0 +1,249 @@
+"""Render a batch of reel configs offline, without the API or Redis.
+
+Takes a directory of render configs (``*.json``, the payload the video worker
+writes for the renderer) or a manifest listing them, and renders them with a
+bounded process pool:
+
+    python backend/scripts/render_batch.py configs/ --workers 3 --summary summary.json
+    python backend/scripts/render_batch.py batch.txt --engine moviepy
+
+A manifest is either a JSON list of config paths or a text file with one
+path per line; relative paths are resolved against the manifest's folder.
+
+Each successful render leaves ``<output>.fingerprint`` next to the output. It
+hashes the config, the engine and the size/mtime of every input file, so a
+re-run only renders configs whose output is missing or stale (``--force``
+renders everything). Configs are rendered as given; loudness gains and chunk
+substitution are not looked up in Mongo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running this file directly: `python backend/scripts/render_batch.py ...`
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BACKEND_ROOT = REPO_ROOT / "backend"
+for path in (REPO_ROOT, BACKEND_ROOT):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from backend.objects.render_engine import INPUT_FOLDER, OUTPUT_FOLDER, RENDER_ENGINE
+
+ENGINES = ("ffmpeg", "moviepy")
+FINGERPRINT_SUFFIX = ".fingerprint"
+# Bump when a renderer change should invalidate every stored fingerprint.
+FINGERPRINT_VERSION = 1
+
+
+def discover_configs(source: Path) -> List[Path]:
+    """Config files from a directory or a manifest, in a stable order."""
+    if source.is_dir():
+        return sorted(path for path in source.glob("*.json") if path.is_file())
+    text = source.read_text()
+    try:
+        entries = json.loads(text)
+    except ValueError:
+        entries = [line.strip() for line in text.splitlines()]
+    if not isinstance(entries, list):
+        raise ValueError(f"Manifest {source} must list config paths")
+    configs = []
+    for entry in entries:
+        entry = str(entry).strip()
+        if not entry or entry.startswith("#"):
+            continue
+        path = Path(entry)
+        configs.append(path if path.is_absolute() else source.parent / path)
+    return configs
+
+
+def _referenced_files(payload: Dict[str, Any]) -> List[str]:
+    files = [os.path.join(INPUT_FOLDER, name) for name in payload.get("inputs") or []]
+    files += list((payload.get("slideshow") or {}).get("slides") or [])
+    audio = payload.get("audio") or {}
+    files += [audio[key] for key in ("voice_path", "music_path") if audio.get(key)]
+    return files
+
+
+def fingerprint(payload: Dict[str, Any], engine: str, mode: Optional[str]) -> str:
+    """Hash of everything that decides what the output looks like."""
+    files = []
+    for path in _referenced_files(payload):
+        try:
+            stat = os.stat(path)
+            files.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            files.append([os.path.abspath(path), None, None])
+    raw = json.dumps(
+        {
+            "version": FINGERPRINT_VERSION,
+            "engine": engine,
+            "mode": mode,
+            "payload": payload,
+            "files": files,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _output_path(payload: Dict[str, Any]) -> str:
+    return os.path.join(OUTPUT_FOLDER, payload["output_file_name"])
+
+
+def is_up_to_date(output_path: str, digest: str) -> bool:
+    try:
+        stored = Path(output_path + FINGERPRINT_SUFFIX).read_text().strip()
+    except OSError:
+        return False
+    return stored == digest and os.path.exists(output_path)
+
+
+def _create_renderer(config_path: str, payload: Dict[str, Any], engine: str, mode: Optional[str]) -> Any:
+    if "slideshow" in payload:
+        from backend.objects.slideshow import SlideshowRenderEngine
+
+        return SlideshowRenderEngine(config_path)
+    if engine == "moviepy":
+        from backend.objects.video_automation import VideoAutomation
+
+        return VideoAutomation(config_path)
+    from backend.objects.render_engine import FFmpegRenderEngine
+
+    return FFmpegRenderEngine(config_path, mode=mode)
+
+
+def render_config(config_path: str, engine: str, mode: Optional[str], force: bool) -> Dict[str, Any]:
+    """Pool entry point: render one config unless its output is up to date."""
+    result: Dict[str, Any] = {"config": config_path}
+    started = time.monotonic()
+    try:
+        with open(config_path, "r") as handle:
+            payload = json.load(handle)
+        output_path = _output_path(payload)
+        result["output"] = output_path
+        digest = fingerprint(payload, engine, mode)
+        result["fingerprint"] = digest
+        if not force and is_up_to_date(output_path, digest):
+            result["status"] = "skipped"
+            return result
+
+        renderer = _create_renderer(os.path.abspath(config_path), payload, engine, mode)
+        if not renderer.read_video_config() or not renderer.process_and_create_output():
+            error = renderer.last_error
+            result["status"] = "failed"
+            result["error"] = str(error) if error else "render failed"
+            return result
+        if not os.path.exists(output_path):
+            result["status"] = "failed"
+            result["error"] = "output file was not created"
+            return result
+
+        Path(output_path + FINGERPRINT_SUFFIX).write_text(digest + "\n")
+        result["status"] = "rendered"
+        result["render_info"] = renderer.render_info or {}
+        return result
+    except Exception as exc:
+        result["status"] = "failed"
+        result["error"] = str(exc)
+        return result
+    finally:
+        result["wall_seconds"] = round(time.monotonic() - started, 3)
+
+
+def run_batch(
+    configs: List[Path], engine: str, mode: Optional[str], workers: int, force: bool
+) -> Dict[str, Any]:
+    started_at = datetime.utcnow()
+    started = time.monotonic()
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(render_config, str(path), engine, mode, force): path
+            for path in configs
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                # A worker process died (e.g. OOM-killed).
+                result = {"config": str(futures[future]), "status": "failed", "error": str(exc)}
+            results.append(result)
+            print(f"{result['status']}: {result['config']}", file=sys.stderr)
+    results.sort(key=lambda item: item["config"])
+    counts = {status: 0 for status in ("rendered", "skipped", "failed")}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.utcnow().isoformat(),
+        "wall_seconds": round(time.monotonic() - started, 3),
+        "engine": engine,
+        "mode": mode,
+        "workers": workers,
+        "counts": counts,
+        "results": results,
+    }
+
+
+def _positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return parsed
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Render a batch of reel configs offline.")
+    parser.add_argument("source", type=Path, help="Directory of *.json configs or a manifest.")
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+        help="Concurrent renders; each ffmpeg also uses VIDEO_FFMPEG_THREADS threads.",
+    )
+    parser.add_argument("--engine", choices=ENGINES, default=RENDER_ENGINE)
+    parser.add_argument("--mode", choices=("segmented", "single_pass"), default=None)
+    parser.add_argument("--force", action="store_true", help="Ignore stored fingerprints.")
+    parser.add_argument("--summary", type=Path, default=None, help="Write the JSON summary here.")
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    try:
+        configs = discover_configs(args.source)
+    except (OSError, ValueError) as exc:
+        print(f"Unable to read configs: {exc}", file=sys.stderr)
+        return 1
+    if not configs:
+        print(f"No render configs found in {args.source}", file=sys.stderr)
+        return 1
+
+    summary = run_batch(configs, args.engine, args.mode, args.workers, args.force)
+    text = json.dumps(summary, indent=2, default=str)
+    if args.summary is not None:
+        args.summary.write_text(text)
+    else:
+        print(text)
+    counts = summary["counts"]
+    print(
+        f"Batch summary: rendered={counts['rendered']},"
+        f" skipped={counts['skipped']}, failed={counts['failed']}",
+        file=sys.stderr,
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
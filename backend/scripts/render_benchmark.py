@@ -0,0 +1,334 @@
+"""Render throughput benchmarks with synthetic media.
+
+Generate sources once, run every engine/mode against them and compare the
+results with a stored baseline:
+
+    python backend/scripts/render_benchmark.py generate --out /tmp/bench_media
+    python backend/scripts/render_benchmark.py run --media /tmp/bench_media --out results.json
+    python backend/scripts/render_benchmark.py compare baseline.json results.json
+
+Sources are ffmpeg ``testsrc2`` video with a ``sine`` tone, encoded at
+several resolutions, GOP sizes and durations. Each case renders three equal
+parts of one source, either hard-cut (stream-copy friendly) or crossfaded.
+Every render runs in its own process so wall time, CPU time (including
+ffmpeg children) and peak RSS belong to that render alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running this file directly: `python backend/scripts/render_benchmark.py ...`
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BACKEND_ROOT = REPO_ROOT / "backend"
+for path in (REPO_ROOT, BACKEND_ROOT):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+DEFAULT_RESOLUTIONS = ["720x1280", "1080x1920", "1440x2560"]
+DEFAULT_GOPS = [30, 250]
+DEFAULT_DURATIONS = [12, 30]
+DEFAULT_ENGINES = ["ffmpeg:segmented", "ffmpeg:single_pass", "moviepy"]
+TRANSITIONS = ["cut", "crossfade"]
+SOURCE_FPS = 30
+
+# Metrics compared against the baseline, and whether higher is better.
+METRICS = {
+    "wall_seconds": False,
+    "cpu_seconds": False,
+    "peak_rss_mb": False,
+    "output_bytes": False,
+    "encoded_fps": True,
+}
+
+
+def _source_name(resolution: str, gop: int, duration: int) -> str:
+    return f"src_{resolution}_g{gop}_{duration}s.mp4"
+
+
+def generate_sources(
+    out_dir: Path, resolutions: List[str], gops: List[int], durations: List[int]
+) -> List[Path]:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    created = []
+    for resolution in resolutions:
+        for gop in gops:
+            for duration in durations:
+                path = out_dir / _source_name(resolution, gop, duration)
+                if path.exists():
+                    created.append(path)
+                    continue
+                cmd = [
+                    "ffmpeg", "-y", "-v", "error",
+                    "-f", "lavfi",
+                    "-i", f"testsrc2=size={resolution.replace('x', '*')}:rate={SOURCE_FPS}:duration={duration}",
+                    "-f", "lavfi",
+                    "-i", f"sine=frequency=440:sample_rate=48000:duration={duration}",
+                    "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+                    "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+                    "-c:a", "aac", "-ar", "48000", "-ac", "2",
+                    "-shortest",
+                    str(path),
+                ]
+                subprocess.run(cmd, check=True)
+                print(f"generated {path}")
+                created.append(path)
+    return created
+
+
+def _parse_source(path: Path) -> Optional[Dict[str, Any]]:
+    stem = path.stem
+    if not stem.startswith("src_"):
+        return None
+    try:
+        _, resolution, gop, duration = stem.split("_")
+        width, height = (int(v) for v in resolution.split("x"))
+        return {
+            "resolution": resolution,
+            "width": width,
+            "height": height,
+            "gop": int(gop[1:]),
+            "duration": int(duration[:-1]),
+        }
+    except ValueError:
+        return None
+
+
+def _case_payload(source: Path, duration: int, transition: str, output: Path) -> Dict[str, Any]:
+    third = duration / 3.0
+    return {
+        "inputs": [str(source)] * 3,
+        "durations": {
+            str(i): {"start": round(i * third, 3), "end": round((i + 1) * third, 3)}
+            for i in range(3)
+        },
+        "transitions": {str(i): {"name": transition} for i in range(3)},
+        "overlay": {"template": "none", "captions": []},
+        "audio": {"keep": {}},
+        "output_file_name": str(output),
+    }
+
+
+def _render_one(engine: str, config_path: str) -> int:
+    """Child-process entry point: render one payload and report render_info."""
+    name, _, mode = engine.partition(":")
+    if name == "moviepy":
+        from backend.objects.video_automation import VideoAutomation
+
+        renderer = VideoAutomation(config_path)
+    else:
+        from backend.objects.render_engine import FFmpegRenderEngine
+
+        renderer = FFmpegRenderEngine(config_path, mode=mode or None)
+    if not renderer.read_video_config() or not renderer.process_and_create_output():
+        return 1
+    print(json.dumps(renderer.render_info or {}, default=str))
+    return 0
+
+
+def _run_case(engine: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as handle:
+        json.dump(payload, handle)
+        config_path = handle.name
+    output = Path(payload["output_file_name"])
+    # Files rather than pipes: nothing reads them until the child exits.
+    with tempfile.TemporaryFile("w+") as out, tempfile.TemporaryFile("w+") as err:
+        try:
+            started = time.monotonic()
+            proc = subprocess.Popen(
+                [sys.executable, __file__, "_render-one", engine, config_path],
+                stdout=out,
+                stderr=err,
+            )
+            # wait4 returns the child's rusage, which includes the ffmpeg
+            # processes it waited for.
+            _, status, usage = os.wait4(proc.pid, 0)
+            wall = time.monotonic() - started
+            proc.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            os.unlink(config_path)
+        out.seek(0)
+        err.seek(0)
+        stdout, stderr = out.read(), err.read()
+
+    result: Dict[str, Any] = {
+        "ok": proc.returncode == 0 and output.exists(),
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 3),
+        # ru_maxrss is in KiB on Linux.
+        "peak_rss_mb": round(usage.ru_maxrss / 1024.0, 1),
+    }
+    if not result["ok"]:
+        result["error"] = (stderr or stdout)[-500:]
+        return result
+
+    from backend.objects.media_probe import probe_media
+
+    info = probe_media(str(output))
+    result["output_bytes"] = output.stat().st_size
+    result["output_seconds"] = round(info.duration, 3)
+    result["encoded_fps"] = round(info.duration * info.fps / wall, 2) if wall else None
+    lines = [line for line in stdout.splitlines() if line.startswith("{")]
+    if lines:
+        render_info = json.loads(lines[-1])
+        result["segment_methods"] = render_info.get("segment_methods")
+    # The output plus its cover and preview images.
+    for path in output.parent.glob(f"{output.stem}.*"):
+        path.unlink()
+    return result
+
+
+def run_benchmarks(
+    media_dir: Path, engines: List[str], transitions: List[str], repeat: int
+) -> Dict[str, Any]:
+    sources = sorted(media_dir.glob("src_*.mp4"))
+    if not sources:
+        raise FileNotFoundError(f"No synthetic sources in {media_dir}; run generate first")
+    work_dir = Path(tempfile.mkdtemp(prefix="render_bench_"))
+    results = []
+    for source in sources:
+        meta = _parse_source(source)
+        if meta is None:
+            continue
+        for transition in transitions:
+            for engine in engines:
+                case_id = f"{engine}|{source.stem}|{transition}"
+                runs = []
+                for attempt in range(repeat):
+                    output = work_dir / f"out_{len(results)}_{attempt}.mp4"
+                    payload = _case_payload(source, meta["duration"], transition, output)
+                    runs.append(_run_case(engine, payload))
+                # Keep the fastest run; the others mostly measure noise.
+                ok_runs = [run for run in runs if run["ok"]] or runs
+                best = min(ok_runs, key=lambda run: run["wall_seconds"])
+                results.append(
+                    {"case": case_id, "engine": engine, "transition": transition, **meta, **best}
+                )
+                status = "ok" if best["ok"] else "FAILED"
+                print(f"{case_id}: {status} wall={best['wall_seconds']}s cpu={best['cpu_seconds']}s")
+    try:
+        work_dir.rmdir()
+    except OSError:
+        pass
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "host": {
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "ffmpeg": _ffmpeg_version(),
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _ffmpeg_version() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["ffmpeg", "-version"], capture_output=True, text=True, check=False
+        ).stdout
+    except OSError:
+        return None
+    return output.splitlines()[0] if output else None
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Return one line per metric that got worse by more than ``threshold``."""
+    previous = {item["case"]: item for item in baseline.get("results", [])}
+    regressions = []
+    for item in current.get("results", []):
+        before = previous.get(item["case"])
+        if before is None:
+            continue
+        if before.get("ok") and not item.get("ok"):
+            regressions.append(f"{item['case']}: now fails")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = before.get(metric), item.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if higher_is_better:
+                change = -change
+            if change > threshold:
+                regressions.append(
+                    f"{item['case']}: {metric} {old} -> {new} ({change:+.1%} worse)"
+                )
+    return regressions
+
+
+def _csv(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Render throughput benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Create synthetic testsrc/sine sources.")
+    gen.add_argument("--out", type=Path, required=True)
+    gen.add_argument("--resolutions", type=_csv, default=DEFAULT_RESOLUTIONS)
+    gen.add_argument("--gops", type=lambda v: [int(x) for x in _csv(v)], default=DEFAULT_GOPS)
+    gen.add_argument(
+        "--durations", type=lambda v: [int(x) for x in _csv(v)], default=DEFAULT_DURATIONS
+    )
+
+    run = sub.add_parser("run", help="Render every case and write results JSON.")
+    run.add_argument("--media", type=Path, required=True)
+    run.add_argument("--out", type=Path, required=True)
+    run.add_argument("--engines", type=_csv, default=DEFAULT_ENGINES)
+    run.add_argument("--transitions", type=_csv, default=TRANSITIONS)
+    run.add_argument("--repeat", type=int, default=1)
+
+    cmp_ = sub.add_parser("compare", help="Flag regressions against a baseline.")
+    cmp_.add_argument("baseline", type=Path)
+    cmp_.add_argument("current", type=Path)
+    cmp_.add_argument("--threshold", type=float, default=0.10)
+
+    one = sub.add_parser("_render-one")
+    one.add_argument("engine")
+    one.add_argument("config")
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+
+    if args.command == "_render-one":
+        return _render_one(args.engine, args.config)
+
+    if args.command == "generate":
+        generate_sources(args.out, args.resolutions, args.gops, args.durations)
+        return 0
+
+    if args.command == "run":
+        report = run_benchmarks(args.media, args.engines, args.transitions, args.repeat)
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {len(report['results'])} results to {args.out}")
+        return 0 if all(item["ok"] for item in report["results"]) else 1
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    regressions = compare_results(baseline, current, args.threshold)
+    for line in regressions:
+        print(line)
+    print(f"Compared {len(current.get('results', []))} cases: {len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
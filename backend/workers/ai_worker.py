@@ -7,6 +7,7 @@ import os
 import re
 from typing import Any, Dict, List, Tuple
 
+from arq import Retry
 from arq.connections import RedisSettings
 from dotenv import find_dotenv, load_dotenv
 from pymongo.errors import DuplicateKeyError
@@ -21,6 +22,11 @@ from backend.objects.prompt_constants import (
     AI_TYPE_VARIABLE_MAP,
 )
 from backend.workers.queue_names import AI_QUEUE_NAME
+from backend.workers.retry_policy import (
+    MAX_RETRY_TRIES,
+    record_dead_letter,
+    retry_delay,
+)
 
 load_dotenv(find_dotenv())
 
@@ -187,6 +193,28 @@ def _build_prompt_variables(
     return variables
 
 
+def _retry_or_dead_letter(
+    ctx: Dict[str, Any],
+    exc: Exception,
+    ai_type: str,
+    input_payload: Dict[str, Any],
+    logger: logging.Logger,
+) -> None:
+    defer = retry_delay(ctx, exc)
+    if defer is not None:
+        logger.warning(
+            "Retrying AI task ai_type=%s in %.1fs (try=%s): %s",
+            ai_type,
+            defer,
+            ctx.get("job_try"),
+            exc,
+        )
+        raise Retry(defer=defer) from exc
+    record_dead_letter(
+        get_db(), ctx, "process_ai_task", [ai_type, input_payload], exc, logger
+    )
+
+
 async def process_ai_task(
     ctx: Dict[str, Any], ai_type: str, input_payload: Dict[str, Any]
 ) -> bool:
@@ -232,8 +260,9 @@ async def process_ai_task(
     try:
         engine = AiEngine()
         output = engine.run_prompt(prompt_name, variables)
-    except Exception:
-        logger.info("AI engine failed for %s", ai_type)
+    except Exception as exc:
+        logger.info("AI engine failed for %s: %s", ai_type, exc)
+        _retry_or_dead_letter(ctx, exc, ai_type, input_payload, logger)
         return False
     logger.info(
         "Prompt output summary: chars=%s lines=%s",
@@ -246,7 +275,12 @@ async def process_ai_task(
         if not rows:
             logger.info("No rows parsed for %s", ai_type)
             return False
-        inserted, skipped = _insert_raw_posts(rows, logger)
+        try:
+            inserted, skipped = _insert_raw_posts(rows, logger)
+        except Exception as exc:
+            logger.info("Failed to store monthly figures: %s", exc)
+            _retry_or_dead_letter(ctx, exc, ai_type, input_payload, logger)
+            return False
         logger.info(
             "Monthly figures processed. inserted=%s skipped=%s total=%s",
             inserted,
@@ -262,6 +296,7 @@ async def process_ai_task(
 class WorkerSettings:
     functions = [process_ai_task]
     queue_name = AI_QUEUE_NAME
+    max_tries = MAX_RETRY_TRIES
     redis_settings = RedisSettings.from_dsn(
         os.getenv("REDIS_URL", "redis://localhost:6379/0")
     )
@@ -0,0 +1,91 @@
+"""Heartbeat helpers shared by the ARQ workers.
+
+Workers stamp a heartbeat timestamp onto the Mongo document of the job they
+are running. The maintenance worker treats documents whose heartbeat is older
+than ``HEARTBEAT_TIMEOUT_SECONDS`` as abandoned by a dead worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+HEARTBEAT_FIELD = "heartbeat_at"
+POST_HEARTBEAT_FIELD = "processing_heartbeat_at"
+HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("HEARTBEAT_INTERVAL_SECONDS", "15"))
+HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("HEARTBEAT_TIMEOUT_SECONDS", "120"))
+MAX_JOB_ATTEMPTS = int(os.getenv("MAX_JOB_ATTEMPTS", "3"))
+
+
+def heartbeat_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Return the timestamp before which a heartbeat is considered expired."""
+    now = now or datetime.utcnow()
+    return now - timedelta(seconds=HEARTBEAT_TIMEOUT_SECONDS)
+
+
+class JobHeartbeat:
+    """Keep a job document's heartbeat fresh while the job is running.
+
+    The heartbeat runs on a daemon thread rather than the event loop because
+    the render and TTS steps block the loop for the whole job.
+    """
+
+    def __init__(
+        self,
+        collection: Any,
+        query: Dict[str, Any],
+        *,
+        field: str = HEARTBEAT_FIELD,
+        interval: float = HEARTBEAT_INTERVAL_SECONDS,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.collection = collection
+        self.query = dict(query)
+        self.field = field
+        self.interval = interval
+        self.logger = logger
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def beat(self) -> None:
+        try:
+            self.collection.update_one(
+                self.query, {"$set": {self.field: datetime.utcnow()}}
+            )
+        except Exception as exc:
+            if self.logger is not None:
+                self.logger.warning(
+                    "Heartbeat update failed for %s: %s", self.query, exc
+                )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.beat()
+
+    def start(self) -> "JobHeartbeat":
+        self.beat()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="job-heartbeat", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def __enter__(self) -> "JobHeartbeat":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.stop()
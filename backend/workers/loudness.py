@@ -0,0 +1,73 @@
+"""Cached loudness measurements for render sources and voice clones."""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from backend.models.media_loudness import (
+    MEDIA_LOUDNESS_COLLECTION,
+    MediaLoudnessModel,
+)
+from backend.objects.loudness import (
+    LOUDNESS_NORMALIZATION_ENABLED,
+    cached_gain_db,
+    measure_loudness,
+)
+from backend.objects.media_probe import asset_key
+
+
+def loudness_for(
+    db: Any, path: str, source_kind: str, logger: logging.Logger
+) -> Optional[MediaLoudnessModel]:
+    """Return the cached measurement for ``path``, measuring it on a miss."""
+    if not path or not os.path.isfile(path):
+        return None
+    key, size, mtime_ns = asset_key(path)
+    collection = db[MEDIA_LOUDNESS_COLLECTION]
+    doc = collection.find_one({"asset_key": key}, {"_id": 0})
+    if doc is not None:
+        return MediaLoudnessModel.from_bson(doc)
+
+    stats = measure_loudness(path)
+    record = MediaLoudnessModel(
+        asset_key=key,
+        path=os.path.abspath(path),
+        size=size,
+        mtime_ns=mtime_ns,
+        source_kind=source_kind,
+        has_audio=stats is not None,
+        integrated_lufs=stats.integrated_lufs if stats else None,
+        true_peak_dbtp=stats.true_peak_dbtp if stats else None,
+        lra=stats.lra if stats else None,
+        threshold_lufs=stats.threshold_lufs if stats else None,
+    )
+    try:
+        collection.insert_one(record.to_bson())
+    except DuplicateKeyError:
+        # Another worker measured the same asset concurrently.
+        pass
+    logger.info(
+        "Measured loudness %s: I=%s TP=%s LRA=%s",
+        path,
+        record.integrated_lufs,
+        record.true_peak_dbtp,
+        record.lra,
+    )
+    return record
+
+
+def gain_db_for(db: Any, path: str, source_kind: str, logger: logging.Logger) -> float:
+    """Normalization gain for ``path``; 0 when disabled or unmeasurable."""
+    if not LOUDNESS_NORMALIZATION_ENABLED:
+        return 0.0
+    try:
+        record = loudness_for(db, path, source_kind, logger)
+    except Exception as exc:
+        # Normalization is a polish step; never fail a render over it.
+        logger.warning("Loudness analysis failed for %s: %s", path, exc)
+        return 0.0
+    return cached_gain_db(record.to_bson() if record is not None else None)
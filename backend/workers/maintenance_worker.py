@@ -0,0 +1,271 @@
+"""ARQ worker for periodic maintenance tasks.
+
+The stuck-job reaper runs here: it looks for job documents whose worker
+heartbeat has expired and either re-queues them or marks them failed once
+``MAX_JOB_ATTEMPTS`` runs have been lost that way. Raw posts that keep
+killing their worker are flagged ``process_abandoned`` with the reason in
+``process_error``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+from arq import cron
+from arq.constants import job_key_prefix
+from arq.connections import RedisSettings
+from dotenv import find_dotenv, load_dotenv
+
+from backend.db import get_db
+from backend.logger import get_logger
+from backend.models.raw_posts_data import RAW_POSTS_COLLECTION
+from backend.models.video_model import VIDEO_COLLECTION
+from backend.models.voice_job_status import VOICE_CLONE_JOB_COLLECTION
+from backend.objects.storage_manager import StorageManager
+from backend.workers.heartbeat import (
+    HEARTBEAT_FIELD,
+    MAX_JOB_ATTEMPTS,
+    POST_HEARTBEAT_FIELD,
+    heartbeat_cutoff,
+)
+from backend.workers.queue_names import (
+    MAINTENANCE_QUEUE_NAME,
+    POST_QUEUE_NAME,
+    VIDEO_QUEUE_NAME,
+    VOICE_CLONE_QUEUE_NAME,
+)
+
+load_dotenv(find_dotenv())
+
+
+def _get_worker_logger() -> logging.Logger:
+    logger = get_logger(name="instagram_reel_creation_maintenance_arq")
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _stale_query(cutoff: datetime, fallback_field: str) -> Dict[str, Any]:
+    # Documents written before heartbeats existed fall back to their last
+    # modification timestamp.
+    return {
+        "status": "processing",
+        "$or": [
+            {HEARTBEAT_FIELD: {"$lt": cutoff}},
+            {
+                HEARTBEAT_FIELD: None,
+                fallback_field: {"$lt": cutoff},
+            },
+        ],
+    }
+
+
+async def _reap_collection(
+    ctx: Dict[str, Any],
+    collection: Any,
+    *,
+    id_field: str,
+    arq_id_field: str,
+    timestamp_field: str,
+    function_name: str,
+    queue_name: str,
+    logger: logging.Logger,
+) -> Dict[str, int]:
+    cutoff = heartbeat_cutoff()
+    requeued = 0
+    failed = 0
+
+    for doc in collection.find(_stale_query(cutoff, timestamp_field)):
+        job_key = doc.get(id_field)
+        # Only runs lost to a dead worker count; retries are budgeted by
+        # retry_policy and do not touch ``attempts``.
+        attempts = int(doc.get("attempts") or 0) + 1
+        now = datetime.utcnow()
+        guard = {
+            "_id": doc["_id"],
+            "status": "processing",
+            HEARTBEAT_FIELD: doc.get(HEARTBEAT_FIELD),
+        }
+
+        if attempts >= MAX_JOB_ATTEMPTS:
+            reason = f"Worker heartbeat expired {attempts} times"
+            result = collection.update_one(
+                guard,
+                {
+                    "$set": {
+                        "status": "failed",
+                        "error_reason": reason,
+                        "attempts": attempts,
+                        timestamp_field: now,
+                    }
+                },
+            )
+            if result.modified_count:
+                failed += 1
+                logger.warning(
+                    "Reaper failed stale job %s=%s attempts=%s",
+                    id_field,
+                    job_key,
+                    attempts,
+                )
+            continue
+
+        result = collection.update_one(
+            guard,
+            {
+                "$set": {
+                    "status": "queued",
+                    "error_reason": "Requeued after worker heartbeat expired",
+                    "attempts": attempts,
+                    timestamp_field: now,
+                }
+            },
+        )
+        if not result.modified_count:
+            continue
+
+        # A killed worker leaves its job in the ARQ queue, and ARQ re-runs it
+        # once the in-progress lock expires. Only enqueue when that job is gone,
+        # so each stale document is requeued exactly once.
+        arq_job_id = doc.get(arq_id_field)
+        if arq_job_id and await ctx["redis"].exists(job_key_prefix + arq_job_id):
+            requeued += 1
+            logger.warning(
+                "Reaper left stale job %s=%s attempts=%s to ARQ job %s",
+                id_field,
+                job_key,
+                attempts,
+                arq_job_id,
+            )
+            continue
+
+        job = await ctx["redis"].enqueue_job(
+            function_name, job_key, _queue_name=queue_name
+        )
+        if job is None:
+            logger.error("Reaper could not requeue %s=%s", id_field, job_key)
+            continue
+        collection.update_one({"_id": doc["_id"]}, {"$set": {arq_id_field: job.job_id}})
+        requeued += 1
+        logger.warning(
+            "Reaper requeued stale job %s=%s attempts=%s arq_job=%s",
+            id_field,
+            job_key,
+            attempts,
+            job.job_id,
+        )
+
+    return {"requeued": requeued, "failed": failed}
+
+
+async def _reap_raw_posts(
+    ctx: Dict[str, Any], collection: Any, logger: logging.Logger
+) -> Dict[str, int]:
+    cutoff = heartbeat_cutoff()
+    released = 0
+    failed = 0
+
+    for doc in collection.find(
+        {"quote_created": False, POST_HEARTBEAT_FIELD: {"$lt": cutoff}}
+    ):
+        # Ordinary processing failures release the claim themselves, so an
+        # expired heartbeat always means the worker died holding this post.
+        attempts = int(doc.get("process_attempts") or 0) + 1
+        update: Dict[str, Any] = {
+            POST_HEARTBEAT_FIELD: None,
+            "process_attempts": attempts,
+        }
+        if attempts >= MAX_JOB_ATTEMPTS:
+            update["process_abandoned"] = True
+            update["process_error"] = (
+                f"Abandoned: worker heartbeat expired {attempts} times"
+            )
+        result = collection.update_one(
+            {"_id": doc["_id"], POST_HEARTBEAT_FIELD: doc.get(POST_HEARTBEAT_FIELD)},
+            {"$set": update},
+        )
+        if not result.modified_count:
+            continue
+        if attempts >= MAX_JOB_ATTEMPTS:
+            failed += 1
+            logger.warning(
+                "Reaper abandoned raw post code=%s attempts=%s",
+                doc.get("code"),
+                attempts,
+            )
+        else:
+            released += 1
+            logger.warning(
+                "Reaper released stale raw post code=%s attempts=%s",
+                doc.get("code"),
+                attempts,
+            )
+
+    if released:
+        job = await ctx["redis"].enqueue_job(
+            "process_posts", _queue_name=POST_QUEUE_NAME
+        )
+        if job is None:
+            logger.error("Reaper could not requeue process_posts")
+        else:
+            logger.info("Reaper requeued process_posts as job %s", job.job_id)
+
+    return {"requeued": released, "failed": failed}
+
+
+async def reap_stale_jobs(ctx: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    logger = _get_worker_logger()
+    db = get_db()
+
+    summary: Dict[str, Dict[str, int]] = {}
+    summary[VIDEO_COLLECTION] = await _reap_collection(
+        ctx,
+        db[VIDEO_COLLECTION],
+        id_field="video_id",
+        arq_id_field="job_id",
+        timestamp_field="modification_time",
+        function_name="process_video",
+        queue_name=VIDEO_QUEUE_NAME,
+        logger=logger,
+    )
+    summary[VOICE_CLONE_JOB_COLLECTION] = await _reap_collection(
+        ctx,
+        db[VOICE_CLONE_JOB_COLLECTION],
+        id_field="job_id",
+        arq_id_field="arq_job_id",
+        timestamp_field="updated_at",
+        function_name="process_voice_clone_job",
+        queue_name=VOICE_CLONE_QUEUE_NAME,
+        logger=logger,
+    )
+    summary[RAW_POSTS_COLLECTION] = await _reap_raw_posts(
+        ctx, db[RAW_POSTS_COLLECTION], logger
+    )
+
+    if any(counts["requeued"] or counts["failed"] for counts in summary.values()):
+        logger.info("Reaper summary: %s", summary)
+    return summary
+
+
+async def collect_storage_garbage(ctx: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    logger = _get_worker_logger()
+    manager = StorageManager(get_db(), logger=logger)
+    # Walking large media trees is blocking I/O; keep the reaper cron responsive.
+    summary = await asyncio.to_thread(manager.collect_garbage)
+    logger.info("Storage GC summary: %s", summary)
+    return summary
+
+
+class WorkerSettings:
+    functions: List[Any] = []
+    cron_jobs = [
+        cron(reap_stale_jobs, run_at_startup=True),
+        cron(collect_storage_garbage, minute={0, 15, 30, 45}),
+    ]
+    queue_name = MAINTENANCE_QUEUE_NAME
+    redis_settings = RedisSettings.from_dsn(
+        os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    )
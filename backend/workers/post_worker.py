@@ -10,8 +10,10 @@ import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from arq import Retry
 from arq.connections import RedisSettings
 from dotenv import find_dotenv, load_dotenv
+from pymongo import ReturnDocument
 
 from backend.db import get_db
 from backend.logger import get_logger
@@ -25,7 +27,14 @@ from backend.objects.prompt_constants import (
     AI_TYPE_REQUIRED_FIELDS,
     AI_TYPE_VARIABLE_MAP,
 )
+from backend.workers.heartbeat import POST_HEARTBEAT_FIELD, JobHeartbeat
 from backend.workers.queue_names import POST_QUEUE_NAME
+from backend.workers.retry_policy import (
+    MAX_RETRY_TRIES,
+    classify_error,
+    record_dead_letter,
+    retry_delay,
+)
 
 load_dotenv(find_dotenv())
 
@@ -247,152 +256,197 @@ def _mark_raw_post_processed(db: Any, raw_id: Any, logger: logging.Logger) -> No
     now = _now_str()
     db[RAW_POSTS_COLLECTION].update_one(
         {"_id": raw_id},
-        {"$set": {"quote_created": True, "quote_created_on": now, "updated_on": now}},
+        {
+            "$set": {
+                "quote_created": True,
+                "quote_created_on": now,
+                "updated_on": now,
+                "process_error": None,
+            }
+        },
     )
     logger.info("Marked raw post as processed: %s", raw_id)
 
 
+def _claim_next_raw_post(db: Any, claimed_ids: List[Any]) -> Optional[Dict[str, Any]]:
+    """Atomically claim one pending raw post that no live worker is holding."""
+    return db[RAW_POSTS_COLLECTION].find_one_and_update(
+        {
+            "_id": {"$nin": claimed_ids},
+            "quote_created": False,
+            POST_HEARTBEAT_FIELD: None,
+            "process_abandoned": {"$ne": True},
+        },
+        {"$set": {POST_HEARTBEAT_FIELD: datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _release_raw_post(db: Any, raw_id: Any) -> None:
+    db[RAW_POSTS_COLLECTION].update_one(
+        {"_id": raw_id},
+        {"$set": {POST_HEARTBEAT_FIELD: None}},
+    )
+
+
 async def process_posts(ctx: Dict[str, Any]) -> bool:
     logger = _get_worker_logger()
     db = get_db()
 
-    cursor = db[RAW_POSTS_COLLECTION].find({"quote_created": False})
+    claimed_ids: List[Any] = []
+    transient_error: Optional[Exception] = None
     total = 0
     success = 0
     failure = 0
 
-    for raw in cursor:
-        total += 1
-        code = raw.get("code", "")
-        if not code:
-            logger.info("Skipping raw post with missing code.")
-            failure += 1
-            continue
-
-        input_payload = {
-            "code": code,
-            "person_name": raw.get("name", ""),
-            "country": raw.get("country", ""),
-            "dob": raw.get("dob", ""),
-            "fields_of_excellent": raw.get("excellence_field", ""),
-            "field_of_excellence": raw.get("excellence_field", ""),
-            "summary_of_challenges": raw.get("challenges_faced", ""),
-        }
-
-        if not _validate_required("BIO_DETAILS", input_payload, logger):
-            failure += 1
-            continue
-        if not _validate_required("QUOTES", input_payload, logger):
-            failure += 1
-            continue
-
+    while True:
+        raw = _claim_next_raw_post(db, claimed_ids)
+        if raw is None:
+            break
+        claimed_ids.append(raw["_id"])
+        heartbeat = JobHeartbeat(
+            db[RAW_POSTS_COLLECTION],
+            {"_id": raw["_id"]},
+            field=POST_HEARTBEAT_FIELD,
+            logger=logger,
+        ).start()
         try:
-            engine = AiEngine()
-        except Exception:
-            logger.info("Unable to initialize AI engine.")
-            return False
-
-        bio_prompt = AI_TYPE_PROMPT_MAP["BIO_DETAILS"]
-        bio_vars = _build_prompt_variables("BIO_DETAILS", input_payload, logger)
-        quotes_prompt = AI_TYPE_PROMPT_MAP["QUOTES"]
-        quotes_vars = _build_prompt_variables("QUOTES", input_payload, logger)
-
-        try:
-            try:
-                bio_output = engine.run_prompt(
-                    bio_prompt,
-                    bio_vars,
-                    logger=logger,
-                    log_rendered=True,
-                )
-            except ValueError as exc:
-                logger.info(
-                    "Failed to render bio prompt for code=%s: %s",
-                    code,
-                    exc,
-                )
-                failure += 1
-                continue
-            logger.info("Bio raw output for code=%s: %s", code, bio_output)
-            bio_json = _parse_json(bio_output, logger)
-            if not isinstance(bio_json, dict):
-                logger.info("Bio output is not a JSON object for code=%s", code)
+            total += 1
+            code = raw.get("code", "")
+            if not code:
+                logger.info("Skipping raw post with missing code.")
                 failure += 1
                 continue
 
-            bio_doc = _build_bio_document(bio_json, raw, code)
-            _upsert_document(db, PERSON_BIO_COLLECTION, code, bio_doc, logger)
-
-            try:
-                quotes_output = engine.run_prompt(
-                    quotes_prompt,
-                    quotes_vars,
-                    logger=logger,
-                    log_rendered=True,
-                )
-            except ValueError as exc:
-                logger.info(
-                    "Failed to render quotes prompt for code=%s: %s",
-                    code,
-                    exc,
-                )
+            input_payload = {
+                "code": code,
+                "person_name": raw.get("name", ""),
+                "country": raw.get("country", ""),
+                "dob": raw.get("dob", ""),
+                "fields_of_excellent": raw.get("excellence_field", ""),
+                "field_of_excellence": raw.get("excellence_field", ""),
+                "summary_of_challenges": raw.get("challenges_faced", ""),
+            }
+
+            if not _validate_required("BIO_DETAILS", input_payload, logger):
                 failure += 1
                 continue
-            logger.info("Quotes raw output for code=%s: %s", code, quotes_output)
-            quotes_json = _parse_json(quotes_output, logger)
-            if not isinstance(quotes_json, list):
-                logger.info("Quotes output is not a JSON list for code=%s", code)
-                failure += 1
-                continue
-
-            quotes_doc = _build_quotes_document(quotes_json, raw, code)
-            if not quotes_doc["quotes"]:
-                logger.info("No quotes found for code=%s", code)
+            if not _validate_required("QUOTES", input_payload, logger):
                 failure += 1
                 continue
 
             try:
-                image_paths = _create_quote_images(
-                    code=code,
-                    name=bio_doc.get("name", "") or raw.get("name", ""),
-                    quotes=quotes_doc["quotes"],
-                    logger=logger,
-                )
+                engine = AiEngine()
             except Exception:
-                logger.info("Failed to create quote images for code=%s", code)
-                failure += 1
-                continue
+                logger.info("Unable to initialize AI engine.")
+                return False
 
-            if not image_paths:
-                logger.info("No quote images created for code=%s", code)
+            bio_prompt = AI_TYPE_PROMPT_MAP["BIO_DETAILS"]
+            bio_vars = _build_prompt_variables("BIO_DETAILS", input_payload, logger)
+            quotes_prompt = AI_TYPE_PROMPT_MAP["QUOTES"]
+            quotes_vars = _build_prompt_variables("QUOTES", input_payload, logger)
+
+            try:
+                try:
+                    bio_output = engine.run_prompt(
+                        bio_prompt,
+                        bio_vars,
+                        logger=logger,
+                        log_rendered=True,
+                    )
+                except ValueError as exc:
+                    logger.info(
+                        "Failed to render bio prompt for code=%s: %s",
+                        code,
+                        exc,
+                    )
+                    failure += 1
+                    continue
+                logger.info("Bio raw output for code=%s: %s", code, bio_output)
+                bio_json = _parse_json(bio_output, logger)
+                if not isinstance(bio_json, dict):
+                    logger.info("Bio output is not a JSON object for code=%s", code)
+                    failure += 1
+                    continue
+
+                bio_doc = _build_bio_document(bio_json, raw, code)
+                _upsert_document(db, PERSON_BIO_COLLECTION, code, bio_doc, logger)
+
+                try:
+                    quotes_output = engine.run_prompt(
+                        quotes_prompt,
+                        quotes_vars,
+                        logger=logger,
+                        log_rendered=True,
+                    )
+                except ValueError as exc:
+                    logger.info(
+                        "Failed to render quotes prompt for code=%s: %s",
+                        code,
+                        exc,
+                    )
+                    failure += 1
+                    continue
+                logger.info("Quotes raw output for code=%s: %s", code, quotes_output)
+                quotes_json = _parse_json(quotes_output, logger)
+                if not isinstance(quotes_json, list):
+                    logger.info("Quotes output is not a JSON list for code=%s", code)
+                    failure += 1
+                    continue
+
+                quotes_doc = _build_quotes_document(quotes_json, raw, code)
+                if not quotes_doc["quotes"]:
+                    logger.info("No quotes found for code=%s", code)
+                    failure += 1
+                    continue
+
+                try:
+                    image_paths = _create_quote_images(
+                        code=code,
+                        name=bio_doc.get("name", "") or raw.get("name", ""),
+                        quotes=quotes_doc["quotes"],
+                        logger=logger,
+                    )
+                except Exception:
+                    logger.info("Failed to create quote images for code=%s", code)
+                    failure += 1
+                    continue
+
+                if not image_paths:
+                    logger.info("No quote images created for code=%s", code)
+                    failure += 1
+                    continue
+
+                quotes_doc["quote_image_paths"] = image_paths
+
+                _upsert_document(db, QUOTES_COLLECTION, code, quotes_doc, logger)
+
+                _mark_raw_post_processed(db, raw.get("_id"), logger)
+                success += 1
+
+                logger.info("Bio details for %s: %s", code, bio_doc)
+                logger.info("Quotes for %s: %s", code, quotes_doc["quotes"])
+                logger.info("Quote image paths for %s: %s", code, quotes_doc["quote_image_paths"])
+                logger.info(
+                    "Processed raw post payload: %s",
+                    json.dumps(
+                        {
+                            "code": code,
+                            "bio_details": bio_doc,
+                            "quotes": quotes_doc["quotes"],
+                            "quote_image_paths": quotes_doc["quote_image_paths"],
+                        }
+                    ),
+                )
+            except Exception as exc:
+                logger.info("Failed to process code=%s: %s", code, exc)
+                if classify_error(exc) != "permanent":
+                    transient_error = exc
                 failure += 1
                 continue
-
-            quotes_doc["quote_image_paths"] = image_paths
-
-            _upsert_document(db, QUOTES_COLLECTION, code, quotes_doc, logger)
-
-            _mark_raw_post_processed(db, raw.get("_id"), logger)
-            success += 1
-
-            logger.info("Bio details for %s: %s", code, bio_doc)
-            logger.info("Quotes for %s: %s", code, quotes_doc["quotes"])
-            logger.info("Quote image paths for %s: %s", code, quotes_doc["quote_image_paths"])
-            logger.info(
-                "Processed raw post payload: %s",
-                json.dumps(
-                    {
-                        "code": code,
-                        "bio_details": bio_doc,
-                        "quotes": quotes_doc["quotes"],
-                        "quote_image_paths": quotes_doc["quote_image_paths"],
-                    }
-                ),
-            )
-        except Exception:
-            logger.info("Failed to process code=%s", code)
-            failure += 1
-            continue
+        finally:
+            heartbeat.stop()
+            _release_raw_post(db, raw["_id"])
 
     logger.info(
         "Post worker summary: total=%s success=%s failure=%s",
@@ -402,12 +456,26 @@ async def process_posts(ctx: Dict[str, Any]) -> bool:
     )
     if total == 0:
         logger.info("No raw posts found with quote_created=false.")
+
+    if transient_error is not None:
+        # Failed posts were released above, so a retry picks them up again.
+        defer = retry_delay(ctx, transient_error)
+        if defer is not None:
+            logger.warning(
+                "Retrying process_posts in %.1fs (try=%s): %s",
+                defer,
+                ctx.get("job_try"),
+                transient_error,
+            )
+            raise Retry(defer=defer) from transient_error
+        record_dead_letter(db, ctx, "process_posts", [], transient_error, logger)
     return failure == 0
 
 
 class WorkerSettings:
     functions = [process_posts]
     queue_name = POST_QUEUE_NAME
+    max_tries = MAX_RETRY_TRIES
     redis_settings = RedisSettings.from_dsn(
         os.getenv("REDIS_URL", "redis://localhost:6379/0")
     )
@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 from arq.constants import health_check_key_suffix
 
 VIDEO_QUEUE_NAME = "arq:queue:video"
 AI_QUEUE_NAME = "arq:queue:ai"
 POST_QUEUE_NAME = "arq:queue:post"
 VOICE_CLONE_QUEUE_NAME = "arq:queue:voice_clone"
+MAINTENANCE_QUEUE_NAME = "arq:queue:maintenance"
+
+FUNCTION_QUEUE_NAMES: Dict[str, str] = {
+    "process_video": VIDEO_QUEUE_NAME,
+    "chunk_source": VIDEO_QUEUE_NAME,
+    "process_ai_task": AI_QUEUE_NAME,
+    "process_posts": POST_QUEUE_NAME,
+    "process_voice_clone_job": VOICE_CLONE_QUEUE_NAME,
+}
 
 
 def queue_health_key(queue_name: str) -> str:
@@ -0,0 +1,229 @@
+"""Peak memory and CPU accounting for worker jobs.
+
+A daemon thread samples the resident set size of the worker process plus
+every descendant (ffmpeg, MoviePy's ffmpeg readers/writers) from ``/proc``.
+CPU time comes from ``getrusage`` for the worker and its reaped children, so
+it is exact once a stage's subprocesses have exited. Figures are kept per
+stage and written to the job document periodically while the job runs, so a
+job that gets OOM-killed still leaves its last known peak behind.
+
+The video worker blocks its event loop for the whole render, so only one job
+is measured at a time and process-wide numbers belong to that job.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from dotenv import find_dotenv, load_dotenv
+
+load_dotenv(find_dotenv())
+
+RESOURCE_USAGE_FIELD = "resource_usage"
+RESOURCE_SAMPLE_SECONDS = float(os.getenv("RESOURCE_SAMPLE_SECONDS", "0.5"))
+RESOURCE_PERSIST_SECONDS = float(os.getenv("RESOURCE_PERSIST_SECONDS", "15"))
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _process_table() -> Dict[int, tuple]:
+    """Map pid -> (ppid, rss bytes) for every readable process."""
+    table: Dict[int, tuple] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as handle:
+                stat = handle.read().decode(errors="replace")
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after ')'.
+        fields = stat[stat.rfind(")") + 2 :].split()
+        try:
+            table[int(entry)] = (int(fields[1]), int(fields[21]) * _PAGE_SIZE)
+        except (IndexError, ValueError):
+            continue
+    return table
+
+
+def tree_rss_bytes(pid: Optional[int] = None) -> int:
+    """Resident memory of ``pid`` and all of its descendants."""
+    root = os.getpid() if pid is None else pid
+    table = _process_table()
+    children: Dict[int, List[int]] = {}
+    for child, (parent, _) in table.items():
+        children.setdefault(parent, []).append(child)
+    total, stack = 0, [root]
+    while stack:
+        current = stack.pop()
+        if current in table:
+            total += table[current][1]
+        stack.extend(children.get(current, ()))
+    return total
+
+
+def _mb(value: float) -> float:
+    return round(value / (1024 * 1024), 1)
+
+
+class ResourceMonitor:
+    """Track peak RSS, CPU seconds and wall time per stage of one job."""
+
+    def __init__(
+        self,
+        collection: Any = None,
+        query: Optional[Dict[str, Any]] = None,
+        *,
+        field: str = RESOURCE_USAGE_FIELD,
+        interval: float = RESOURCE_SAMPLE_SECONDS,
+        persist_interval: float = RESOURCE_PERSIST_SECONDS,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.collection = collection
+        self.query = dict(query or {})
+        self.field = field
+        self.interval = interval
+        self.persist_interval = persist_interval
+        self.logger = logger
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._current: Optional[str] = None
+        self._stage_peak = 0
+        self._peak = 0
+        self._started = 0.0
+        self._cpu_start = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        try:
+            rss = tree_rss_bytes()
+        except OSError:
+            return
+        with self._lock:
+            self._peak = max(self._peak, rss)
+            self._stage_peak = max(self._stage_peak, rss)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Attribute everything inside the block to stage ``name``."""
+        with self._lock:
+            self._current, self._stage_peak = name, 0
+        self.sample()
+        started, cpu_start = time.monotonic(), _cpu_seconds()
+        try:
+            yield
+        finally:
+            self.sample()
+            with self._lock:
+                self.stages[name] = {
+                    "peak_rss_mb": _mb(self._stage_peak),
+                    "cpu_seconds": round(_cpu_seconds() - cpu_start, 3),
+                    "wall_seconds": round(time.monotonic() - started, 3),
+                }
+                self._current = None
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: dict(values) for name, values in self.stages.items()}
+            if self._current is not None:
+                # Still running: report what is known so far.
+                stages[self._current] = {"peak_rss_mb": _mb(self._stage_peak), "running": True}
+            return {
+                "peak_rss_mb": _mb(self._peak),
+                "cpu_seconds": round(_cpu_seconds() - self._cpu_start, 3),
+                "wall_seconds": round(time.monotonic() - self._started, 3),
+                "stages": stages,
+            }
+
+    def persist(self) -> None:
+        if self.collection is None:
+            return
+        try:
+            self.collection.update_one(self.query, {"$set": {self.field: self.summary()}})
+        except Exception as exc:
+            if self.logger is not None:
+                self.logger.warning("Resource usage update failed for %s: %s", self.query, exc)
+
+    def _run(self) -> None:
+        last_persist = time.monotonic()
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if time.monotonic() - last_persist >= self.persist_interval:
+                self.persist()
+                last_persist = time.monotonic()
+
+    def start(self) -> "ResourceMonitor":
+        self._started, self._cpu_start = time.monotonic(), _cpu_seconds()
+        self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+        self.persist()
+
+    def __enter__(self) -> "ResourceMonitor":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.stop()
+
+
+def _percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(share * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _describe(values: List[float]) -> Dict[str, Any]:
+    if not values:
+        return {}
+    return {
+        "p50": _percentile(values, 0.5),
+        "p95": _percentile(values, 0.95),
+        "max": max(values),
+    }
+
+
+def summarize_resource_usage(docs: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """p50/p95/max of recorded usage per engine and stage, for sizing workers."""
+    grouped: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+    for doc in docs:
+        usage = doc.get(RESOURCE_USAGE_FIELD) or {}
+        if not usage:
+            continue
+        engine = grouped.setdefault(doc.get("engine") or "unknown", {})
+        scopes = [("job", usage)] + list((usage.get("stages") or {}).items())
+        for scope, values in scopes:
+            metrics = engine.setdefault(scope, {})
+            for metric in ("peak_rss_mb", "cpu_seconds", "wall_seconds"):
+                if values.get(metric) is not None:
+                    metrics.setdefault(metric, []).append(values[metric])
+    return {
+        engine: {
+            scope: {
+                "count": max((len(v) for v in metrics.values()), default=0),
+                **{metric: _describe(values) for metric, values in metrics.items()},
+            }
+            for scope, metrics in scopes.items()
+        }
+        for engine, scopes in grouped.items()
+    }
@@ -0,0 +1,162 @@
+"""Shared retry policy for ARQ jobs.
+
+Failures are sorted into error classes. Each class has its own retry budget
+and exponential backoff; jobs that exhaust the budget are written to the
+``dead_letter_jobs`` collection where they can be inspected and replayed
+through the API.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+from pymongo.errors import (
+    AutoReconnect,
+    ConnectionFailure,
+    ExecutionTimeout,
+    NetworkTimeout,
+    WTimeoutError,
+)
+
+from backend.models.dead_letter import DEAD_LETTER_COLLECTION, DeadLetterModel
+from backend.workers.queue_names import FUNCTION_QUEUE_NAMES
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_tries: int
+    base_delay: float
+    max_delay: float
+
+    def delay_for(self, job_try: int) -> float:
+        """Exponential backoff with "equal jitter" for the given attempt."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(job_try - 1, 0)))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+ERROR_POLICIES: Dict[str, RetryPolicy] = {
+    "database": RetryPolicy(max_tries=5, base_delay=2, max_delay=60),
+    "media": RetryPolicy(max_tries=3, base_delay=10, max_delay=120),
+    "rate_limit": RetryPolicy(max_tries=6, base_delay=15, max_delay=600),
+    "upstream": RetryPolicy(max_tries=4, base_delay=5, max_delay=120),
+    "unknown": RetryPolicy(max_tries=2, base_delay=10, max_delay=60),
+    "permanent": RetryPolicy(max_tries=1, base_delay=0, max_delay=0),
+}
+
+# ARQ refuses to run a job past its own max_tries, so workers must allow at
+# least as many tries as the most generous policy.
+MAX_RETRY_TRIES = max(policy.max_tries for policy in ERROR_POLICIES.values())
+
+_DATABASE_ERRORS = (
+    AutoReconnect,
+    ConnectionFailure,
+    ExecutionTimeout,
+    NetworkTimeout,
+    WTimeoutError,
+)
+_PERMANENT_ERRORS = (
+    FileNotFoundError,
+    PermissionError,
+    KeyError,
+    TypeError,
+    ValueError,
+)
+# OpenAI / httpx errors are matched by name to avoid importing the SDK here.
+_RATE_LIMIT_ERROR_NAMES = {"RateLimitError"}
+_UPSTREAM_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "ConnectError",
+    "ReadTimeout",
+}
+
+
+class MediaProcessingError(RuntimeError):
+    """Raised when an ffmpeg/MoviePy step fails in a way worth retrying."""
+
+
+def _exception_chain(exc: BaseException) -> Iterator[BaseException]:
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        yield current
+        current = current.__cause__ or current.__context__
+
+
+def _classify_single(exc: BaseException) -> Optional[str]:
+    name = type(exc).__name__
+    if isinstance(exc, _DATABASE_ERRORS):
+        return "database"
+    if name in _RATE_LIMIT_ERROR_NAMES or getattr(exc, "status_code", None) == 429:
+        return "rate_limit"
+    if name in _UPSTREAM_ERROR_NAMES or isinstance(exc, (TimeoutError, ConnectionError)):
+        return "upstream"
+    if isinstance(exc, (MediaProcessingError, subprocess.TimeoutExpired)):
+        return "media"
+    if isinstance(exc, _PERMANENT_ERRORS):
+        return "permanent"
+    return None
+
+
+def classify_error(exc: BaseException) -> str:
+    """Return the error class for ``exc``, preferring the root cause."""
+    for candidate in reversed(list(_exception_chain(exc))):
+        error_class = _classify_single(candidate)
+        if error_class is not None:
+            return error_class
+    return "unknown"
+
+
+def retry_delay(ctx: Dict[str, Any], exc: BaseException) -> Optional[float]:
+    """Return the backoff in seconds if the job should retry, otherwise None."""
+    policy = ERROR_POLICIES[classify_error(exc)]
+    job_try = int(ctx.get("job_try") or 1)
+    if job_try >= policy.max_tries:
+        return None
+    return policy.delay_for(job_try)
+
+
+def record_dead_letter(
+    db: Any,
+    ctx: Dict[str, Any],
+    function_name: str,
+    args: List[Any],
+    exc: BaseException,
+    logger: logging.Logger,
+) -> str:
+    """Store a job that exhausted its retries and return the dead letter id."""
+    dead_letter = DeadLetterModel(
+        dead_letter_id=uuid4().hex,
+        function_name=function_name,
+        queue_name=FUNCTION_QUEUE_NAMES.get(function_name, ""),
+        args=list(args),
+        error_class=classify_error(exc),
+        error_type=type(exc).__name__,
+        error_reason=str(exc),
+        job_try=int(ctx.get("job_try") or 1),
+        arq_job_id=ctx.get("job_id"),
+    )
+    try:
+        db[DEAD_LETTER_COLLECTION].insert_one(dead_letter.to_bson())
+    except Exception:
+        logger.exception(
+            "Failed to dead-letter %s args=%s", function_name, args
+        )
+        return dead_letter.dead_letter_id
+    logger.error(
+        "Dead-lettered %s args=%s error_class=%s tries=%s id=%s",
+        function_name,
+        args,
+        dead_letter.error_class,
+        dead_letter.job_try,
+        dead_letter.dead_letter_id,
+    )
+    return dead_letter.dead_letter_id
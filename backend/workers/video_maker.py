@@ -5,37 +5,65 @@ from __future__ import annotations
 import json, subprocess
 import os
 import re
+import socket
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional
 
+from arq import Retry
 from arq.connections import RedisSettings
 from dotenv import find_dotenv, load_dotenv
 
 from backend.db import get_db
 from backend.logger import get_logger
+from backend.models.brand_asset import BRAND_ASSETS_COLLECTION
+from backend.models.media_chunks import MEDIA_CHUNKS_COLLECTION, MediaChunksModel
+from backend.models.quotes import QUOTES_COLLECTION
+from backend.models.render_stats import RENDER_STATS_COLLECTION, RenderStatsModel
+from backend.models.voice_job_status import VOICE_CLONE_JOB_COLLECTION
+from backend.objects.brand_assets import brand_section
+from backend.objects.media_packaging import HLS_PREVIEW_ENABLED, package_hls
+from backend.objects.media_probe import asset_key
+from backend.objects.render_engine import (
+    RENDER_ENGINE,
+    SEGMENT_CACHE_FOLDER,
+    FFmpegRenderEngine,
+)
+from backend.objects.render_eta import input_seconds
+from backend.objects.render_payload import (
+    apply_loudness_gains,
+    build_processing_payload,
+    build_slideshow_payload,
+    resolve_voice_path,
+)
+from backend.objects.slideshow import SlideshowRenderEngine
+from backend.objects.source_chunks import (
+    CHUNKS_FOLDER,
+    INDEX_FILE_NAME,
+    PRECHUNK_MIN_SECONDS,
+    PRECHUNK_SECONDS,
+    apply_chunk_index,
+    chunk_indexes,
+    split_source,
+)
 from backend.objects.video_automation import VideoAutomation
+from backend.workers.heartbeat import HEARTBEAT_FIELD, JobHeartbeat
+from backend.workers.loudness import gain_db_for
 from backend.workers.queue_names import VIDEO_QUEUE_NAME
+from backend.workers.resource_monitor import ResourceMonitor
+from backend.workers.retry_policy import (
+    MAX_RETRY_TRIES,
+    MediaProcessingError,
+    record_dead_letter,
+    retry_delay,
+)
 
 load_dotenv(find_dotenv())
 
 OUTPUT_FILES_LOCATION = os.getenv("OUTPUT_FILES_LOCATION") or "./outputs"
 
 
-def _parse_hms(value: str) -> float:
-    parts = value.split(":")
-    if len(parts) != 3:
-        raise ValueError("Invalid time format")
-    hours, minutes, seconds = parts
-    h = int(hours)
-    m = int(minutes)
-    s = int(seconds)
-    if h < 0 or m < 0 or s < 0 or m > 59 or s > 59:
-        raise ValueError("Invalid time format")
-    return float(h * 3600 + m * 60 + s)
-
-
 def _safe_filename(title: str) -> str:
     safe = re.sub(r"[^A-Za-z0-9]+", "_", title).strip("_")
     return safe or "video"
@@ -71,22 +99,26 @@ def _format_hms(total_seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def _build_processing_payload(
-    parts: List[Dict[str, Any]], output_name: str
+def _build_slideshow_payload(
+    db: Any,
+    output_name: str,
+    video: Dict[str, Any],
+    voice_path: Optional[str] = None,
 ) -> Dict[str, Any]:
-    inputs: List[str] = []
-    durations: Dict[str, Dict[str, float]] = {}
-    for index, part in enumerate(parts):
-        inputs.append(part["file_location"])
-        durations[str(index)] = {
-            "start": _parse_hms(part["start_time"]),
-            "end": _parse_hms(part["end_time"]),
-        }
-    return {
-        "inputs": inputs,
-        "durations": durations,
-        "output_file_name": output_name,
-    }
+    quote_code = video.get("quote_code")
+    quote = db[QUOTES_COLLECTION].find_one({"code": quote_code}, {"_id": 0})
+    if quote is None:
+        raise ValueError(f"Quotes not found: {quote_code}")
+    return build_slideshow_payload(quote, output_name, video, voice_path)
+
+
+def _create_renderer(config_path: str, logger: Any, video_type: str = "clips") -> Any:
+    if video_type == "quote_slideshow":
+        return SlideshowRenderEngine(config_path, logger=logger)
+    # The MoviePy path is kept for comparison; it ignores transitions.
+    if RENDER_ENGINE == "moviepy":
+        return VideoAutomation(config_path)
+    return FFmpegRenderEngine(config_path, logger=logger)
 
 
 async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
@@ -98,10 +130,11 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
         logger.info("Video not found: %s", video_id)
         return False
 
+    video_type = video.get("video_type") or "clips"
     parts = list(
         db.video_parts.find({"video_id": video_id}).sort("part_number", 1)
     )
-    if not parts:
+    if not parts and video_type == "clips":
         reason = "No video parts found for video"
         db.videos.update_one(
             {"video_id": video_id},
@@ -147,6 +180,7 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
     output_path = str(output_dir / output_file_name)
     logger.info("Output file path: %s", output_path)
 
+    now = datetime.utcnow()
     db.videos.update_one(
         {"video_id": video_id},
         {
@@ -154,31 +188,61 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
                 "status": "processing",
                 "output_file_location": output_path,
                 "error_reason": None,
-                "modification_time": datetime.utcnow(),
-            }
+                "modification_time": now,
+                "render_started_at": now,
+                HEARTBEAT_FIELD: now,
+            },
         },
     )
 
-    payload = _build_processing_payload(parts, output_file_name)
-
     temp_json_path = None
+    monitor = ResourceMonitor(db.videos, {"video_id": video_id}, logger=logger).start()
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False
-        ) as temp_file:
-            json.dump(payload, temp_file)
-            temp_json_path = temp_file.name
+        with monitor.stage("prepare"):
+            voice_path = resolve_voice_path(db, VOICE_CLONE_JOB_COLLECTION, video)
+            if video_type == "quote_slideshow":
+                payload = _build_slideshow_payload(db, output_file_name, video, voice_path)
+            else:
+                payload = build_processing_payload(parts, output_file_name, video, voice_path)
+            payload["brand"] = brand_section(db, BRAND_ASSETS_COLLECTION, video)
+            if video_type == "quote_slideshow" or RENDER_ENGINE != "moviepy":
+                apply_loudness_gains(
+                    payload, lambda kind, path, _: gain_db_for(db, path, kind, logger)
+                )
+            # After loudness, which is cached against the whole source.
+            chunked = apply_chunk_index(
+                payload, chunk_indexes(db, MEDIA_CHUNKS_COLLECTION, payload)
+            )
+            if chunked:
+                logger.info("Reading parts %s of video %s from source chunks", chunked, video_id)
+            if video_type == "clips":
+                # Segments still matching the last render are reused.
+                payload["segment_cache"] = {
+                    "dir": os.path.join(SEGMENT_CACHE_FOLDER, video_id),
+                    "manifest": video.get("render_manifest") or {},
+                }
+
+            with tempfile.NamedTemporaryFile(
+                mode="w", suffix=".json", delete=False
+            ) as temp_file:
+                json.dump(payload, temp_file)
+                temp_json_path = temp_file.name
 
-        automation = VideoAutomation(temp_json_path)
+        automation = _create_renderer(temp_json_path, logger, video_type)
         if not automation.read_video_config():
             raise RuntimeError("Unable to read video config")
-        created = automation.process_and_create_output()
+        with JobHeartbeat(db.videos, {"video_id": video_id}, logger=logger):
+            with monitor.stage("render"):
+                created = automation.process_and_create_output()
         if not created:
-            raise RuntimeError("Video creation failed")
+            raise MediaProcessingError("Video creation failed") from automation.last_error
         if not Path(output_path).exists():
-            raise RuntimeError("Output file was not created")
+            raise MediaProcessingError("Output file was not created")
 
-        output_duration = _probe_duration_seconds(output_path)
+        render_info = automation.render_info or {}
+        output_duration = render_info.get("duration_seconds")
+        if not output_duration:
+            output_duration = _probe_duration_seconds(output_path)
         output_abs_path = str(Path(output_path).resolve())
         logger.info(
             "Output created at %s UTC: %s",
@@ -187,13 +251,47 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
         )
         output_size = _format_hms(output_duration)
 
+        hls_playlist_location = None
+        if HLS_PREVIEW_ENABLED:
+            hls_dir = output_dir / "hls" / video_id
+            try:
+                with monitor.stage("package"):
+                    hls_playlist_location = package_hls(output_path, str(hls_dir))
+                logger.info("HLS preview packaged at %s", hls_playlist_location)
+            except Exception as exc:
+                # The MP4 is the deliverable; a missing preview is not fatal.
+                logger.warning("HLS packaging failed for %s: %s", video_id, exc)
+
+        try:
+            stats = RenderStatsModel.from_render_info(video_id, video_type, render_info)
+            stats.host = socket.gethostname()
+            stats.resource_usage = monitor.summary()
+            # The MoviePy engine only reports output facts.
+            if stats.input_seconds is None:
+                stats.input_seconds = round(input_seconds(payload, 0.0), 3)
+                stats.part_count = len(payload.get("inputs") or [])
+            if stats.wall_seconds is None:
+                stats.wall_seconds = stats.resource_usage["stages"].get("render", {}).get("wall_seconds")
+            if stats.encode_speed is None and output_duration and stats.wall_seconds:
+                stats.encode_speed = round(output_duration / stats.wall_seconds, 3)
+            db[RENDER_STATS_COLLECTION].insert_one(stats.to_bson())
+        except Exception as exc:
+            logger.warning("Failed to record render stats for %s: %s", video_id, exc)
+
         db.videos.update_one(
             {"video_id": video_id},
             {
                 "$set": {
                     "status": "completed",
                     "output_file_location": output_path,
+                    "hls_playlist_location": hls_playlist_location,
+                    "cover_file_location": render_info.get("cover_path"),
+                    "preview_file_location": render_info.get("preview_path"),
                     "video_size": output_size,
+                    "output_duration_seconds": output_duration,
+                    "output_size_bytes": render_info.get("size_bytes"),
+                    "output_bit_rate": render_info.get("bit_rate"),
+                    "render_manifest": getattr(automation, "render_manifest", None),
                     "error_reason": None,
                     "modification_time": datetime.utcnow(),
                 }
@@ -203,6 +301,27 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
         return True
     except Exception as exc:
         reason = str(exc)
+        defer = retry_delay(ctx, exc)
+        if defer is not None:
+            db.videos.update_one(
+                {"video_id": video_id},
+                {
+                    "$set": {
+                        "status": "queued",
+                        "error_reason": f"Retrying in {defer:.0f}s: {reason}",
+                        "modification_time": datetime.utcnow(),
+                    }
+                },
+            )
+            logger.warning(
+                "Retrying video %s in %.1fs (try=%s): %s",
+                video_id,
+                defer,
+                ctx.get("job_try"),
+                reason,
+            )
+            raise Retry(defer=defer) from exc
+
         db.videos.update_one(
             {"video_id": video_id},
             {
@@ -213,9 +332,12 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
                 }
             },
         )
+        record_dead_letter(db, ctx, "process_video", [video_id], exc, logger)
         logger.info("Failed to create video %s: %s", video_id, reason)
         return False
     finally:
+        monitor.stop()
+        logger.info("Resource usage for video %s: %s", video_id, monitor.summary())
         if temp_json_path and os.path.exists(temp_json_path):
             try:
                 os.remove(temp_json_path)
@@ -223,9 +345,54 @@ async def process_video(ctx: Dict[str, Any], video_id: str) -> bool:
                 pass
 
 
+async def chunk_source(ctx: Dict[str, Any], path: str) -> bool:
+    """Split a long upload into keyframe-aligned chunks and index them."""
+    logger = get_logger(name="instagram_reel_creation_arq")
+    db = get_db()
+    if not os.path.isfile(path):
+        logger.info("Source to chunk not found: %s", path)
+        return False
+
+    key, size, mtime_ns = asset_key(path)
+    collection = db[MEDIA_CHUNKS_COLLECTION]
+    if collection.find_one({"asset_key": key}, {"_id": 1}) is not None:
+        return True
+    try:
+        duration = _probe_duration_seconds(path)
+    except RuntimeError as exc:
+        logger.warning("Cannot chunk %s: %s", path, exc)
+        return False
+    if duration < PRECHUNK_MIN_SECONDS:
+        logger.info("Not chunking %s: %.0fs is below the threshold", path, duration)
+        return False
+
+    chunk_dir = os.path.join(CHUNKS_FOLDER, key)
+    try:
+        chunks = split_source(path, chunk_dir, PRECHUNK_SECONDS)
+    except Exception as exc:
+        # Renders fall back to reading the source directly.
+        logger.warning("Chunking failed for %s: %s", path, exc)
+        return False
+
+    record = MediaChunksModel(
+        asset_key=key,
+        path=os.path.abspath(path),
+        size=size,
+        mtime_ns=mtime_ns,
+        duration=duration,
+        chunk_seconds=PRECHUNK_SECONDS,
+        index_path=str(Path(chunk_dir).resolve() / INDEX_FILE_NAME),
+        chunks=chunks,
+    )
+    collection.replace_one({"asset_key": key}, record.to_bson(), upsert=True)
+    logger.info("Chunked %s into %s chunks at %s", path, len(chunks), chunk_dir)
+    return True
+
+
 class WorkerSettings:
-    functions = [process_video]
+    functions = [process_video, chunk_source]
     queue_name = VIDEO_QUEUE_NAME
+    max_tries = MAX_RETRY_TRIES
     redis_settings = RedisSettings.from_dsn(
         os.getenv("REDIS_URL", "redis://localhost:6379/0")
     )
@@ -16,13 +16,21 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from arq import Retry
 from arq.connections import RedisSettings
 from dotenv import find_dotenv, load_dotenv
 
 from backend.db import get_db
 from backend.logger import get_logger
 from backend.models.voice_job_status import VOICE_CLONE_JOB_COLLECTION
+from backend.workers.heartbeat import HEARTBEAT_FIELD, JobHeartbeat
+from backend.workers.loudness import loudness_for
 from backend.workers.queue_names import VOICE_CLONE_QUEUE_NAME
+from backend.workers.retry_policy import (
+    MAX_RETRY_TRIES,
+    record_dead_letter,
+    retry_delay,
+)
 
 load_dotenv(find_dotenv())
 
@@ -82,6 +90,7 @@ def _mark_status(
         update_fields["error_reason"] = error_reason
     if set_started:
         update_fields["started_at"] = now
+        update_fields[HEARTBEAT_FIELD] = now
     if set_completed:
         update_fields["completed_at"] = now
 
@@ -184,7 +193,8 @@ async def process_voice_clone_job(ctx: Dict[str, Any], job_id: str) -> bool:
     )
 
     try:
-        final_path = _run_voice_clone_sample(job_doc, output_path)
+        with JobHeartbeat(collection, {"job_id": job_id}, logger=logger):
+            final_path = _run_voice_clone_sample(job_doc, output_path)
         _mark_status(
             collection,
             job_id,
@@ -195,9 +205,32 @@ async def process_voice_clone_job(ctx: Dict[str, Any], job_id: str) -> bool:
             set_completed=True,
         )
         logger.info("Voice clone job completed: %s output=%s", job_id, final_path)
+        try:
+            # Measure now so renders using this narration hit the cache.
+            loudness_for(get_db(), final_path, "voice_clone", logger)
+        except Exception as exc:
+            logger.warning("Loudness analysis failed for %s: %s", final_path, exc)
         return True
     except Exception as exc:
         reason = str(exc)
+        defer = retry_delay(ctx, exc)
+        if defer is not None:
+            _mark_status(
+                collection,
+                job_id,
+                "queued",
+                progress=0.0,
+                error_reason=f"Retrying in {defer:.0f}s: {reason}",
+            )
+            logger.warning(
+                "Retrying voice clone job %s in %.1fs (try=%s): %s",
+                job_id,
+                defer,
+                ctx.get("job_try"),
+                reason,
+            )
+            raise Retry(defer=defer) from exc
+
         _mark_status(
             collection,
             job_id,
@@ -205,6 +238,9 @@ async def process_voice_clone_job(ctx: Dict[str, Any], job_id: str) -> bool:
             progress=0.0,
             error_reason=reason,
         )
+        record_dead_letter(
+            get_db(), ctx, "process_voice_clone_job", [job_id], exc, logger
+        )
         logger.exception("Voice clone job failed: %s reason=%s", job_id, reason)
         return False
 
@@ -212,6 +248,7 @@ async def process_voice_clone_job(ctx: Dict[str, Any], job_id: str) -> bool:
 class WorkerSettings:
     functions = [process_voice_clone_job]
     queue_name = VOICE_CLONE_QUEUE_NAME
+    max_tries = MAX_RETRY_TRIES
     redis_settings = RedisSettings.from_dsn(
         os.getenv("REDIS_URL", "redis://localhost:6379/0")
     )
@@ -11,10 +11,17 @@ type VideoPart = {
   start: number;
   end: number;
   selectedDuration: number;
+  transition: string;
+  keepAudio: boolean;
   synced: boolean;
   backendId?: string;
 };
 
+type TransitionOption = {
+  name: string;
+  description?: string;
+};
+
 type UploadStatus = "uploading" | "ready" | "error";
 
 type VideoFile = {
@@ -83,6 +90,7 @@ export default function CreateVideoPage() {
   const [startTime, setStartTime] = useState(0);
   const [endTime, setEndTime] = useState(0);
   const [parts, setParts] = useState<VideoPart[]>([]);
+  const [transitions, setTransitions] = useState<TransitionOption[]>([]);
   const [isCreatingVideo, setIsCreatingVideo] = useState(false);
   const [isAddingPart, setIsAddingPart] = useState(false);
   const [isUploadingFiles, setIsUploadingFiles] = useState(false);
@@ -98,6 +106,19 @@ export default function CreateVideoPage() {
 
   const activeFile = activeIndex !== null ? files[activeIndex] : null;
 
+  useEffect(() => {
+    const loadTransitions = async () => {
+      try {
+        const response = await fetch(`${API_BASE}/transitions`);
+        if (!response.ok) return;
+        setTransitions((await response.json()) as TransitionOption[]);
+      } catch (error) {
+        setTransitions([]);
+      }
+    };
+    loadTransitions();
+  }, []);
+
   useEffect(() => {
     if (!activeFile) {
       setPreviewUrl(null);
@@ -281,6 +302,8 @@ export default function CreateVideoPage() {
         start_time: formatHms(part.start),
         end_time: formatHms(part.end),
         selected_duration: part.selectedDuration,
+        transition: part.transition || undefined,
+        keep_audio: part.keepAudio,
         active: true,
       };
 
@@ -452,6 +475,8 @@ export default function CreateVideoPage() {
         start: startTime,
         end: endTime,
         selectedDuration: Number(selectedDuration.toFixed(2)),
+        transition: "",
+        keepAudio: false,
         synced: false,
       },
     ]);
@@ -766,6 +791,45 @@ export default function CreateVideoPage() {
                     <span className="block text-[11px] text-soft">
                       ({formatTime(part.start)} - {formatTime(part.end)})
                     </span>
+                    {transitions.length > 0 && (
+                      <select
+                        className="mt-1 rounded-md border border-white/10 bg-black/40 px-2 py-1 text-[11px] text-soft"
+                        value={part.transition}
+                        disabled={part.synced}
+                        title="Transition into the next part"
+                        onChange={(event) => {
+                          const value = event.target.value;
+                          setParts((prev) =>
+                            prev.map((item) =>
+                              item.id === part.id ? { ...item, transition: value } : item
+                            )
+                          );
+                        }}
+                      >
+                        <option value="">Default transition</option>
+                        {transitions.map((option) => (
+                          <option key={option.name} value={option.name} title={option.description}>
+                            {option.name.replace(/_/g, " ")}
+                          </option>
+                        ))}
+                      </select>
+                    )}
+                    <label className="mt-1 flex items-center gap-1 text-[11px] text-soft">
+                      <input
+                        type="checkbox"
+                        checked={part.keepAudio}
+                        disabled={part.synced}
+                        onChange={(event) => {
+                          const checked = event.target.checked;
+                          setParts((prev) =>
+                            prev.map((item) =>
+                              item.id === part.id ? { ...item, keepAudio: checked } : item
+                            )
+                          );
+                        }}
+                      />
+                      Keep clip audio
+                    </label>
                   </span>
                   <button
                     className="flex h-7 w-7 items-center justify-center rounded-full border border-red-400/40 text-[10px] font-bold text-red-300"
@@ -14,6 +14,8 @@ type VideoRecord = {
   video_tags?: string[];
   status?: string;
   output_file_location?: string | null;
+  cover_file_location?: string | null;
+  preview_file_location?: string | null;
   job_id?: string | null;
   error_reason?: string | null;
 };
@@ -266,12 +268,42 @@ export default function VideoList() {
                           Error: {video.error_reason}
                         </span>
                       ) : video.output_file_location ? (
-                        <span
-                          className="inline-block max-w-[220px] truncate"
-                          title={video.output_file_location}
-                        >
-                          {video.output_file_location}
-                        </span>
+                        <div className="flex flex-col gap-1">
+                          <span
+                            className="inline-block max-w-[220px] truncate"
+                            title={video.output_file_location}
+                          >
+                            {video.output_file_location}
+                          </span>
+                          {normalizeStatus(video.status) === "completed" &&
+                            video.cover_file_location && (
+                              // eslint-disable-next-line @next/next/no-img-element
+                              <img
+                                className="h-24 w-auto rounded-md border border-white/10 object-cover"
+                                src={`${API_BASE}/videos/${video.video_id}/cover`}
+                                alt={`${video.video_title} cover`}
+                                loading="lazy"
+                                onMouseEnter={(event) => {
+                                  if (video.preview_file_location) {
+                                    event.currentTarget.src = `${API_BASE}/videos/${video.video_id}/preview`;
+                                  }
+                                }}
+                                onMouseLeave={(event) => {
+                                  event.currentTarget.src = `${API_BASE}/videos/${video.video_id}/cover`;
+                                }}
+                              />
+                            )}
+                          {normalizeStatus(video.status) === "completed" && (
+                            <a
+                              className="text-sky-200 underline decoration-sky-400/70 underline-offset-4 transition hover:text-sky-100"
+                              href={`${API_BASE}/videos/${video.video_id}/download`}
+                              target="_blank"
+                              rel="noreferrer"
+                            >
+                              Watch
+                            </a>
+                          )}
+                        </div>
                       ) : (
                         "—"
                       )}